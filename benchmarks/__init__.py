@@ -0,0 +1 @@
+"""Synthetic data generation and database benchmarks for VocabLoury"""
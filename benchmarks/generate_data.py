@@ -0,0 +1,154 @@
+"""
+Synthetic data generator for VocabLoury benchmarks
+
+Fills a database with users, word history and remember-me tokens shaped
+like real usage: word popularity and per-user activity follow Zipf
+distributions, and searches are spread over a configurable date range.
+
+Usage:
+    python -m benchmarks.generate_data bench.db --users 100 --rows 1000000
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from config.settings import DATABASE_NAME
+from src.models.database import DatabaseManager
+from src.models.password_hashing import hash_password, hash_token
+from src.models.schema import HISTORY_SOURCE_SEARCH, SECONDS_PER_DAY, rebuild_stats
+
+BENCHMARK_PASSWORD = "benchmark-password"
+INSERT_BATCH_SIZE = 50000
+
+_SYLLABLES = ["ab", "ca", "de", "fi", "go", "hu", "im", "jo", "ka", "le", "mo", "nu", "or",
+              "pe", "qui", "ra", "so", "ti", "ul", "ve", "wa", "xe", "yo", "ze", "ing", "tion"]
+
+
+def synthetic_username(index):
+    return f"user{index:06d}"
+
+
+def synthetic_token(seed, index):
+    """The remember-me token generated for a user, so benchmarks can present it"""
+    return hashlib.sha256(f"{seed}:{index}".encode("utf-8")).hexdigest()
+
+
+def synthetic_words(count):
+    """Deterministic, unique, pronounceable-ish words"""
+    words = []
+    for length in itertools.count(2):
+        for parts in itertools.product(_SYLLABLES, repeat=length):
+            words.append("".join(parts))
+            if len(words) == count:
+                return words
+
+
+def zipf_weights(count, exponent):
+    """Cumulative Zipf weights for ranks 1..count"""
+    return list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def generate(db_file, users=100, rows=100000, vocabulary=20000, days=365,
+             word_exponent=1.1, user_exponent=0.8, seed=42):
+    """Create (or extend) a database with synthetic data; returns seconds taken"""
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    db = DatabaseManager(db_file)
+
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    try:
+        # Durability does not matter for throwaway data
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+
+        # One hash shared by every account: hashing is not what is measured
+        password_hash, salt = hash_password(BENCHMARK_PASSWORD, *db.password_policy())
+        words = synthetic_words(vocabulary)
+        now = int(time.time())
+
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR IGNORE INTO accounts (username, email, password, salt, profession) VALUES (?, ?, ?, ?, ?)",
+            ((synthetic_username(i), f"{synthetic_username(i)}@example.com", password_hash, salt, "Student")
+             for i in range(users))
+        )
+        conn.executemany("INSERT OR IGNORE INTO words (word) VALUES (?)", ((word,) for word in words))
+        # Ids in generation order: position is the user's or word's Zipf rank
+        user_ids = [row[0] for row in conn.execute(
+            "SELECT a.id FROM json_each(?) AS j JOIN accounts AS a ON a.username = j.value ORDER BY j.key",
+            (json.dumps([synthetic_username(i) for i in range(users)]),))]
+        word_ids = [row[0] for row in conn.execute(
+            "SELECT w.id FROM json_each(?) AS j JOIN words AS w ON w.word = j.value ORDER BY j.key",
+            (json.dumps(words),))]
+        conn.executemany(
+            "INSERT OR IGNORE INTO auth_tokens (user_id, token_hash, expires_at) VALUES (?, ?, ?)",
+            ((user_id, hash_token(synthetic_token(seed, i)), now + 30 * SECONDS_PER_DAY)
+             for i, user_id in enumerate(user_ids))
+        )
+
+        # Bulk load without the per-row stats trigger, then rebuild once
+        stats_trigger = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'word_history_stats_insert'"
+        ).fetchone()[0]
+        conn.execute("DROP TRIGGER word_history_stats_insert")
+        word_weights = zipf_weights(len(word_ids), word_exponent)
+        user_weights = zipf_weights(len(user_ids), user_exponent)
+        span = days * SECONDS_PER_DAY
+        remaining = rows
+        while remaining > 0:
+            batch = min(INSERT_BATCH_SIZE, remaining)
+            batch_users = rng.choices(user_ids, cum_weights=user_weights, k=batch)
+            batch_words = rng.choices(word_ids, cum_weights=word_weights, k=batch)
+            conn.executemany(
+                "INSERT INTO word_history (user_id, word_id, source, searched_at) VALUES (?, ?, ?, ?)",
+                ((user_id, word_id, HISTORY_SOURCE_SEARCH, now - int(rng.random() * span))
+                 for user_id, word_id in zip(batch_users, batch_words))
+            )
+            remaining -= batch
+        cursor = conn.cursor()
+        rebuild_stats(cursor)
+        cursor.execute(stats_trigger)
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return time.perf_counter() - started
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic VocabLoury data")
+    parser.add_argument("db_file", help="Database to create or extend (never the app's own database)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=100000, help="Word history rows to add")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="Distinct words")
+    parser.add_argument("--days", type=int, default=365, help="Spread searches over this many past days")
+    parser.add_argument("--word-exponent", type=float, default=1.1, help="Zipf exponent for word popularity")
+    parser.add_argument("--user-exponent", type=float, default=0.8, help="Zipf exponent for user activity")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if os.path.abspath(args.db_file) == os.path.join(PROJECT_DIR, DATABASE_NAME):
+        print("❌ Refusing to write synthetic data into the application database")
+        return 1
+    seconds = generate(args.db_file, args.users, args.rows, args.vocabulary, args.days,
+                       args.word_exponent, args.user_exponent, args.seed)
+    print(f"✅ Generated {args.rows} history rows for {args.users} users in {seconds:.1f}s")
+    DatabaseManager.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Database load benchmark for VocabLoury
+
+Generates a synthetic database at each requested size, times the queries
+behind the dashboard, profile, saved words, search and login screens for a
+heavy and a typical user, and reports how each one scales with the size of
+the word history. Every production query is also run through EXPLAIN QUERY
+PLAN so full table scans are caught even when the data is still small.
+
+A query whose time grows faster than the scaling limit (time ~ rows**k) or
+that scans a table without an index is reported as a regression, and the
+command exits with status 1.
+
+Usage:
+    python -m benchmarks.query_benchmark --scales 10000,1000000,10000000
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from config.settings import SAVED_WORDS_PAGE_SIZE
+from benchmarks.generate_data import (
+    BENCHMARK_PASSWORD, generate, synthetic_token, synthetic_username, synthetic_words
+)
+from src.models.database import DatabaseManager
+from src.models.query_stats import explain_plan
+from src.models.repositories import QUERIES
+
+DEFAULT_SCALES = (10000, 100000, 1000000)
+DEFAULT_REPEATS = 50
+LOGIN_REPEATS = 3  # Password hashing dominates login and is deliberately slow
+SCALING_LIMIT = 0.3  # Largest acceptable k in time ~ rows**k between two sizes
+NOISE_FLOOR_MS = 0.05  # Below this, differences are timer noise, not scaling
+
+# Queries that are meant to visit every row they touch
+FULL_SCAN_ALLOWED = {"account_ids", "articles_clear"}
+
+
+def time_call(func, repeats):
+    """Run func repeatedly; returns (median, p95) in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def deep_page_cursor(db, username, depth):
+    """Cursor of the saved word at position depth, leaving at least one full page after it"""
+    depth = max(0, min(depth, db.get_user_stats(username).unique_words - SAVED_WORDS_PAGE_SIZE - 1))
+    cursor = None
+    for position, saved in enumerate(db.iter_saved_words(username)):
+        cursor = saved.cursor
+        if position >= depth:
+            break
+    return cursor
+
+
+def production_queries(db, seed, user_index):
+    """(name, callable, repeats) for the queries the screens run for one user"""
+    username = synthetic_username(user_index)
+    token = synthetic_token(seed, user_index)
+    deep_cursor = deep_page_cursor(db, username, 5000)
+    # A typed prefix of the most common word; ranking cost follows the number
+    # of matches, so a one- or two-letter prefix measures the vocabulary instead
+    search_text = synthetic_words(1)[0]
+
+    def verify_token():
+        # Measure the database lookup, not the in-process token cache
+        DatabaseManager._token_cache.clear()
+        return db.verify_remember_token(token)
+
+    return [
+        ("stats cards", lambda: db.get_user_stats(username), DEFAULT_REPEATS),
+        ("streak", lambda: db.count_active_days(username, 30), DEFAULT_REPEATS),
+        ("saved words", lambda: db.get_saved_words_page(username), DEFAULT_REPEATS),
+        ("saved words (deep page)", lambda: db.get_saved_words_page(username, after=deep_cursor),
+         DEFAULT_REPEATS),
+        ("history page", lambda: db.history.history_page(username, 50), DEFAULT_REPEATS),
+        ("search", lambda: db.search(username, search_text), DEFAULT_REPEATS),
+        ("token verify", verify_token, DEFAULT_REPEATS),
+        ("login", lambda: db.verify_user(username, BENCHMARK_PASSWORD), LOGIN_REPEATS),
+    ]
+
+
+def explain_queries(db_file):
+    """Run EXPLAIN QUERY PLAN on every named query; returns {name: [plan lines]}"""
+    db = DatabaseManager(db_file)
+    conn = db.connection()
+    plans = {}
+    for name, sql in QUERIES.items():
+        plans[name] = explain_plan(conn, sql)
+    return plans
+
+
+def full_scans(plans):
+    """Plan lines that read a whole table without an index"""
+    found = []
+    for name, lines in plans.items():
+        if name in FULL_SCAN_ALLOWED:
+            continue
+        for line in lines:
+            # Virtual tables (FTS, json_each) plan their own access
+            if line.startswith("SCAN") and "USING" not in line and "VIRTUAL TABLE" not in line \
+                    and "json_each" not in line:
+                found.append((name, line))
+    return found
+
+
+def scaling_exponent(a, b):
+    """k in time ~ rows**k between two measurements, or None when they are not comparable
+
+    Pages that return fewer rows at the smaller size (a user with less than
+    a page of words) measure the result size rather than the database size.
+    """
+    if a["returned"] != b["returned"]:
+        return None
+    if b["median_ms"] <= NOISE_FLOOR_MS or a["median_ms"] <= 0:
+        return 0.0
+    return math.log(b["median_ms"] / a["median_ms"]) / math.log(b["rows"] / a["rows"])
+
+
+def run(scales, users, seed, workdir, keep=False):
+    """Benchmark every scale; returns a results dict"""
+    results = {"scales": list(scales), "users": users, "timings": {}, "full_scans": []}
+    for rows in scales:
+        db_file = os.path.join(workdir, f"bench_{rows}.db")
+        if not os.path.exists(db_file):
+            print(f"⏳ Generating {rows} history rows...")
+            generate(db_file, users=users, rows=rows, seed=seed)
+        db = DatabaseManager(db_file)
+        for label, user_index in (("heavy user", 0), ("typical user", users // 2)):
+            for name, func, repeats in production_queries(db, seed, user_index):
+                result = func()  # Warm the statement cache and page cache
+                median, p95 = time_call(func, repeats)
+                results["timings"].setdefault(f"{name} / {label}", []).append({
+                    "rows": rows, "median_ms": median, "p95_ms": p95,
+                    "returned": len(result) if isinstance(result, list) else None,
+                })
+        if rows == scales[-1]:
+            results["full_scans"] = full_scans(explain_queries(db_file))
+        db.close()
+        if not keep:
+            os.remove(db_file)
+    return results
+
+
+def regressions(results, limit=SCALING_LIMIT):
+    """(query, rows_a, rows_b, exponent) for every step that scales worse than limit"""
+    found = []
+    for query, points in results["timings"].items():
+        for a, b in zip(points, points[1:]):
+            k = scaling_exponent(a, b)
+            if k is not None and k > limit:
+                found.append((query, a["rows"], b["rows"], k))
+    return found
+
+
+def print_report(results, limit=SCALING_LIMIT):
+    scales = results["scales"]
+    width = max(len(query) for query in results["timings"])
+    header = "".join(f"{rows:>20,}" for rows in scales)
+    print(f"\n{'query (median / p95 ms)':<{width}}{header}")
+    for query, points in results["timings"].items():
+        cells = "".join(f"{p['median_ms']:>11.3f} /{p['p95_ms']:>7.3f}" for p in points)
+        exponents = [scaling_exponent(a, b) for a, b in zip(points, points[1:])]
+        curve = "  k=" + ", ".join("-" if k is None else f"{k:.2f}" for k in exponents) if exponents else ""
+        print(f"{query:<{width}}{cells}{curve}")
+
+    slow = regressions(results, limit)
+    for query, rows_a, rows_b, k in slow:
+        print(f"❌ {query}: time grows as rows^{k:.2f} from {rows_a:,} to {rows_b:,} rows")
+    for name, line in results["full_scans"]:
+        print(f"❌ {name}: {line}")
+    if not slow and not results["full_scans"]:
+        print(f"✅ Every query scales within rows^{limit} and uses an index")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time the production queries at several database sizes")
+    parser.add_argument("--scales", default=",".join(str(rows) for rows in DEFAULT_SCALES),
+                        help="Comma separated word history sizes (default: %(default)s)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--limit", type=float, default=SCALING_LIMIT,
+                        help="Largest acceptable scaling exponent (default: %(default)s)")
+    parser.add_argument("--workdir", help="Keep the generated databases here and reuse them")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scales = sorted(int(rows) for rows in args.scales.split(","))
+    workdir = args.workdir or tempfile.mkdtemp(prefix="vocabloury-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        results = run(scales, args.users, args.seed, workdir, keep=bool(args.workdir))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(results, args.limit)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if regressions(results, args.limit) or results["full_scans"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
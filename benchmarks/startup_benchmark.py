@@ -0,0 +1,208 @@
+"""
+Startup benchmark for VocabLoury
+
+Imports the login path in a fresh interpreter under ``python -X importtime``
+and reports the total import time and the slowest top-level imports. The
+login window only needs the authentication controller and views: a module
+that belongs after login (the main application's views, the dictionary API
+client, ...) showing up on that path, or one module loaded twice under two
+names, is reported as a regression and the command exits with status 1.
+
+With a display and customtkinter available it also starts the app the way
+``python main.py`` does and times how long the login window takes to be
+mapped (time to first frame), then closes it.
+
+Usage:
+    python -m benchmarks.startup_benchmark [--repeats 5] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from config.settings import STARTUP_PRELOAD_MODULES
+
+LOGIN_MODULE = "src.controllers.auth_controller"
+DEFAULT_REPEATS = 5
+DEFAULT_TOP = 15
+FIRST_FRAME_TIMEOUT_SECONDS = 30
+FIRST_FRAME_MARKER = "FIRST_FRAME"
+
+# Loaded in the background or on demand; never needed to draw the login window
+DEFERRED_MODULES = tuple(STARTUP_PRELOAD_MODULES) + ("requests", "plyer", "src.sync.client")
+
+# Runs in the child after the import: project modules whose file is loaded
+# under more than one name (e.g. "views.auth_views" and "src.views.auth_views")
+DUPLICATES_SCRIPT = '''
+import json, os, sys
+project = os.path.realpath(os.getcwd()) + os.sep
+files = {}
+for name, module in list(sys.modules.items()):
+    path = getattr(module, "__file__", None)
+    if path and os.path.realpath(path).startswith(project):
+        files.setdefault(os.path.realpath(path), []).append(name)
+print(json.dumps(sorted(sorted(names) for names in files.values() if len(names) > 1)))
+'''
+
+FIRST_FRAME_SCRIPT = f'''
+import main
+app = main.create_app()
+def mapped(event):
+    if event.widget is app.window:
+        print("{FIRST_FRAME_MARKER}", flush=True)
+        app.window.after(0, app.window.destroy)
+app.window.bind("<Map>", mapped, add="+")
+app.window.after({FIRST_FRAME_TIMEOUT_SECONDS * 1000}, app.window.destroy)
+app.run()
+'''
+
+
+class StartupError(Exception):
+    """The child interpreter could not import or start the app"""
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output; returns [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+def measure_imports(module):
+    """Import module in a fresh interpreter; returns (import rows, duplicate module names)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}\n{DUPLICATES_SCRIPT}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise StartupError(errors[-1] if errors else f"exit status {result.returncode}")
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_first_frame():
+    """Start the app and wait for the login window; returns seconds, or raises StartupError"""
+    started = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT], cwd=PROJECT_DIR,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        for line in child.stdout:
+            if line.strip() == FIRST_FRAME_MARKER:
+                return time.perf_counter() - started
+        child.wait(FIRST_FRAME_TIMEOUT_SECONDS)
+        errors = child.stderr.read().strip().splitlines()
+        raise StartupError(errors[-1] if errors else "the login window was never shown")
+    finally:
+        if child.poll() is None:
+            try:
+                child.wait(FIRST_FRAME_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                child.kill()
+        child.stdout.close()
+        child.stderr.close()
+
+
+def run(module, repeats, top):
+    """Time the login path; returns a results dict"""
+    results = {"module": module, "repeats": repeats}
+    totals = []
+    rows = duplicates = None
+    # The first run also fills __pycache__, so it is not counted
+    for attempt in range(repeats + 1):
+        rows, duplicates = measure_imports(module)
+        if attempt:
+            totals.append(sum(row[1] for row in rows) / 1000)
+    top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: row[2], reverse=True)
+    loaded = {row[0] for row in rows}
+    results.update({
+        "import_ms": statistics.median(totals),
+        "modules": len(rows),
+        "slowest": [{"module": name, "self_ms": own / 1000, "cumulative_ms": total / 1000}
+                    for name, own, total, _ in top_level[:top]],
+        "deferred_loaded": sorted(name for name in DEFERRED_MODULES if name in loaded),
+        "duplicates": duplicates,
+    })
+
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        results["first_frame_skipped"] = "no display"
+        return results
+    try:
+        frames = [measure_first_frame() * 1000 for _ in range(repeats)]
+    except StartupError as e:
+        results["first_frame_skipped"] = str(e)
+    else:
+        results["first_frame_ms"] = statistics.median(frames)
+        results["first_frame_max_ms"] = max(frames)
+    return results
+
+
+def regressions(results):
+    """Human readable problems found in the results"""
+    found = [f"{name} is imported before the login window is shown"
+             for name in results["deferred_loaded"]]
+    found += [f"one module loaded as {', '.join(names)}" for names in results["duplicates"]]
+    return found
+
+
+def print_report(results):
+    print(f"\n⏱️  import {results['module']}: {results['import_ms']:.1f} ms "
+          f"(median of {results['repeats']}, {results['modules']} modules)")
+    width = max([len(row["module"]) for row in results["slowest"]] + [len("module")]) + 2
+    print(f"\n{'module':<{width}}{'self ms':>10}{'cumulative ms':>15}")
+    for row in results["slowest"]:
+        print(f"{row['module']:<{width}}{row['self_ms']:>10.1f}{row['cumulative_ms']:>15.1f}")
+    print()
+    if "first_frame_ms" in results:
+        print(f"🖼️  First frame: {results['first_frame_ms']:.0f} ms median, "
+              f"{results['first_frame_max_ms']:.0f} ms worst")
+    else:
+        print(f"⚠️  First frame not measured: {results['first_frame_skipped']}")
+    problems = regressions(results)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ The login path only imports what the login window needs")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time the imports and first frame of the login window")
+    parser.add_argument("--module", default=LOGIN_MODULE, help="Module that starts the login window")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Slowest imports to list")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        results = run(args.module, max(args.repeats, 1), args.top)
+    except StartupError as e:
+        print(f"⚠️  Skipped: could not import {args.module}: {e}")
+        return 0
+    print_report(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if regressions(results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
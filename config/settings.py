@@ -37,14 +37,94 @@ PROFESSION_TO_TOPIC = {
 # API settings
 DICTIONARY_API_BASE_URL = "https://api.dictionaryapi.dev/api/v2/entries/en"
 DATAMUSE_API_BASE_URL = "https://api.datamuse.com/words"
+API_TIMEOUT_SECONDS = 10  # give up on a single API request after this long
+DEFINITION_FETCH_CONCURRENCY = 8  # parallel requests when fetching many definitions
+ALPHABET_SEARCH_LIMIT = 1000  # words listed per letter (the most Datamuse returns)
 
 # Database settings
 DATABASE_NAME = "authentication.db"
+DATABASE_TIMEOUT_SECONDS = 10  # wait this long for a locked database
+STATEMENT_CACHE_SIZE = 128  # prepared statements kept per connection
+SAVED_WORDS_PAGE_SIZE = 50  # saved words fetched per query as the list scrolls
+STREAM_PAGE_SIZE = 1000  # rows per query when streaming whole result sets
+EXPORT_PAGE_SIZE = 2000  # history rows read per query during data export
+EXPORT_BUFFER_SIZE = 256 * 1024  # bytes buffered before each export file write
+IMPORT_CHUNK_SIZE = 500  # words committed per transaction by word list imports
+HISTORY_RETENTION_DAYS = 90  # keep individual searches this long, then roll them up per day
+COMPACTION_BATCH_SIZE = 5000  # history rows rolled up per transaction
+COMPACTION_INTERVAL_MS = 24 * 60 * 60 * 1000  # how often the running app compacts history
+SEARCH_RESULT_LIMIT = 20  # full-text search results per kind (words, definitions, articles)
+SEARCH_DEBOUNCE_MS = 250  # wait for a typing pause before searching
+HISTORY_FLUSH_INTERVAL_MS = 500  # write buffered history at least this often
+HISTORY_FLUSH_MAX_ROWS = 50  # or as soon as this many rows are waiting
+HISTORY_RETRY_MAX_MS = 5000  # longest wait between retries of a failed history write
+EVENT_POLL_INTERVAL_MS = 100  # how often pages receive (coalesced) change events
+MIGRATION_BATCH_SIZE = 5000  # rows copied per transaction by schema migrations
+
+# Backup settings
+BACKUP_DIR = "backups"  # relative to the project directory
+BACKUP_KEEP = 7  # newest backups kept, older ones are deleted
+BACKUP_INTERVAL_HOURS = 24  # the running app backs up when the newest backup is this old
+BACKUP_CHECK_INTERVAL_MS = 60 * 60 * 1000  # how often the running app checks whether a backup is due
+BACKUP_STEP_PAGES = 64  # database pages copied per backup step
+BACKUP_STEP_SLEEP_SECONDS = 0.05  # pause between steps so writers can take the lock
+BACKUP_MAX_RESTARTS = 5  # after this many restarts caused by writes, copy the rest in one step
+
+# History sync settings (see src/sync)
+SYNC_SERVER_URL = ""  # e.g. "http://lab-server:8765"; empty turns sync off
+SYNC_INTERVAL_MS = 10 * 60 * 1000  # how often the running app syncs the signed-in user
+SYNC_BATCH_SIZE = 500  # changes per push or pull request
+SYNC_TIMEOUT_SECONDS = 30  # give up on a single sync request after this long
+SYNC_SERVER_PORT = 8765  # default port of the reference server
+
+# Query instrumentation settings
+QUERY_STATS_ENABLED = True  # time every repository query and note the view that ran it
+QUERY_TRACE_ENABLED = False  # also count every SQL statement SQLite runs, including triggers
+QUERY_SLOW_MS = 100  # log queries slower than this
+QUERY_EXPLAIN_SLOW = False  # capture EXPLAIN QUERY PLAN the first time a query is slow
+QUERY_STATS_SAMPLES = 1000  # recent timings kept per query for the p95
+QUERY_STATS_FILE = "query_stats.json"  # written on exit when any queries were recorded
+
+# Background task settings (see src/controllers/task_executor.py)
+TASK_WORKER_THREADS = 4  # threads for network requests, password hashing and other blocking work
+TASK_POLL_INTERVAL_MS = 20  # how often the UI collects finished work while tasks are running
+TASK_IDLE_POLL_INTERVAL_MS = 100  # and while none are
+
+# Authentication settings
+REMEMBER_TOKEN_DAYS = 30  # remember me tokens expire after this many days
+TOKEN_CACHE_TTL_SECONDS = 60  # reuse a successful token check for this long
+TOKEN_GC_INTERVAL_MS = 6 * 60 * 60 * 1000  # purge expired tokens every 6 hours
+TOKEN_GC_BATCH_SIZE = 500  # tokens deleted per transaction
+
+# Password hashing ("scrypt" or "pbkdf2-sha256"); run
+# `python manage.py calibrate-hashing` to tune the cost for this machine
+PASSWORD_HASH_SCHEME = "scrypt"
+PASSWORD_HASH_TARGET_MS = 150  # latency budget used by calibration
+PBKDF2_ITERATIONS = 100000
+PBKDF2_MIN_ITERATIONS = 100000
+SCRYPT_N = 2 ** 14  # 16 MB of memory per hash with r=8
+SCRYPT_MIN_N = 2 ** 14
+SCRYPT_MAX_N = 2 ** 17
+SCRYPT_R = 8
+SCRYPT_P = 1
 
 # Animation settings
 ANIMATION_INTERVAL = 30  # milliseconds (faster animation)
 PARTICLE_COUNT = 30  # More particles
 
+# Navigation settings
+PAGE_CACHE_SIZE = 5  # pages kept mounted (hidden) after a visit, least recently used dropped first
+PAGE_PRELOAD = ("dictionary", "saved_words")  # pages built ahead of time while the app is idle
+PAGE_PRELOAD_DELAY_MS = 3000  # wait this long after login before preloading
+
+# List settings
+VIRTUAL_LIST_OVERSCAN = 4  # rows bound above and below the visible ones in long lists
+VIRTUAL_LIST_SCROLL_STEP = 20  # pixels per mouse wheel notch
+
+# Startup settings
+STARTUP_PRELOAD_DELAY_MS = 300  # after the login window is drawn, start importing the modules below
+STARTUP_PRELOAD_MODULES = ("src.views.main_views", "src.api.dictionary_api")
+
 # Window settings
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 800
@@ -2,15 +2,18 @@
 Main entry point for VocabLoury Desktop Application
 """
 
-import sys
-import os
 import customtkinter as ctk
 
-# Add src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from src.controllers.auth_controller import AuthenticationApp
+from config.settings import THEME_MODE
 
-from controllers.auth_controller import AuthenticationApp
-from config.settings import WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, THEME_MODE
+
+def create_app():
+    """Create the application with the login window ready to show"""
+    # Set appearance mode
+    ctk.set_appearance_mode(THEME_MODE)
+    ctk.set_default_color_theme("blue")
+    return AuthenticationApp()
 
 
 def main():
@@ -20,12 +23,8 @@ def main():
     print("🎨 Modern UI with Black Theme")
     print("✨ Enhanced Animations & Professional Design")
     
-    # Set appearance mode
-    ctk.set_appearance_mode(THEME_MODE)
-    ctk.set_default_color_theme("blue")
-    
     # Create and run the application
-    app = AuthenticationApp()
+    app = create_app()
     app.run()
 
 
@@ -0,0 +1,335 @@
+"""
+Maintenance commands for VocabLoury application
+
+Usage:
+    python manage.py migrate [--vacuum]
+    python manage.py rebuild-stats [--user USERNAME]
+    python manage.py calibrate-hashing [--target-ms MS] [--scheme SCHEME]
+    python manage.py import-words PATH --user USERNAME [--user USERNAME ...] [--no-definitions]
+    python manage.py compact-history [--days DAYS] [--vacuum]
+    python manage.py provision-users PATH [--workers N]
+    python manage.py query-stats [--file PATH] [--top N]
+    python manage.py backup [--dir DIR] [--keep N] [--list]
+    python manage.py restore [PATH] [--dir DIR]
+    python manage.py sync --user USERNAME [--user USERNAME ...] [--server URL]
+    python manage.py sync-server [--host HOST] [--port PORT] [--db PATH]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from src.models.database import DatabaseManager
+from config.settings import (
+    PASSWORD_HASH_SCHEME, PASSWORD_HASH_TARGET_MS, HISTORY_RETENTION_DAYS, QUERY_STATS_FILE,
+    BACKUP_KEEP, SYNC_SERVER_PORT, SYNC_SERVER_URL
+)
+from src.models.migrations import SCHEMA_VERSION, get_version
+from src.models.password_hashing import SCHEME_PBKDF2, SCHEME_SCRYPT
+
+
+def migrate(args):
+    """Upgrade the database schema to the current version"""
+    # Creating the manager applies any pending migrations
+    db = DatabaseManager()
+    conn = sqlite3.connect(db.db_file)
+    try:
+        version = get_version(conn)
+        if args.vacuum:
+            # Reclaim the space freed by the migration
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+    if version != SCHEMA_VERSION:
+        print(f"❌ Database is at schema v{version}, expected v{SCHEMA_VERSION}")
+        return 1
+    print(f"✅ Database schema is at v{version}")
+    return 0
+
+
+def rebuild_stats(args):
+    """Recompute the per-user summary tables from word_history"""
+    db = DatabaseManager()
+    if db.rebuild_user_stats(args.user):
+        print(f"✅ Rebuilt statistics for {args.user or 'all users'}")
+        return 0
+    print("❌ Failed to rebuild statistics")
+    return 1
+
+
+def calibrate_hashing(args):
+    """Pick password hashing parameters for this machine"""
+    db = DatabaseManager()
+    scheme, params = db.calibrate_password_hashing(args.target_ms, args.scheme)
+    print(f"✅ New passwords will use {scheme} with {params}")
+    print("   Existing accounts are upgraded on their next login")
+    return 0
+
+
+def import_words(args):
+    """Load a CSV or text word list into users' word history"""
+    from src.models.importer import WordListImporter
+    
+    db = DatabaseManager()
+    status = 0
+    for username in args.user:
+        importer = WordListImporter(db, username, args.path,
+                                    fetch_definitions=not args.no_definitions)
+        started = time.perf_counter()
+        importer.start()
+        try:
+            while not importer.finished.wait(0.5):
+                print(f"\r   {username}: {importer.imported}/{importer.total} words", end="", flush=True)
+        except KeyboardInterrupt:
+            # Stops after the current chunk; running the command again resumes
+            importer.cancel()
+            importer.finished.wait()
+        print()
+        
+        if importer.error:
+            print(f"❌ {username}: {importer.error}")
+            status = 1
+        elif importer.cancelled:
+            print(f"⏸️  {username}: stopped at {importer.imported}/{importer.total} words, run again to resume")
+            return 1
+        else:
+            resumed = f", resumed at {importer.resumed_from}" if importer.resumed_from else ""
+            print(f"✅ {username}: imported {importer.total} words in "
+                  f"{time.perf_counter() - started:.1f}s ({importer.skipped} skipped{resumed})")
+    return status
+
+
+def compact_history(args):
+    """Roll up word history older than the retention horizon"""
+    db = DatabaseManager()
+    started = time.perf_counter()
+    compacted = db.compact_history(args.days)
+    print(f"✅ Rolled up {compacted} searches older than {args.days} days "
+          f"in {time.perf_counter() - started:.1f}s")
+    if args.vacuum:
+        # Give the freed pages back to the file system
+        conn = sqlite3.connect(db.db_file)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+    return 0
+
+
+def provision_users(args):
+    """Create accounts from a CSV of username, email, password, profession"""
+    from src.models.provisioning import provision_users, read_user_csv
+    
+    try:
+        rows = read_user_csv(args.path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    
+    db = DatabaseManager()
+    started = time.perf_counter()
+    report = provision_users(db, rows, args.workers)
+    for error in report.errors:
+        print(f"   line {error.line} ({error.username or 'no username'}): {error.message}")
+    print(f"✅ Created {len(report.created)} of {len(rows)} accounts "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if report.errors else 0
+
+
+def query_stats(args):
+    """Show the query statistics the app wrote on exit"""
+    path = args.file or os.path.join(os.path.dirname(os.path.abspath(__file__)), QUERY_STATS_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            stats = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read query statistics: {e}")
+        return 1
+    
+    print(f"{'query':<32}{'count':>8}{'total ms':>11}{'mean':>9}{'p95':>9}{'max':>9}{'rows':>9}  top view")
+    for query in stats["queries"][:args.top]:
+        top_view = max(query["views"].items(), key=lambda item: item[1])[0] if query["views"] else ""
+        print(f"{query['name']:<32}{query['count']:>8}{query['total_ms']:>11.1f}{query['mean_ms']:>9.2f}"
+              f"{query['p95_ms']:>9.2f}{query['max_ms']:>9.2f}{query['rows']:>9}  {top_view}")
+    
+    if stats["statements"]:
+        print("\nStatements by view (SQL trace):")
+        for statement in stats["statements"][:args.top]:
+            print(f"{statement['count']:>8}  {statement['view']}: {statement['statement']}")
+    
+    if stats["slow"]:
+        print("\nSlow queries:")
+        for slow in stats["slow"][-args.top:]:
+            print(f"   {slow['name']}: {slow['duration_ms']:.1f} ms, {slow['rows']} rows ({slow['view']})")
+            for line in slow["plan"] or []:
+                print(f"      {line}")
+    return 0
+
+
+def backup(args):
+    """Back up the database while the app keeps running"""
+    from datetime import datetime
+    from src.models.backup import BackupService, list_backups
+    
+    db = DatabaseManager()
+    backup_dir = args.dir or db.backup_dir()
+    if args.list:
+        for item in list_backups(db.db_file, backup_dir):
+            created = datetime.fromtimestamp(item.created).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"   {created}  {item.size / 1024:>10.0f} KB  {item.path}")
+        return 0
+    
+    service = BackupService(db.db_file, backup_dir, keep=args.keep)
+    started = time.perf_counter()
+    path = service.run()
+    if path is None:
+        print(f"❌ Backup failed: {service.error}")
+        return 1
+    restarts = f", restarted {service.restarts}x by writes" if service.restarts else ""
+    print(f"✅ Backed up {service.total_pages} pages to {path} "
+          f"in {time.perf_counter() - started:.1f}s{restarts}")
+    return 0
+
+
+def restore(args):
+    """Replace the database with a backup (the newest one by default)"""
+    from src.models.backup import list_backups, restore_backup
+    
+    db = DatabaseManager()
+    backup_dir = args.dir or db.backup_dir()
+    path = args.path
+    if path is None:
+        backups = list_backups(db.db_file, backup_dir)
+        if not backups:
+            print(f"❌ No backups found in {backup_dir}")
+            return 1
+        path = backups[0].path
+    
+    try:
+        safety = restore_backup(path, db.db_file, backup_dir)
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ Restore failed: {e}")
+        return 1
+    if safety:
+        print(f"   The previous database was saved to {safety}")
+    print(f"✅ Restored {path}")
+    return 0
+
+
+def sync(args):
+    """Sync users' history with the sync server"""
+    from src.sync.client import SyncClient
+    
+    server = args.server or SYNC_SERVER_URL
+    if not server:
+        print("❌ No sync server: pass --server or set SYNC_SERVER_URL in config/settings.py")
+        return 1
+    db = DatabaseManager()
+    failed = False
+    for username in args.user:
+        client = SyncClient(db, username, server)
+        started = time.perf_counter()
+        if client.run():
+            print(f"✅ {username}: sent {client.pushed}, received {client.pulled} changes "
+                  f"in {time.perf_counter() - started:.1f}s")
+        else:
+            print(f"❌ {username}: sync failed: {client.error}")
+            failed = True
+    return 1 if failed else 0
+
+
+def sync_server(args):
+    """Run the reference sync server until interrupted"""
+    from src.sync import server
+    
+    return server.main(["--host", args.host, "--port", str(args.port), "--db", args.db]
+                       + (["--verbose"] if args.verbose else []))
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="VocabLoury maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    upgrade.add_argument("--vacuum", action="store_true", help="Compact the database afterwards")
+    upgrade.set_defaults(func=migrate)
+
+    rebuild = subparsers.add_parser("rebuild-stats", help="Rebuild user statistics tables")
+    rebuild.add_argument("--user", help="Only rebuild this user's statistics")
+    rebuild.set_defaults(func=rebuild_stats)
+
+    calibrate = subparsers.add_parser("calibrate-hashing",
+                                      help="Tune password hashing cost for this machine")
+    calibrate.add_argument("--target-ms", type=float, default=PASSWORD_HASH_TARGET_MS,
+                           help="Latency budget for one password hash")
+    calibrate.add_argument("--scheme", choices=[SCHEME_SCRYPT, SCHEME_PBKDF2],
+                           default=PASSWORD_HASH_SCHEME)
+    calibrate.set_defaults(func=calibrate_hashing)
+
+    importer = subparsers.add_parser("import-words", help="Import a word list into users' history")
+    importer.add_argument("path", help="CSV or text file with one word per row")
+    importer.add_argument("--user", action="append", required=True,
+                          help="User to import into (repeat for several users)")
+    importer.add_argument("--no-definitions", action="store_true",
+                          help="Skip fetching definitions for uncached words")
+    importer.set_defaults(func=import_words)
+
+    compact = subparsers.add_parser("compact-history",
+                                    help="Roll up old word history into per-day totals")
+    compact.add_argument("--days", type=int, default=HISTORY_RETENTION_DAYS,
+                         help="Keep individual searches for this many days")
+    compact.add_argument("--vacuum", action="store_true", help="Compact the database afterwards")
+    compact.set_defaults(func=compact_history)
+
+    provision = subparsers.add_parser("provision-users", help="Create accounts from a CSV file")
+    provision.add_argument("path", help="CSV with username, email, password and profession columns")
+    provision.add_argument("--workers", type=int, help="Hashing processes (default: all cores)")
+    provision.set_defaults(func=provision_users)
+
+    stats = subparsers.add_parser("query-stats", help="Show the query statistics from the last app session")
+    stats.add_argument("--file", help=f"Statistics file (default: {QUERY_STATS_FILE})")
+    stats.add_argument("--top", type=int, default=20, help="Show this many entries per section")
+    stats.set_defaults(func=query_stats)
+
+    save = subparsers.add_parser("backup", help="Back up the database (safe while the app runs)")
+    save.add_argument("--dir", help="Backup directory (default: backups/ next to the database)")
+    save.add_argument("--keep", type=int, default=BACKUP_KEEP, help="Number of backups to keep")
+    save.add_argument("--list", action="store_true", help="List existing backups instead")
+    save.set_defaults(func=backup)
+
+    load = subparsers.add_parser("restore", help="Restore the database from a backup (close the app first)")
+    load.add_argument("path", nargs="?", help="Backup file (default: the newest backup)")
+    load.add_argument("--dir", help="Backup directory (default: backups/ next to the database)")
+    load.set_defaults(func=restore)
+
+    push = subparsers.add_parser("sync", help="Sync users' history with the sync server")
+    push.add_argument("--user", action="append", required=True,
+                      help="User to sync (repeat for several users)")
+    push.add_argument("--server", help="Server URL (default: SYNC_SERVER_URL)")
+    push.set_defaults(func=sync)
+
+    serve = subparsers.add_parser("sync-server", help="Run the reference sync server (for testing)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=SYNC_SERVER_PORT)
+    serve.add_argument("--db", default="sync_server.db", help="Server change log file")
+    serve.add_argument("--verbose", action="store_true", help="Log every request")
+    serve.set_defaults(func=sync_server)
+
+    return parser
+
+
+def main(argv=None):
+    """Maintenance entry point"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    finally:
+        DatabaseManager.close_all()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
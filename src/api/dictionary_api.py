@@ -3,8 +3,23 @@ Dictionary API integration for VocabLoury application
 """
 
 import requests
-from typing import Dict, List, Optional
-from config.settings import DICTIONARY_API_BASE_URL, DATAMUSE_API_BASE_URL
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from config.settings import (
+    DICTIONARY_API_BASE_URL, DATAMUSE_API_BASE_URL, API_TIMEOUT_SECONDS, DEFINITION_FETCH_CONCURRENCY
+)
+
+# One HTTP session per thread so requests reuse their connections
+_sessions = threading.local()
+
+
+def _session() -> requests.Session:
+    """Get this thread's HTTP session"""
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+    return session
 
 
 class DictionaryAPI:
@@ -14,7 +29,8 @@ class DictionaryAPI:
     def get_word_definition(word: str) -> Optional[Dict]:
         """Get word definition from Free Dictionary API"""
         try:
-            response = requests.get(f"{DICTIONARY_API_BASE_URL}/{word.lower()}")
+            response = _session().get(f"{DICTIONARY_API_BASE_URL}/{word.lower()}",
+                                      timeout=API_TIMEOUT_SECONDS)
             if response.status_code == 200:
                 data = response.json()
                 if data and len(data) > 0:
@@ -24,11 +40,40 @@ class DictionaryAPI:
             print(f"API Error: {e}")
             return None
     
+    @staticmethod
+    def get_word_definitions(words: Iterable[str],
+                             max_workers: int = DEFINITION_FETCH_CONCURRENCY) -> Dict[str, Optional[Dict]]:
+        """Get definitions for many words, at most `max_workers` requests at a time
+        
+        Words that are not found map to None; words whose request failed are
+        left out so the caller can retry them later.
+        """
+        def fetch(word):
+            try:
+                response = _session().get(f"{DICTIONARY_API_BASE_URL}/{word.lower()}",
+                                          timeout=API_TIMEOUT_SECONDS)
+                if response.status_code == 200:
+                    data = response.json()
+                    return word, (data[0] if data else None), True
+                # 404 means the dictionary has no entry; anything else is transient
+                return word, None, response.status_code == 404
+            except Exception as e:
+                print(f"API Error: {e}")
+                return word, None, False
+        
+        definitions = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="definitions") as executor:
+            for word, definition, resolved in executor.map(fetch, words):
+                if resolved:
+                    definitions[word] = definition
+        return definitions
+    
     @staticmethod
     def get_word_synonyms(word: str) -> List[str]:
         """Get synonyms using Datamuse API"""
         try:
-            response = requests.get(f"{DATAMUSE_API_BASE_URL}?rel_syn={word}")
+            response = _session().get(f"{DATAMUSE_API_BASE_URL}?rel_syn={word}",
+                                      timeout=API_TIMEOUT_SECONDS)
             if response.status_code == 200:
                 data = response.json()
                 return [item['word'] for item in data[:10]]  # Top 10 synonyms
@@ -41,7 +86,8 @@ class DictionaryAPI:
     def get_word_antonyms(word: str) -> List[str]:
         """Get antonyms using Datamuse API"""
         try:
-            response = requests.get(f"{DATAMUSE_API_BASE_URL}?rel_ant={word}")
+            response = _session().get(f"{DATAMUSE_API_BASE_URL}?rel_ant={word}",
+                                      timeout=API_TIMEOUT_SECONDS)
             if response.status_code == 200:
                 data = response.json()
                 return [item['word'] for item in data[:10]]  # Top 10 antonyms
@@ -54,7 +100,8 @@ class DictionaryAPI:
     def get_words_by_topic(topic: str, max_words: int = 100) -> List[str]:
         """Get words related to a specific topic"""
         try:
-            response = requests.get(f"{DATAMUSE_API_BASE_URL}?topics={topic}&max={max_words}")
+            response = _session().get(f"{DATAMUSE_API_BASE_URL}?topics={topic}&max={max_words}",
+                                      timeout=API_TIMEOUT_SECONDS)
             if response.status_code == 200:
                 data = response.json()
                 return [item['word'] for item in data if len(item['word']) > 2]
@@ -67,7 +114,8 @@ class DictionaryAPI:
     def get_words_by_alphabet(letter: str, max_words: int = 50) -> List[str]:
         """Get words starting with a specific letter"""
         try:
-            response = requests.get(f"{DATAMUSE_API_BASE_URL}?sp={letter}*&max={max_words}")
+            response = _session().get(f"{DATAMUSE_API_BASE_URL}?sp={letter}*&max={max_words}",
+                                      timeout=API_TIMEOUT_SECONDS)
             if response.status_code == 200:
                 data = response.json()
                 return [item['word'] for item in data if len(item['word']) > 2]
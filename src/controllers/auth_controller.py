@@ -1,11 +1,24 @@
 """
 Authentication controller for VocabLoury application
+
+Only what the login window needs is imported up front. The main
+application's views (and the HTTP client the dictionary pages use) are
+imported in the background once the login window is up, so they are
+usually ready by the time the user has signed in.
 """
 
+import importlib
+
 import customtkinter as ctk
-from views.auth_views import LoginPage, SignupPage
-from views.main_views import MainApplication
-from config.settings import WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, THEME_MODE, COLORS
+from src.views.auth_views import LoginPage, SignupPage
+from src.models.backup import BackupService, backup_due
+from src.models.database import DatabaseManager
+from src.controllers.task_executor import task_executor
+from config.settings import (
+    WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT, THEME_MODE, COLORS,
+    TOKEN_GC_INTERVAL_MS, COMPACTION_INTERVAL_MS, QUERY_STATS_FILE,
+    BACKUP_INTERVAL_HOURS, BACKUP_CHECK_INTERVAL_MS, STARTUP_PRELOAD_DELAY_MS, STARTUP_PRELOAD_MODULES
+)
 
 
 class AuthenticationApp:
@@ -27,19 +40,65 @@ class AuthenticationApp:
         # Add window close handler
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # Background work reports back on this window's Tk thread
+        self.tasks = task_executor()
+        self.tasks.attach(self.window)
+        
         self.container = ctk.CTkFrame(self.window, fg_color=COLORS[THEME_MODE]["bg"])
         self.container.pack(fill="both", expand=True)
         
         self.current_page = None
         self.show_login_page()
+        
+        # Load the main application's modules while the user signs in
+        self.window.after(STARTUP_PRELOAD_DELAY_MS, self.preload_modules)
+        # Purge expired remember me tokens once startup has settled, then periodically
+        self.window.after(5000, self.collect_expired_tokens)
+        # Roll up old word history the same way, a little later
+        self.window.after(15000, self.compact_history)
+        # Back up the database once a day without closing the app
+        self.backup = None
+        self.window.after(60000, self.backup_database)
+    
+    def preload_modules(self):
+        """Import the modules needed after login on a background thread"""
+        for name in STARTUP_PRELOAD_MODULES:
+            self.tasks.submit(importlib.import_module, name,
+                              on_error=lambda e, name=name: print(f"Preload of {name} failed: {e}"))
+    
+    def collect_expired_tokens(self):
+        """Delete expired remember me tokens in the background"""
+        self.tasks.submit(lambda: DatabaseManager().purge_expired_tokens())
+        self.window.after(TOKEN_GC_INTERVAL_MS, self.collect_expired_tokens)
+    
+    def compact_history(self):
+        """Roll up word history older than the retention horizon in the background"""
+        self.tasks.submit(lambda: DatabaseManager().compact_history())
+        self.window.after(COMPACTION_INTERVAL_MS, self.compact_history)
+    
+    def backup_database(self):
+        """Start a background backup when the newest one is old enough"""
+        db = DatabaseManager()
+        if not (self.backup and self.backup.running) and \
+                backup_due(db.db_file, db.backup_dir(), BACKUP_INTERVAL_HOURS):
+            self.backup = BackupService(db.db_file, db.backup_dir())
+            self.backup.start()
+        self.window.after(BACKUP_CHECK_INTERVAL_MS, self.backup_database)
     
     def on_closing(self):
-        # Stop any active notifications
-        if hasattr(self.current_page, 'notification_active'):
-            self.current_page.notification_active = False
-            if hasattr(self.current_page, 'notification_thread'):
-                if self.current_page.notification_thread:
-                    self.current_page.notification_thread.join(timeout=1)
+        # Drop queued background work; requests already running are abandoned
+        self.tasks.shutdown()
+        
+        # An unfinished backup is discarded, the next start takes a new one
+        if self.backup and self.backup.running:
+            self.backup.cancel()
+            self.backup.finished.wait(timeout=2)
+        
+        # Write out any buffered word history
+        DatabaseManager.close_all()
+        # Keep this session's query statistics for `manage.py query-stats`
+        if QUERY_STATS_FILE:
+            DatabaseManager.dump_query_stats()
         self.window.destroy()
     
     def show_login_page(self):
@@ -0,0 +1,61 @@
+"""
+Background authentication worker for VocabLoury application
+
+Password hashing is deliberately slow, so login, signup and remember-token
+checks run on the shared task executor and their results are delivered
+back on the Tk thread, as long as the page that asked is still there.
+"""
+
+from src.controllers.task_executor import task_executor
+from src.models.database import DatabaseManager
+
+
+def _login(username, password, remember):
+    """Verify credentials and optionally issue a remember-me token"""
+    db = DatabaseManager()
+    success, user_id = db.verify_user(username, password)
+    token = None
+    if success and remember:
+        token = db.create_remember_token(user_id)
+    return success, token
+
+
+def _signup(username, email, password, profession):
+    """Create a new account"""
+    return DatabaseManager().create_user(username, email, password, profession)
+
+
+def _check_token(token):
+    """Check a remember-me token"""
+    return DatabaseManager().verify_remember_token(token)
+
+
+def _report(error):
+    print(f"Authentication error: {error}")
+
+
+class AuthWorker:
+    """Runs authentication work off the Tk thread on behalf of a widget"""
+
+    def __init__(self, widget):
+        self.widget = widget
+
+    def submit(self, func, *args, on_success=None, on_error=None):
+        """Run func(*args) in the background; callbacks run on the Tk thread"""
+        return task_executor().submit(func, *args, owner=self.widget,
+                                      on_success=on_success, on_error=on_error or _report)
+
+    def login(self, username, password, remember, on_success, on_error=None):
+        """Verify credentials; on_success receives (success, token)"""
+        return self.submit(_login, username, password, remember,
+                           on_success=lambda result: on_success(*result), on_error=on_error)
+
+    def signup(self, username, email, password, profession, on_success, on_error=None):
+        """Create an account; on_success receives (success, message)"""
+        return self.submit(_signup, username, email, password, profession,
+                           on_success=lambda result: on_success(*result), on_error=on_error)
+
+    def check_token(self, token, on_success, on_error=None):
+        """Check a remember-me token; on_success receives (valid, username)"""
+        return self.submit(_check_token, token,
+                           on_success=lambda result: on_success(*result), on_error=on_error)
@@ -0,0 +1,155 @@
+"""
+Background task executor for VocabLoury application
+
+Blocking work (HTTP requests, password hashing, slow queries) runs on one
+shared thread pool so the Tk main loop never waits for it. ``submit``
+returns a ``Future``; when it finishes, its callbacks are put on a single
+queue that the Tk thread drains with a short ``after`` loop, so callbacks
+always run on the Tk thread and worker threads never touch a widget.
+
+A task may belong to a widget: once that widget is destroyed the task is
+cancelled if it has not started, and its callbacks are dropped if it has.
+A task submitted with a `key` replaces the owner's previous task with the
+same key, so a newer search wins over one still in flight.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from config.settings import TASK_IDLE_POLL_INTERVAL_MS, TASK_POLL_INTERVAL_MS, TASK_WORKER_THREADS
+
+
+def _alive(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+class TaskExecutor:
+    """Thread pool whose results are delivered on the Tk thread"""
+
+    def __init__(self, max_workers=TASK_WORKER_THREADS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+        self._ready = queue.SimpleQueue()  # callables to run on the Tk thread
+        self._tasks = {}  # future -> (owner, on_success, on_error); Tk thread only
+        self._keyed = {}  # (owner, key) -> latest future
+        self._widget = None
+        self._job = None
+
+    def attach(self, widget):
+        """Deliver results on widget's Tk thread (the root window) until detach()"""
+        self.detach()
+        self._widget = widget
+        self._job = widget.after(TASK_POLL_INTERVAL_MS, self._poll)
+
+    def detach(self):
+        if self._widget is not None and self._job is not None:
+            try:
+                self._widget.after_cancel(self._job)
+            except Exception:
+                pass
+        self._widget = None
+        self._job = None
+
+    def submit(self, func, *args, owner=None, key=None, on_success=None, on_error=None):
+        """Run func(*args) on a worker thread; call this on the Tk thread
+
+        on_success(result) or on_error(exception) runs on the Tk thread, and
+        only while `owner` (if given) still exists.
+        """
+        if key is not None:
+            previous = self._keyed.get((owner, key))
+            if previous is not None:
+                self._forget(previous)
+        future = self._pool.submit(func, *args)
+        self._tasks[future] = (owner, on_success, on_error)
+        if key is not None:
+            self._keyed[(owner, key)] = future
+        future.add_done_callback(lambda done: self._ready.put(partial(self._deliver, done)))
+        return future
+
+    def call_soon(self, callback, *args):
+        """Run callback(*args) on the Tk thread; safe to call from any thread"""
+        self._ready.put(partial(callback, *args))
+
+    def cancel(self, owner):
+        """Cancel every task of owner (e.g. a page being closed)"""
+        for future, (task_owner, _, _) in list(self._tasks.items()):
+            if task_owner is owner:
+                self._forget(future)
+
+    def pending(self, owner=None):
+        """Number of unfinished tasks (of owner, when given)"""
+        return sum(1 for task_owner, _, _ in self._tasks.values() if owner is None or task_owner is owner)
+
+    def drain(self):
+        """Run the callbacks that are ready; returns how many ran"""
+        count = 0
+        while True:
+            try:
+                callback = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            count += 1
+            try:
+                callback()
+            except Exception as e:
+                print(f"Background task callback error: {e}")
+        # Tasks of destroyed widgets are not worth running
+        for future, (owner, _, _) in list(self._tasks.items()):
+            if owner is not None and not _alive(owner):
+                self._forget(future)
+        return count
+
+    def shutdown(self):
+        """Drop queued work and stop accepting tasks (on exit)"""
+        self.detach()
+        self._tasks = {}
+        self._keyed = {}
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, future):
+        future.cancel()
+        self._tasks.pop(future, None)
+        for key, latest in list(self._keyed.items()):
+            if latest is future:
+                del self._keyed[key]
+
+    def _deliver(self, future):
+        task = self._tasks.get(future)
+        if task is None:
+            return  # cancelled, replaced or its owner went away
+        self._forget(future)
+        owner, on_success, on_error = task
+        if owner is not None and not _alive(owner):
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Background task error: {error}")
+        elif on_success:
+            on_success(future.result())
+
+    def _poll(self):
+        widget = self._widget
+        if widget is None:
+            return
+        self.drain()
+        if self._widget is widget:
+            interval = TASK_POLL_INTERVAL_MS if self._tasks else TASK_IDLE_POLL_INTERVAL_MS
+            self._job = widget.after(interval, self._poll)
+
+
+_executor = None
+
+
+def task_executor():
+    """Get the application's shared task executor"""
+    global _executor
+    if _executor is None:
+        _executor = TaskExecutor()
+    return _executor
@@ -0,0 +1,226 @@
+"""
+Online database backups for VocabLoury application
+
+Copies the live database with SQLite's backup API while the app keeps
+running. Pages are copied a few at a time with a pause between steps, so
+the read lock a step holds never keeps the history writer waiting for
+long. A write from another connection makes SQLite restart the copy; after
+a few restarts the remaining copy is done in a single step instead, which
+is still quick for a database of this size.
+
+Each backup is written to a temporary file, checked with PRAGMA
+integrity_check, and only then renamed into place. The newest backups are
+kept, older ones are removed.
+"""
+
+import glob
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, NamedTuple
+
+from config.settings import (
+    BACKUP_KEEP, BACKUP_MAX_RESTARTS, BACKUP_STEP_PAGES, BACKUP_STEP_SLEEP_SECONDS,
+    DATABASE_TIMEOUT_SECONDS
+)
+from src.models.migrations import SCHEMA_VERSION, get_version
+
+
+class BackupFile(NamedTuple):
+    path: str
+    created: float
+    size: int
+
+
+class BackupCancelled(Exception):
+    """Raised inside the copy when the backup is cancelled"""
+
+
+class _Restarted(Exception):
+    """Raised inside the copy when writes keep restarting it"""
+
+
+def backup_name(db_file, when=None):
+    """File name for a backup of db_file taken at `when` (local time)"""
+    stem = os.path.splitext(os.path.basename(db_file))[0]
+    stamp = datetime.fromtimestamp(when or time.time()).strftime("%Y%m%d-%H%M%S")
+    return f"{stem}-{stamp}.db"
+
+
+def list_backups(db_file, backup_dir) -> List[BackupFile]:
+    """Backups of db_file in backup_dir, newest first"""
+    stem = os.path.splitext(os.path.basename(db_file))[0]
+    backups = []
+    for path in glob.glob(os.path.join(glob.escape(backup_dir), f"{glob.escape(stem)}-*.db")):
+        stat = os.stat(path)
+        backups.append(BackupFile(path, stat.st_mtime, stat.st_size))
+    backups.sort(key=lambda backup: (backup.created, backup.path), reverse=True)
+    return backups
+
+
+def rotate_backups(db_file, backup_dir, keep=BACKUP_KEEP):
+    """Delete all but the newest `keep` backups; returns the removed paths"""
+    removed = []
+    for backup in list_backups(db_file, backup_dir)[keep:]:
+        try:
+            os.remove(backup.path)
+            removed.append(backup.path)
+        except OSError as e:
+            print(f"Backup error: {e}")
+    return removed
+
+
+def backup_due(db_file, backup_dir, max_age_hours):
+    """Check whether the newest backup is older than max_age_hours (or missing)"""
+    backups = list_backups(db_file, backup_dir)
+    return not backups or time.time() - backups[0].created >= max_age_hours * 3600
+
+
+def check_integrity(path):
+    """Run PRAGMA integrity_check on a database file; returns the problems found"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        if problems == ["ok"]:
+            problems = []
+        version = get_version(conn)
+        if version > SCHEMA_VERSION:
+            problems.append(f"Schema v{version} is newer than this app (v{SCHEMA_VERSION})")
+        return problems
+    finally:
+        conn.close()
+
+
+class BackupService:
+    """Backs up one database file, optionally on a background thread"""
+
+    def __init__(self, db_file, backup_dir, keep=BACKUP_KEEP, step_pages=BACKUP_STEP_PAGES,
+                 step_sleep=BACKUP_STEP_SLEEP_SECONDS, max_restarts=BACKUP_MAX_RESTARTS):
+        self.db_file = db_file
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.step_pages = step_pages
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+
+        # Progress, read from other threads while the backup runs
+        self.pages_done = 0
+        self.total_pages = 0
+        self.restarts = 0
+        self.path = None
+        self.error = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._remaining = None
+
+    @property
+    def progress(self):
+        """Fraction of pages copied so far (0.0 to 1.0)"""
+        if self.finished.is_set():
+            return 1.0
+        if not self.total_pages:
+            return 0.0
+        return min(1.0, self.pages_done / self.total_pages)
+
+    @property
+    def running(self):
+        return self._thread is not None and not self.finished.is_set()
+
+    def start(self):
+        """Run the backup on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="BackupService", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop after the current step; the partial file is removed"""
+        self._cancel.set()
+
+    def run(self):
+        """Run the backup on the calling thread; returns the backup path or None"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        path = os.path.join(self.backup_dir, backup_name(self.db_file))
+        # Never overwrite a backup taken in the same second
+        base, suffix = os.path.splitext(path)
+        copy = 1
+        while os.path.exists(path):
+            path = f"{base}-{copy}{suffix}"
+            copy += 1
+        temp_path = path + ".part"
+        try:
+            self._copy(temp_path)
+            problems = check_integrity(temp_path)
+            if problems:
+                raise sqlite3.DatabaseError(f"Backup failed integrity check: {problems[0]}")
+            os.replace(temp_path, path)
+            self.path = path
+            rotate_backups(self.db_file, self.backup_dir, self.keep)
+            return path
+        except BackupCancelled:
+            return None
+        except (sqlite3.Error, OSError) as e:
+            self.error = e
+            print(f"Backup error: {e}")
+            return None
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.finished.set()
+
+    def _copy(self, temp_path):
+        source = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, timeout=DATABASE_TIMEOUT_SECONDS)
+        target = sqlite3.connect(temp_path)
+        try:
+            try:
+                source.backup(target, pages=self.step_pages, progress=self._step,
+                              sleep=self.step_sleep)
+            except _Restarted:
+                # Writes keep invalidating the copy; take the rest in one step
+                source.backup(target, pages=-1)
+                self.pages_done = self.total_pages
+        finally:
+            target.close()
+            source.close()
+
+    def _step(self, status, remaining, total):
+        """Progress callback between backup steps"""
+        if self._cancel.is_set():
+            raise BackupCancelled()
+        if self._remaining is not None and remaining > self._remaining:
+            # Another connection wrote to the database and SQLite started over
+            self.restarts += 1
+            if self.restarts > self.max_restarts:
+                raise _Restarted()
+        self._remaining = remaining
+        self.total_pages = total
+        self.pages_done = total - remaining
+
+
+def restore_backup(backup_path, db_file, backup_dir, keep=BACKUP_KEEP):
+    """Replace the database contents with a backup
+
+    The backup is checked first and the current database is backed up
+    before it is overwritten. Returns the path of that safety backup.
+    """
+    problems = check_integrity(backup_path)
+    if problems:
+        raise sqlite3.DatabaseError(f"Backup failed integrity check: {problems[0]}")
+
+    safety = None
+    if os.path.exists(db_file):
+        # Never rotate away the backup being restored
+        service = BackupService(db_file, backup_dir, keep=max(keep, len(list_backups(db_file, backup_dir)) + 1))
+        safety = service.run()
+        if safety is None:
+            raise sqlite3.DatabaseError(f"Could not back up the current database: {service.error}")
+
+    source = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+    target = sqlite3.connect(db_file, timeout=DATABASE_TIMEOUT_SECONDS)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return safety
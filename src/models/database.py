@@ -5,223 +5,514 @@ Database management for VocabLoury application
 import sqlite3
 import os
 import hashlib
+import json
 import secrets
-from datetime import datetime, timedelta
-from config.settings import DATABASE_NAME
+import threading
+import time
+from config.settings import (
+    DATABASE_NAME, DATABASE_TIMEOUT_SECONDS, STATEMENT_CACHE_SIZE,
+    SAVED_WORDS_PAGE_SIZE, STREAM_PAGE_SIZE, HISTORY_RETENTION_DAYS, COMPACTION_BATCH_SIZE,
+    SEARCH_RESULT_LIMIT, QUERY_STATS_FILE, QUERY_TRACE_ENABLED, BACKUP_DIR,
+    PASSWORD_HASH_SCHEME, PASSWORD_HASH_TARGET_MS,
+    REMEMBER_TOKEN_DAYS, TOKEN_CACHE_TTL_SECONDS, TOKEN_GC_BATCH_SIZE
+)
+from src.models.history_writer import HistoryWriter
+from src.models.migrations import migrate
+from src.models.password_hashing import (
+    DEFAULT_PARAMS, calibrate, hash_password, hash_token, needs_rehash, verify_password
+)
+from src.models.query_stats import query_stats
+from src.models.repositories import (
+    AccountRepository, DefinitionRepository, HistoryRepository, ImportJobRepository,
+    SearchRepository, SettingsRepository, StatsRepository, SyncRepository, TokenRepository, UserStats,
+    account_conflict_message, fts_query
+)
+from src.models.events import (
+    DEFINITIONS_CACHED, HISTORY_ADDED, HISTORY_CHANGED, HISTORY_REMOVED, PROFILE_CHANGED, event_bus
+)
+from src.models.schema import SECONDS_PER_DAY, history_source, normalize_word
 
 
 class DatabaseManager:
-    def __init__(self):
-        # Always use the directory where the script is located
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.db_file = os.path.join(base_dir, DATABASE_NAME)
+    # One write-behind history writer per database file, shared by all managers
+    _history_writers = {}
+    _history_writers_lock = threading.Lock()
+    # (db_file, username) -> account id; usernames never change
+    _user_ids = {}
+    # db_file -> (scheme, params) used for new password hashes
+    _password_policies = {}
+    # (db_file, token_hash) -> (username, expires_at, cached_until)
+    _token_cache = {}
+    # Database files already migrated by this process
+    _migrated = set()
+    # Per-thread connections: db_file -> sqlite3.Connection
+    _local = threading.local()
+
+    def __init__(self, db_file=None):
+        if db_file is None:
+            # Always use the directory where the script is located
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            db_file = os.path.join(base_dir, DATABASE_NAME)
+        self.db_file = db_file
         self.initialize_database()
+        
+        self.accounts = AccountRepository(self)
+        self.history = HistoryRepository(self)
+        self.stats = StatsRepository(self)
+        self.tokens = TokenRepository(self)
+        self.settings = SettingsRepository(self)
+        self.definitions = DefinitionRepository(self)
+        self.import_jobs = ImportJobRepository(self)
+        self.search_index = SearchRepository(self)
+        self.sync = SyncRepository(self)
+    
+    def connection(self):
+        """Get this thread's connection to the database
+        
+        Connections stay open so their statement caches keep the repository
+        queries prepared between calls.
+        """
+        connections = DatabaseManager._local.__dict__.setdefault('connections', {})
+        conn = connections.get(self.db_file)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=DATABASE_TIMEOUT_SECONDS,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            if QUERY_TRACE_ENABLED:
+                conn.set_trace_callback(query_stats.trace)
+            connections[self.db_file] = conn
+        return conn
+    
+    @classmethod
+    def close_connections(cls):
+        """Close every connection opened by the calling thread"""
+        connections = cls._local.__dict__.get('connections', {})
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+    
+    @property
+    def history_writer(self):
+        """Get the shared history writer for this database"""
+        with DatabaseManager._history_writers_lock:
+            writer = DatabaseManager._history_writers.get(self.db_file)
+            if writer is None:
+                writer = HistoryWriter(self.db_file)
+                DatabaseManager._history_writers[self.db_file] = writer
+            return writer
+    
+    def flush_history(self):
+        """Commit buffered history rows so reads see every write made so far"""
+        writer = DatabaseManager._history_writers.get(self.db_file)
+        if writer and writer.has_pending():
+            writer.flush()
+    
+    def close(self):
+        """Flush and stop the history writer for this database"""
+        with DatabaseManager._history_writers_lock:
+            writer = DatabaseManager._history_writers.pop(self.db_file, None)
+        if writer:
+            writer.close()
+        DatabaseManager.close_connections()
+    
+    @classmethod
+    def close_all(cls):
+        """Flush and stop every history writer (used on application exit)"""
+        with cls._history_writers_lock:
+            writers = list(cls._history_writers.values())
+            cls._history_writers.clear()
+        for writer in writers:
+            writer.close()
+        cls.close_connections()
+    
+    @staticmethod
+    def query_stats():
+        """Per-query counts, timings, calling views and slow queries recorded so far"""
+        return query_stats.snapshot()
+    
+    @staticmethod
+    def reset_query_stats():
+        query_stats.reset()
+    
+    @staticmethod
+    def dump_query_stats(path=None):
+        """Write the query statistics to a JSON file (QUERY_STATS_FILE by default)"""
+        if path is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            path = os.path.join(base_dir, QUERY_STATS_FILE)
+        if not query_stats.has_data():
+            return None
+        try:
+            query_stats.dump(path)
+            return path
+        except OSError as e:
+            print(f"Query stats error: {e}")
+            return None
+    
+    @property
+    def events(self):
+        """Get the change event bus shared by everything using this database"""
+        return event_bus(self.db_file)
+    
+    def backup_dir(self):
+        """Directory holding backups of this database (BACKUP_DIR beside it)"""
+        return os.path.join(os.path.dirname(os.path.abspath(self.db_file)), BACKUP_DIR)
     
     def initialize_database(self):
-        """Create the database and tables if they don't exist"""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Create accounts table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS accounts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    salt TEXT NOT NULL,
-                    profession TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create auth_tokens table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS auth_tokens (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    token TEXT NOT NULL,
-                    expires_at TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES accounts (id)
-                )
-            ''')
-
-            # Create word_history table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS word_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT NOT NULL,
-                    word TEXT NOT NULL,
-                    meaning TEXT,
-                    searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
+        """Create the database and bring its schema up to date"""
+        if self.db_file in DatabaseManager._migrated:
+            return
+        try:
+            old_version, new_version = migrate(self.db_file)
+            if old_version and old_version != new_version:
+                print(f"Database schema upgraded from v{old_version} to v{new_version}")
+            DatabaseManager._migrated.add(self.db_file)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
+    
+    def get_user_id(self, username):
+        """Get the account id for a username (cached per process)"""
+        user_id = DatabaseManager._user_ids.get((self.db_file, username))
+        if user_id is not None:
+            return user_id
+        try:
+            user_id = self.accounts.get_id(username)
+            if user_id is not None:
+                DatabaseManager._user_ids[(self.db_file, username)] = user_id
+            return user_id
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+    
+    def get_account(self, username):
+        """Get a user's account details"""
+        try:
+            return self.accounts.get(username)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+    
+    def rebuild_user_stats(self, username=None):
+        """Recompute the summary tables from word_history (all users or one)"""
+        user_id = None
+        if username:
+            user_id = self.get_user_id(username)
+            if user_id is None:
+                print(f"Unknown user: {username}")
+                return False
+        self.flush_history()
+        try:
+            self.stats.rebuild(user_id)
+            self.events.publish(HISTORY_CHANGED, username)
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+    
+    def get_user_stats(self, username):
+        """Get summary statistics for a user (activity times are Unix timestamps)"""
+        self.flush_history()
+        try:
+            return self.stats.get(username)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return UserStats()
+    
+    def count_active_days(self, username, days=30):
+        """Count days with at least one search within the last `days` days"""
+        self.flush_history()
+        try:
+            return self.stats.active_days(username, days, time.time())
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return 0
+    
+    def get_saved_words_page(self, username, limit=SAVED_WORDS_PAGE_SIZE, after=None):
+        """Get one page of a user's searched words, most recent first
+        
+        Pass the last row's ``cursor`` as `after` to get the next page.
+        """
+        if after is None:
+            self.flush_history()
+        try:
+            return self.history.saved_words_page(username, limit, after)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+    
+    def iter_saved_words(self, username, page_size=STREAM_PAGE_SIZE):
+        """Stream all of a user's searched words without loading them at once"""
+        self.flush_history()
+        return self.history.iter_saved_words(username, page_size)
+    
+    def iter_history(self, username, page_size=STREAM_PAGE_SIZE):
+        """Stream a user's full search history, most recent first"""
+        self.flush_history()
+        return self.history.iter_history(username, page_size)
+    
+    def remove_saved_word(self, username, word):
+        """Remove every history entry for a word"""
+        self.flush_history()
+        try:
+            self.history.remove_word(username, word)
+            self.events.publish(HISTORY_REMOVED, username, (normalize_word(word),))
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+    
+    def iter_history_rollups(self, username, page_size=STREAM_PAGE_SIZE):
+        """Stream a user's compacted (per word and day) history"""
+        return self.history.iter_rollups(username, page_size)
+    
+    def iter_user_definitions(self, username, page_size=STREAM_PAGE_SIZE):
+        """Stream the cached definitions of a user's searched words"""
+        self.flush_history()
+        return self.definitions.iter_user(username, page_size)
+    
+    def compact_history(self, retention_days=HISTORY_RETENTION_DAYS, batch_size=COMPACTION_BATCH_SIZE):
+        """Roll up searches older than the retention horizon; returns rows compacted
+        
+        Only whole days are compacted, so a day is never split between raw
+        history and rollups by the horizon itself.
+        """
+        self.flush_history()
+        before = (int(time.time()) // SECONDS_PER_DAY - retention_days) * SECONDS_PER_DAY
+        compacted = 0
+        try:
+            for user_id in self.history.compactable_users():
+                while True:
+                    # One short transaction per batch so searches are never held up
+                    count = self.history.compact_batch(user_id, before, batch_size)
+                    compacted += count
+                    if count < batch_size:
+                        break
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        return compacted
+    
+    def search(self, username, text, limit=SEARCH_RESULT_LIMIT):
+        """Full-text search a user's words, their definitions and the articles
+        
+        Returns {"word": [...], "definition": [...], "article": [...]} lists of
+        SearchResult, best match first. The last word is matched as a prefix.
+        """
+        results = {"word": [], "definition": [], "article": []}
+        query = fts_query(text)
+        if query is None:
+            return results
+        self.flush_history()
+        try:
+            results["word"] = self.search_index.words(username, query, limit)
+            results["definition"] = self.search_index.definitions(username, query, limit)
+            results["article"] = self.search_index.articles(query, limit)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        return results
+    
+    def sync_articles(self, articles):
+        """Index article dicts (title, category, summary, full_content) if they changed"""
+        rows = [(a['title'], a['category'], a['summary'], a['full_content']) for a in articles]
+        checksum = hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()
+        if self.get_setting('articles_checksum') == checksum:
+            return False
+        try:
+            self.search_index.replace_articles(rows)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+        return self.set_setting('articles_checksum', checksum)
+    
+    def get_cached_definitions(self, words):
+        """Get cached definitions for normalized words
+        
+        Returns {word: definition}; the definition is None when the dictionary
+        has no entry, and words that were never fetched are left out.
+        """
+        try:
+            return {word: json.loads(definition) if definition is not None else None
+                    for word, definition in self.definitions.get_many(words).items()}
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return {}
+    
+    def cache_definitions(self, definitions):
+        """Cache {normalized word: definition or None} fetched from the API"""
+        try:
+            self.definitions.put_many(definitions, int(time.time()))
+            self.events.publish(DEFINITIONS_CACHED, data=definitions)
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+    
+    def get_setting(self, key, default=None):
+        """Get a per-installation setting stored in the database"""
+        try:
+            value = self.settings.get(key)
+            return json.loads(value) if value is not None else default
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return default
+    
+    def set_setting(self, key, value):
+        """Store a per-installation setting in the database"""
+        try:
+            self.settings.set(key, json.dumps(value))
+            return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+    
+    def sync_device_id(self):
+        """Get the id this installation sends with its sync changes (created on first use)"""
+        device_id = self.get_setting('sync_device_id')
+        if device_id is None:
+            device_id = secrets.token_hex(8)
+            self.set_setting('sync_device_id', device_id)
+        return device_id
+    
+    def get_user_preferences(self, username):
+        """Get a user's preferences (a dict, empty by default)"""
+        return self.get_setting(f"preferences:{username}", {})
+    
+    def set_user_preferences(self, username, preferences):
+        """Replace a user's preferences"""
+        if self.set_setting(f"preferences:{username}", preferences):
+            self.events.publish(PROFILE_CHANGED, username)
+            return True
+        return False
+    
+    def password_policy(self):
+        """Get the (scheme, params) new password hashes should use"""
+        policy = DatabaseManager._password_policies.get(self.db_file)
+        if policy is None:
+            stored = self.get_setting('password_hash')
+            if stored:
+                policy = (stored['scheme'], stored['params'])
+            else:
+                policy = (PASSWORD_HASH_SCHEME, DEFAULT_PARAMS[PASSWORD_HASH_SCHEME])
+            DatabaseManager._password_policies[self.db_file] = policy
+        return policy
+    
+    def calibrate_password_hashing(self, target_ms=PASSWORD_HASH_TARGET_MS, scheme=PASSWORD_HASH_SCHEME):
+        """Measure this machine and store hash parameters that fit the latency budget"""
+        params = calibrate(scheme, target_ms)
+        if self.set_setting('password_hash', {'scheme': scheme, 'params': params}):
+            DatabaseManager._password_policies[self.db_file] = (scheme, params)
+        return scheme, params
     
     def hash_password(self, password, salt=None):
-        """Hash password with salt"""
-        if salt is None:
-            salt = secrets.token_hex(16)
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000
-        ).hex()
-        return password_hash, salt
-    
-    def word_history(self, username, word, meaning):
-        """Add a word to the history"""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO word_history (username, word, meaning)
-                VALUES (?, ?, ?)
-            ''', (username, word, meaning))
-            conn.commit()
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-        finally:
-            conn.close()
+        """Hash password with salt using the current hashing policy"""
+        scheme, params = self.password_policy()
+        return hash_password(password, scheme, params, salt)
+    
+    def word_history(self, username, word, meaning, definition=None):
+        """Add a word to the history (buffered, written in the background)
+        
+        Passing the API entry the view already fetched caches it with the
+        history row, so saved words can show it later without a request.
+        """
+        word = normalize_word(word)
+        self.history_writer.add(username, word, history_source(meaning), definition)
+        self.events.publish(HISTORY_ADDED, username, (word,))
 
     def create_user(self, username, email, password, profession):
         """Create a new user"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
             # Hash password with salt
             password_hash, salt = self.hash_password(password)
-            
-            cursor.execute('''
-                INSERT INTO accounts (username, email, password, salt, profession)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (username, email, password_hash, salt, profession))
-            
-            conn.commit()
+            self.accounts.create(username, email, password_hash, salt, profession)
             return True, "User created successfully!"
         except sqlite3.IntegrityError as e:
-            if "username" in str(e):
-                return False, "Username already exists!"
-            elif "email" in str(e):
-                return False, "Email already exists!"
-            return False, "An error occurred!"
+            return False, account_conflict_message(e)
         except sqlite3.Error as e:
             return False, f"Database error: {str(e)}"
-        finally:
-            conn.close()
     
     def verify_user(self, username, password):
         """Verify user credentials"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT id, password, salt FROM accounts WHERE username = ?', 
-                          (username,))
-            result = cursor.fetchone()
-            
-            if result:
-                user_id, stored_hash, salt = result
-                # Hash the provided password with stored salt
-                password_hash, _ = self.hash_password(password, salt)
-                
-                # Compare hashes
-                if password_hash == stored_hash:
-                    return True, user_id
+            credentials = self.accounts.get_credentials(username)
+            if credentials and verify_password(password, credentials.password, credentials.salt):
+                # Upgrade hashes made with an older scheme or cost
+                if needs_rehash(credentials.password, *self.password_policy()):
+                    new_hash, new_salt = self.hash_password(password)
+                    self.accounts.update_password(credentials.user_id, new_hash, new_salt)
+                return True, credentials.user_id
             return False, None
         except sqlite3.Error as e:
             return False, None
-        finally:
-            conn.close()
     
     def create_remember_token(self, user_id):
         """Create a remember me token for the user"""
+        # Generate a secure token; only its hash is stored
+        token = secrets.token_hex(32)
+        expires_at = int(time.time()) + REMEMBER_TOKEN_DAYS * SECONDS_PER_DAY
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Generate a secure token
-            token = secrets.token_hex(32)
-            # Token expires in 30 days
-            expires_at = datetime.now() + timedelta(days=30)
-            
-            # Delete any existing tokens for this user
-            cursor.execute('DELETE FROM auth_tokens WHERE user_id = ?', (user_id,))
-            
-            # Insert new token
-            cursor.execute('''
-                INSERT INTO auth_tokens (user_id, token, expires_at)
-                VALUES (?, ?, ?)
-            ''', (user_id, token, expires_at))
-            
-            conn.commit()
+            self.tokens.create(user_id, hash_token(token), expires_at)
             return token
-            
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
-        finally:
-            conn.close()
     
     def verify_remember_token(self, token):
         """Verify a remember me token"""
-        try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            
-            # Get token info
-            cursor.execute('''
-                SELECT a.id, a.username, t.expires_at 
-                FROM auth_tokens t
-                JOIN accounts a ON t.user_id = a.id
-                WHERE t.token = ? AND t.expires_at > ?
-            ''', (token, datetime.now()))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                user_id, username, expires_at = result
+        token_hash = hash_token(token)
+        now = time.time()
+        
+        # Recently verified tokens skip the database entirely
+        cached = DatabaseManager._token_cache.get((self.db_file, token_hash))
+        if cached:
+            username, expires_at, cached_until = cached
+            if now < cached_until and now < expires_at:
                 return True, username
+            DatabaseManager._token_cache.pop((self.db_file, token_hash), None)
+        
+        try:
+            # Single probe of the unique token_hash index
+            owner = self.tokens.find_owner(token_hash, now)
+            if owner:
+                DatabaseManager._token_cache[(self.db_file, token_hash)] = (
+                    owner.username, owner.expires_at, now + TOKEN_CACHE_TTL_SECONDS
+                )
+                return True, owner.username
             return False, None
-            
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False, None
-        finally:
-            conn.close()
     
     def delete_remember_token(self, token):
         """Delete a remember me token"""
+        token_hash = hash_token(token)
+        DatabaseManager._token_cache.pop((self.db_file, token_hash), None)
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM auth_tokens WHERE token = ?', (token,))
-            conn.commit()
+            self.tokens.delete(token_hash)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
+    
+    def purge_expired_tokens(self, batch_size=TOKEN_GC_BATCH_SIZE):
+        """Delete expired remember me tokens in small batches; returns the count"""
+        now = int(time.time())
+        deleted = 0
+        try:
+            while True:
+                # Short transactions so logins are never blocked for long
+                count = self.tokens.purge_expired(now, batch_size)
+                deleted += count
+                if count < batch_size:
+                    break
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        
+        # Drop stale cache entries too
+        for key, (_, expires_at, _) in list(DatabaseManager._token_cache.items()):
+            if expires_at <= now:
+                DatabaseManager._token_cache.pop(key, None)
+        return deleted
     
     def get_profession(self, username):
         """Get user's profession"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT profession FROM accounts WHERE username = ?', (username,))
-            result = cursor.fetchone()
-            if result:
-                return result[0]
-            return None
+            return self.accounts.get_profession(username)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
-        finally:
-            conn.close()
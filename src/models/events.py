@@ -0,0 +1,154 @@
+"""
+Change events for VocabLoury application
+
+``DatabaseManager`` publishes an event whenever user data changes. Models
+such as ``UserSession`` subscribe directly and are called on the publishing
+thread, which may be the history writer or an import. Pages subscribe with
+``ui=True`` instead: their events are queued and delivered on the Tk thread
+by a short ``after`` loop, and a burst of events of the same kind for the
+same user arrives as a single event carrying every affected word, so a page
+updates once rather than once per change.
+"""
+
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+from config.settings import EVENT_POLL_INTERVAL_MS
+
+# Event names
+HISTORY_ADDED = "history_added"  # words searched; data holds the words
+HISTORY_REMOVED = "history_removed"  # words removed; data holds the words
+HISTORY_CHANGED = "history_changed"  # many rows changed at once (import, stats rebuild)
+PROFILE_CHANGED = "profile_changed"  # account details or preferences changed
+DEFINITIONS_CACHED = "definitions_cached"  # definitions stored; data holds the words
+
+HISTORY_EVENTS = (HISTORY_ADDED, HISTORY_REMOVED, HISTORY_CHANGED)
+
+
+class Event(NamedTuple):
+    name: str
+    username: Optional[str]  # None when every user is affected
+    data: Tuple[str, ...] = ()
+
+
+def coalesce(events):
+    """Merge events with the same name and user, keeping the first-seen order"""
+    merged = {}
+    for event in events:
+        key = (event.name, event.username)
+        previous = merged.get(key)
+        if previous is None:
+            merged[key] = event
+        else:
+            data = previous.data + tuple(item for item in event.data if item not in previous.data)
+            merged[key] = previous._replace(data=data)
+    return list(merged.values())
+
+
+class EventBus:
+    """Thread-safe publish/subscribe for change events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # event name -> [(callback, ui)]
+        self._pending = []  # events waiting for the Tk thread
+        self._widget = None
+        self._poll_interval_ms = EVENT_POLL_INTERVAL_MS
+        self._job = None
+
+    def subscribe(self, names, callback, ui=False):
+        """Call callback(event) for each of the named events
+
+        With ui=True the callback runs on the Tk thread once the bus is
+        attached, and bursts are coalesced.
+        """
+        if isinstance(names, str):
+            names = (names,)
+        with self._lock:
+            for name in names:
+                self._subscribers.setdefault(name, []).append((callback, ui))
+
+    def unsubscribe(self, callback):
+        """Remove callback from every event it was subscribed to"""
+        with self._lock:
+            for name, subscribers in self._subscribers.items():
+                self._subscribers[name] = [entry for entry in subscribers if entry[0] != callback]
+
+    def publish(self, name, username=None, data=()):
+        """Report a change; safe to call from any thread"""
+        event = Event(name, username, tuple(data))
+        with self._lock:
+            subscribers = list(self._subscribers.get(name, ()))
+            if any(ui for _, ui in subscribers):
+                self._pending.append(event)
+        for callback, ui in subscribers:
+            if not ui:
+                self._call(callback, event)
+
+    def attach(self, widget, poll_interval_ms=EVENT_POLL_INTERVAL_MS):
+        """Deliver ui events on widget's Tk thread until detach()"""
+        self.detach()
+        self._widget = widget
+        self._poll_interval_ms = poll_interval_ms
+        self._job = widget.after(poll_interval_ms, self._poll)
+
+    def detach(self):
+        """Stop delivering ui events; pending ones are dropped"""
+        if self._widget is not None and self._job is not None:
+            try:
+                self._widget.after_cancel(self._job)
+            except Exception:
+                pass
+        self._widget = None
+        self._job = None
+        with self._lock:
+            self._pending = []
+
+    def dispatch(self):
+        """Deliver queued ui events on the calling thread; returns how many were delivered"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return 0
+            subscribers = {name: [callback for callback, ui in entries if ui]
+                           for name, entries in self._subscribers.items()}
+        events = coalesce(pending)
+        for event in events:
+            for callback in subscribers.get(event.name, ()):
+                self._call(callback, event)
+        return len(events)
+
+    def _poll(self):
+        widget = self._widget
+        if widget is None:
+            return
+        try:
+            if not widget.winfo_exists():
+                self._widget = self._job = None
+                return
+        except Exception:
+            self._widget = self._job = None
+            return
+        self.dispatch()
+        if self._widget is widget:
+            self._job = widget.after(self._poll_interval_ms, self._poll)
+
+    @staticmethod
+    def _call(callback, event):
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"Event handler error ({event.name}): {e}")
+
+
+_buses = {}  # database file -> EventBus
+_buses_lock = threading.Lock()
+
+
+def event_bus(db_file):
+    """Get the shared event bus for a database file"""
+    with _buses_lock:
+        bus = _buses.get(db_file)
+        if bus is None:
+            bus = _buses[db_file] = EventBus()
+        return bus
@@ -0,0 +1,212 @@
+"""
+User data export for VocabLoury application
+
+Exports a user's account, statistics, full word history (recent searches
+plus the per-day rollups of older ones) and the cached definitions of their
+words as CSV or JSON Lines, optionally gzip compressed. History and
+definitions are streamed page by page through the repositories and written
+through a fixed-size buffer, so memory use does not grow with the size of
+the history.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from config.settings import EXPORT_BUFFER_SIZE, EXPORT_PAGE_SIZE
+from src.models.schema import (
+    HISTORY_SOURCE_ALPHABET, HISTORY_SOURCE_IMPORT, HISTORY_SOURCE_LEARNING, HISTORY_SOURCE_OTHER,
+    HISTORY_SOURCE_SEARCH, SECONDS_PER_DAY
+)
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+SOURCE_NAMES = {
+    HISTORY_SOURCE_SEARCH: "search",
+    HISTORY_SOURCE_ALPHABET: "alphabet",
+    HISTORY_SOURCE_LEARNING: "learning",
+    HISTORY_SOURCE_OTHER: "other",
+    HISTORY_SOURCE_IMPORT: "import",
+}
+
+ACCOUNT_FIELDS = ("username", "email", "profession", "created_at")
+STATS_FIELDS = ("total_searches", "unique_words", "active_days", "first_activity", "last_activity")
+HISTORY_FIELDS = ("word", "source", "searched_at")
+ROLLUP_FIELDS = ("word", "day", "search_count", "first_searched", "last_searched")
+DEFINITION_FIELDS = ("word", "definition", "fetched_at")
+
+
+class ExportCancelled(Exception):
+    """Raised inside the export when the user cancels it"""
+
+
+def format_from_path(path):
+    """Guess (format, compress) from a file name such as history.jsonl.gz"""
+    name = path.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+    return (FORMAT_JSONL if name.endswith((".jsonl", ".json")) else FORMAT_CSV), compress
+
+
+def _iso_day(day):
+    """Format a day number (days since the Unix epoch) as an ISO date"""
+    return datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc).date().isoformat()
+
+
+def _iso(timestamp):
+    """Format a Unix timestamp as ISO 8601 (UTC)"""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class UserExporter:
+    """Writes one user's data to a file, optionally on a background thread"""
+
+    def __init__(self, db, username, path, export_format=None, compress=None):
+        self.db = db
+        self.username = username
+        self.path = path
+        guessed_format, guessed_compress = format_from_path(path)
+        self.export_format = export_format or guessed_format
+        self.compress = guessed_compress if compress is None else compress
+
+        # Progress, read from the UI thread while the export runs
+        self.rows_written = 0
+        self.total_rows = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of history and definition rows written so far (0.0 to 1.0)"""
+        if self.finished.is_set():
+            return 1.0
+        if not self.total_rows:
+            return 0.0
+        return min(1.0, self.rows_written / self.total_rows)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        """Run the export on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="UserExporter", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Ask a running export to stop; the partial file is removed"""
+        self._cancel.set()
+
+    def run(self):
+        """Run the export on the calling thread; returns True on success"""
+        temp_path = self.path + ".part"
+        try:
+            with ExitStack() as stack:
+                raw = stack.enter_context(open(temp_path, "wb", buffering=EXPORT_BUFFER_SIZE))
+                if self.compress:
+                    raw = stack.enter_context(gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6))
+                out = stack.enter_context(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+                if self.export_format == FORMAT_JSONL:
+                    self._write_jsonl(out)
+                else:
+                    self._write_csv(out)
+            # Only a complete export replaces the destination file
+            os.replace(temp_path, self.path)
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            self.error = e
+            print(f"Export error: {e}")
+            return False
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.finished.set()
+            self.db.close_connections()
+
+    def _account_row(self):
+        account = self.db.get_account(self.username)
+        if account is None:
+            raise ValueError(f"Unknown user: {self.username}")
+        return [account.username, account.email, account.profession, account.created_at]
+
+    def _stats_row(self):
+        stats = self.db.get_user_stats(self.username)
+        # Every saved word has at most one cached definition
+        self.total_rows = stats.total_searches + stats.unique_words
+        return [stats.total_searches, stats.unique_words, stats.active_days,
+                _iso(stats.first_activity), _iso(stats.last_activity)]
+
+    def _history_rows(self):
+        """Yield history rows, stopping as soon as the export is cancelled"""
+        for entry in self.db.iter_history(self.username, EXPORT_PAGE_SIZE):
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            yield [entry.word, SOURCE_NAMES.get(entry.source, "other"), _iso(entry.searched_at)]
+            self.rows_written += 1
+
+    def _rollup_rows(self):
+        """Yield compacted history rows; progress counts the searches they stand for"""
+        for rollup in self.db.iter_history_rollups(self.username, EXPORT_PAGE_SIZE):
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            yield [rollup.word, _iso_day(rollup.day), rollup.search_count,
+                   _iso(rollup.first_searched), _iso(rollup.last_searched)]
+            self.rows_written += rollup.search_count
+
+    def _definition_rows(self):
+        """Yield cached definitions (API entry as JSON text, None if not found)"""
+        for cached in self.db.iter_user_definitions(self.username, EXPORT_PAGE_SIZE):
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            yield [cached.word, cached.definition, _iso(cached.fetched_at)]
+            self.rows_written += 1
+
+    def _write_csv(self, out):
+        """One section per record type, each with its own header row"""
+        writer = csv.writer(out)
+        writer.writerow(ACCOUNT_FIELDS)
+        writer.writerow(self._account_row())
+        writer.writerow([])
+        writer.writerow(STATS_FIELDS)
+        writer.writerow(self._stats_row())
+        writer.writerow([])
+        writer.writerow(HISTORY_FIELDS)
+        writer.writerows(self._history_rows())
+        writer.writerow([])
+        writer.writerow(ROLLUP_FIELDS)
+        writer.writerows(self._rollup_rows())
+        writer.writerow([])
+        writer.writerow(DEFINITION_FIELDS)
+        writer.writerows(self._definition_rows())
+
+    def _write_jsonl(self, out):
+        """One JSON object per line, tagged with its record type"""
+        def write(record_type, fields, row):
+            record = {"type": record_type}
+            record.update(zip(fields, row))
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write("\n")
+
+        write("account", ACCOUNT_FIELDS, self._account_row())
+        write("stats", STATS_FIELDS, self._stats_row())
+        for row in self._history_rows():
+            write("history", HISTORY_FIELDS, row)
+        for row in self._rollup_rows():
+            write("history_rollup", ROLLUP_FIELDS, row)
+        for word, definition, fetched_at in self._definition_rows():
+            # Nested as JSON rather than as an escaped string
+            entry = json.loads(definition) if definition is not None else None
+            write("definition", DEFINITION_FIELDS, [word, entry, fetched_at])
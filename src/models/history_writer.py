@@ -0,0 +1,145 @@
+"""
+Write-behind history writer for VocabLoury application
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+
+from config.settings import (
+    DATABASE_TIMEOUT_SECONDS, HISTORY_FLUSH_INTERVAL_MS, HISTORY_FLUSH_MAX_ROWS, HISTORY_RETRY_MAX_MS,
+    QUERY_STATS_ENABLED, QUERY_TRACE_ENABLED
+)
+from src.models.query_stats import query_stats
+from src.models.repositories import QUERIES, definition_row, insert_history
+
+
+class HistoryWriter:
+    """Buffers word history inserts and writes them in batches off the UI thread"""
+
+    def __init__(self, db_file, flush_interval_ms=HISTORY_FLUSH_INTERVAL_MS,
+                 max_rows=HISTORY_FLUSH_MAX_ROWS, retry_max_ms=HISTORY_RETRY_MAX_MS):
+        self.db_file = db_file
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_rows = max_rows
+        self.retry_max = retry_max_ms / 1000.0
+
+        self._pending = []
+        self._condition = threading.Condition()
+        self._flushed_generation = 0
+        self._queued_generation = 0
+        self._closed = False
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="HistoryWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, username, word, source, definition=None):
+        """Queue a history row, and optionally the word's API entry; returns immediately"""
+        row = (username, word, source, int(time.time()), definition)
+        with self._condition:
+            if self._stopped:
+                # Writer already shut down, fall back to a direct write
+                if not self._write_batch([row]):
+                    print(f"History writer: dropped search of '{word}'")
+                return
+            self._pending.append(row)
+            self._queued_generation += 1
+            if len(self._pending) >= self.max_rows:
+                self._condition.notify_all()
+
+    def flush(self, timeout=5.0):
+        """Block until every row queued so far has been committed"""
+        with self._condition:
+            target = self._queued_generation
+            if self._flushed_generation >= target:
+                return True
+            self._condition.notify_all()
+            deadline = time.monotonic() + timeout
+            while self._flushed_generation < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._thread.is_alive():
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def has_pending(self):
+        """Check whether any rows are waiting to be written"""
+        with self._condition:
+            return self._flushed_generation < self._queued_generation
+
+    def close(self):
+        """Flush remaining rows and stop the writer thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=5)
+        with self._condition:
+            if self._pending:
+                # Still retrying (e.g. the database is locked); the writer keeps going
+                print(f"History writer: {len(self._pending)} rows not yet written")
+
+    def _run(self):
+        """Writer loop: drain the buffer every interval or when it fills up
+
+        A batch that fails to commit goes back to the front of the buffer and
+        is retried with a growing delay; flush() only returns once it is in.
+        """
+        retry_delay = 0
+        while True:
+            with self._condition:
+                if retry_delay:
+                    # Back off without being hurried along by flush() calls
+                    deadline = time.monotonic() + retry_delay
+                    remaining = retry_delay
+                    while remaining > 0:
+                        self._condition.wait(remaining)
+                        remaining = deadline - time.monotonic()
+                elif not self._closed and len(self._pending) < self.max_rows:
+                    self._condition.wait(self.flush_interval)
+                batch = self._pending
+                self._pending = []
+                generation = self._queued_generation
+                closed = self._closed
+
+            committed = not batch or self._write_batch(batch)
+
+            with self._condition:
+                if committed:
+                    self._flushed_generation = generation
+                    retry_delay = 0
+                else:
+                    self._pending[:0] = batch
+                    retry_delay = min(self.retry_max, max(self.flush_interval, retry_delay * 2))
+                self._condition.notify_all()
+                if closed and not self._pending:
+                    self._stopped = True
+                    break
+
+    def _write_batch(self, batch):
+        """Insert a batch of rows in a single transaction; returns True once committed"""
+        conn = None
+        try:
+            started = time.perf_counter()
+            conn = sqlite3.connect(self.db_file, timeout=DATABASE_TIMEOUT_SECONDS)
+            if QUERY_TRACE_ENABLED:
+                conn.set_trace_callback(query_stats.trace)
+            with conn:
+                insert_history(conn, [row[:4] for row in batch])
+                conn.executemany(QUERIES["definition_upsert"],
+                                 [definition_row(word, definition, searched_at)
+                                  for _, word, _, searched_at, definition in batch
+                                  if definition is not None])
+            if QUERY_STATS_ENABLED:
+                query_stats.record("history_writer.flush", time.perf_counter() - started, len(batch))
+            return True
+        except sqlite3.Error as e:
+            print(f"History writer error: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
@@ -0,0 +1,168 @@
+"""
+Word list import for VocabLoury application
+
+Loads a CSV or plain text word list into a user's word history. Words are
+normalized and deduplicated, their definitions are resolved through the
+definition cache (fetching only the missing ones, several at a time), and
+history rows are written in chunked transactions. Each chunk records the
+job's progress in the same transaction, so an interrupted import resumes
+where it stopped.
+"""
+
+import csv
+import hashlib
+import threading
+import time
+
+from config.settings import IMPORT_CHUNK_SIZE
+from src.models.events import HISTORY_CHANGED
+from src.models.schema import HISTORY_SOURCE_IMPORT, normalize_word
+
+MAX_WORD_LENGTH = 64
+
+STATUS_RUNNING = "running"
+STATUS_PAUSED = "paused"
+STATUS_DONE = "done"
+
+
+def is_valid_word(word):
+    """Check that a normalized entry looks like a word or short phrase"""
+    return 0 < len(word) <= MAX_WORD_LENGTH and word.replace("'", "").replace("-", "").replace(" ", "").isalpha()
+
+
+def read_word_list(path):
+    """Read a word list; returns (unique normalized words in file order, skipped count)
+
+    Plain text files have one word per line. CSV files use the first
+    non-empty cell of each row, and a "word" header row is ignored.
+    """
+    words = {}
+    skipped = 0
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith(".csv"):
+            entries = (next((cell for cell in row if cell.strip()), "") for row in csv.reader(f))
+        else:
+            entries = f
+        for line_number, entry in enumerate(entries):
+            word = normalize_word(entry)
+            if line_number == 0 and word == "word":
+                continue
+            if not word:
+                continue
+            if is_valid_word(word):
+                words[word] = None
+            else:
+                skipped += 1
+    return list(words), skipped
+
+
+def word_list_checksum(words):
+    """Identify a word list by its normalized contents"""
+    return hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()
+
+
+class WordListImporter:
+    """Imports a word list into one user's history, optionally on a background thread"""
+
+    def __init__(self, db, username, path, fetch_definitions=True, api=None,
+                 chunk_size=IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.username = username
+        self.path = path
+        self.fetch_definitions = fetch_definitions
+        self.api = api
+        self.chunk_size = chunk_size
+
+        # Progress, read from other threads while the import runs
+        self.imported = 0
+        self.total = 0
+        self.skipped = 0
+        self.resumed_from = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def progress(self):
+        """Fraction of words imported so far (0.0 to 1.0)"""
+        if not self.total:
+            return 1.0 if self.finished.is_set() else 0.0
+        return min(1.0, self.imported / self.total)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def start(self):
+        """Run the import on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="WordListImporter", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop after the current chunk; the import can be resumed later"""
+        self._cancel.set()
+
+    def run(self):
+        """Run the import on the calling thread; returns True when it completes"""
+        try:
+            return self._import()
+        except Exception as e:
+            self.error = e
+            print(f"Import error: {e}")
+            return False
+        finally:
+            self.finished.set()
+            self.db.close_connections()
+
+    def _import(self):
+        words, self.skipped = read_word_list(self.path)
+        self.total = len(words)
+        if self.db.get_user_id(self.username) is None:
+            raise ValueError(f"Unknown user: {self.username}")
+
+        checksum = word_list_checksum(words)
+        job = self.db.import_jobs.find_unfinished(self.username, checksum)
+        if job:
+            job_id, self.imported = job.id, job.imported
+            self.resumed_from = job.imported
+        else:
+            job_id = self.db.import_jobs.create(self.username, self.path, checksum,
+                                                self.total, int(time.time()))
+
+        while self.imported < self.total:
+            if self._cancel.is_set():
+                self.db.import_jobs.set_status(job_id, self.imported, STATUS_PAUSED, int(time.time()))
+                return False
+
+            chunk = words[self.imported:self.imported + self.chunk_size]
+            if self.fetch_definitions:
+                self._resolve_definitions(chunk)
+
+            now = int(time.time())
+            imported = self.imported + len(chunk)
+            status = STATUS_DONE if imported == self.total else STATUS_RUNNING
+            self.db.import_jobs.commit_chunk(
+                job_id,
+                [(self.username, word, HISTORY_SOURCE_IMPORT, now) for word in chunk],
+                imported, status, now
+            )
+            self.imported = imported
+            self.db.events.publish(HISTORY_CHANGED, self.username)
+
+        if not self.total:
+            self.db.import_jobs.set_status(job_id, 0, STATUS_DONE, int(time.time()))
+        return True
+
+    def _resolve_definitions(self, words):
+        """Fetch and cache definitions for words that are not cached yet"""
+        cached = self.db.get_cached_definitions(words)
+        missing = [word for word in words if word not in cached]
+        if not missing:
+            return
+        if self.api is None:
+            from src.api.dictionary_api import DictionaryAPI
+            self.api = DictionaryAPI()
+        fetched = self.api.get_word_definitions(missing)
+        if fetched:
+            self.db.cache_definitions(fetched)
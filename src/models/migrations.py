@@ -0,0 +1,740 @@
+"""
+Schema versioning and migrations for VocabLoury application
+
+The schema version is stored in SQLite's ``PRAGMA user_version``. Each
+migration upgrades the database by exactly one version and is applied in
+order by ``migrate``.
+
+Every migration carries the DDL of its own version rather than calling the
+current schema helpers, so replaying v1, v2, ... always builds the same
+database no matter how the schema changed later. A later change to a
+table, index or trigger is a new migration, never an edit to an old one.
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+
+from config.settings import MIGRATION_BATCH_SIZE
+from src.models import schema
+from src.models.password_hashing import hash_token
+
+SECONDS_PER_DAY = schema.SECONDS_PER_DAY
+
+
+@contextmanager
+def transaction(conn):
+    """Run a block inside an immediate (write-locking) transaction"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn.cursor()
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def get_version(conn):
+    """Get the schema version of a database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def set_version(cursor, version):
+    """Record the schema version (must run inside the migration transaction)"""
+    cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def migrate_to_v1(conn):
+    """Baseline schema: accounts, auth tokens and text-keyed word history"""
+    with transaction(conn) as cursor:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS accounts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                salt TEXT NOT NULL,
+                profession TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS auth_tokens (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                token TEXT NOT NULL,
+                expires_at TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES accounts (id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS word_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                word TEXT NOT NULL,
+                meaning TEXT,
+                searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        set_version(cursor, 1)
+
+
+_COPY_LEGACY_HISTORY = '''
+    INSERT INTO word_history_v2 (id, user_id, word_id, source, searched_at)
+    SELECT h.id, a.id, w.id, history_source(h.meaning),
+           COALESCE(CAST(strftime('%s', h.searched_at) AS INTEGER),
+                    CAST(strftime('%s', 'now') AS INTEGER))
+    FROM (SELECT * FROM word_history WHERE id > ? ORDER BY id LIMIT ?) h
+    JOIN accounts a ON a.username = h.username
+    JOIN words w ON w.word = normalize_word(h.word)
+'''
+
+
+def _copy_history_batch(cursor, after_id, limit):
+    """Copy one batch of legacy history rows; returns the last id read"""
+    cursor.execute('''
+        INSERT OR IGNORE INTO words (word)
+        SELECT normalize_word(word)
+        FROM (SELECT word FROM word_history WHERE id > ? ORDER BY id LIMIT ?)
+    ''', (after_id, limit))
+    cursor.execute(_COPY_LEGACY_HISTORY, (after_id, limit))
+    cursor.execute('''
+        SELECT MAX(id) FROM (SELECT id FROM word_history WHERE id > ? ORDER BY id LIMIT ?)
+    ''', (after_id, limit))
+    return cursor.fetchone()[0]
+
+
+def _create_v2_stats(cursor):
+    """Create the v2 summary tables and triggers and fill them from word_history"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INTEGER PRIMARY KEY,
+            total_searches INTEGER NOT NULL DEFAULT 0,
+            unique_words INTEGER NOT NULL DEFAULT 0,
+            active_days INTEGER NOT NULL DEFAULT 0,
+            first_activity INTEGER,
+            last_activity INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_word_stats (
+            user_id INTEGER NOT NULL,
+            word_id INTEGER NOT NULL,
+            search_count INTEGER NOT NULL DEFAULT 0,
+            first_searched INTEGER,
+            last_searched INTEGER,
+            PRIMARY KEY (user_id, word_id)
+        ) WITHOUT ROWID
+    ''')
+    # day is the number of whole days since the Unix epoch (UTC)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_daily_activity (
+            user_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            search_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS word_history_stats_insert
+        AFTER INSERT ON word_history
+        BEGIN
+            INSERT INTO user_word_stats (user_id, word_id, search_count, first_searched, last_searched)
+            VALUES (NEW.user_id, NEW.word_id, 1, NEW.searched_at, NEW.searched_at)
+            ON CONFLICT (user_id, word_id) DO UPDATE SET
+                search_count = search_count + 1,
+                first_searched = MIN(first_searched, excluded.first_searched),
+                last_searched = MAX(last_searched, excluded.last_searched);
+
+            INSERT INTO user_daily_activity (user_id, day, search_count)
+            VALUES (NEW.user_id, NEW.searched_at / {SECONDS_PER_DAY}, 1)
+            ON CONFLICT (user_id, day) DO UPDATE SET search_count = search_count + 1;
+
+            INSERT OR IGNORE INTO user_stats (user_id) VALUES (NEW.user_id);
+            UPDATE user_stats SET
+                total_searches = total_searches + 1,
+                unique_words = unique_words + ((
+                    SELECT search_count FROM user_word_stats
+                    WHERE user_id = NEW.user_id AND word_id = NEW.word_id) = 1),
+                active_days = active_days + ((
+                    SELECT search_count FROM user_daily_activity
+                    WHERE user_id = NEW.user_id AND day = NEW.searched_at / {SECONDS_PER_DAY}) = 1),
+                first_activity = COALESCE(MIN(first_activity, NEW.searched_at), NEW.searched_at),
+                last_activity = COALESCE(MAX(last_activity, NEW.searched_at), NEW.searched_at)
+            WHERE user_id = NEW.user_id;
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS word_history_stats_delete
+        AFTER DELETE ON word_history
+        BEGIN
+            UPDATE user_word_stats SET search_count = search_count - 1
+            WHERE user_id = OLD.user_id AND word_id = OLD.word_id;
+            UPDATE user_daily_activity SET search_count = search_count - 1
+            WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY};
+
+            UPDATE user_stats SET
+                total_searches = total_searches - 1,
+                unique_words = unique_words - EXISTS (
+                    SELECT 1 FROM user_word_stats
+                    WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0),
+                active_days = active_days - EXISTS (
+                    SELECT 1 FROM user_daily_activity
+                    WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY}
+                      AND search_count <= 0)
+            WHERE user_id = OLD.user_id;
+
+            DELETE FROM user_word_stats
+            WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0;
+            DELETE FROM user_daily_activity
+            WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY} AND search_count <= 0;
+
+            -- Only rescan when the deleted row was a boundary value
+            UPDATE user_word_stats SET
+                first_searched = (SELECT MIN(searched_at) FROM word_history
+                                  WHERE user_id = OLD.user_id AND word_id = OLD.word_id),
+                last_searched = (SELECT MAX(searched_at) FROM word_history
+                                 WHERE user_id = OLD.user_id AND word_id = OLD.word_id)
+            WHERE user_id = OLD.user_id AND word_id = OLD.word_id
+              AND (first_searched = OLD.searched_at OR last_searched = OLD.searched_at);
+            UPDATE user_stats SET
+                first_activity = (SELECT MIN(first_searched) FROM user_word_stats
+                                  WHERE user_id = OLD.user_id),
+                last_activity = (SELECT MAX(last_searched) FROM user_word_stats
+                                 WHERE user_id = OLD.user_id)
+            WHERE user_id = OLD.user_id
+              AND (first_activity = OLD.searched_at OR last_activity = OLD.searched_at);
+        END
+    ''')
+
+    cursor.execute('''
+        INSERT INTO user_word_stats (user_id, word_id, search_count, first_searched, last_searched)
+        SELECT user_id, word_id, COUNT(*), MIN(searched_at), MAX(searched_at)
+        FROM word_history
+        GROUP BY user_id, word_id
+    ''')
+    cursor.execute(f'''
+        INSERT INTO user_daily_activity (user_id, day, search_count)
+        SELECT user_id, searched_at / {SECONDS_PER_DAY}, COUNT(*)
+        FROM word_history
+        GROUP BY user_id, searched_at / {SECONDS_PER_DAY}
+    ''')
+    cursor.execute('''
+        INSERT INTO user_stats (user_id, total_searches, unique_words, active_days,
+                                first_activity, last_activity)
+        SELECT w.user_id, SUM(w.search_count), COUNT(*),
+               (SELECT COUNT(*) FROM user_daily_activity d WHERE d.user_id = w.user_id),
+               MIN(w.first_searched), MAX(w.last_searched)
+        FROM user_word_stats w
+        GROUP BY w.user_id
+    ''')
+
+
+def migrate_to_v2(conn, batch_size=MIGRATION_BATCH_SIZE):
+    """Normalize word_history to integer user/word keys and epoch timestamps
+
+    Rows are copied in small transactions so the legacy table stays usable
+    while a large history is converted, and an interrupted copy resumes
+    where it stopped. A final short transaction copies any rows added in
+    the meantime and swaps the tables.
+    """
+    conn.create_function("normalize_word", 1, schema.normalize_word, deterministic=True)
+    conn.create_function("history_source", 1, schema.history_source, deterministic=True)
+
+    with transaction(conn) as cursor:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS words (
+                id INTEGER PRIMARY KEY,
+                word TEXT UNIQUE NOT NULL
+            )
+        ''')
+        # searched_at is a Unix timestamp (UTC seconds)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS word_history_v2 (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES accounts (id),
+                word_id INTEGER NOT NULL REFERENCES words (id),
+                source INTEGER NOT NULL DEFAULT 0,
+                searched_at INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS migration_progress (
+                name TEXT PRIMARY KEY,
+                position INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO migration_progress VALUES ('word_history_v2', 0)")
+
+    while True:
+        with transaction(conn) as cursor:
+            cursor.execute("SELECT position FROM migration_progress WHERE name = 'word_history_v2'")
+            position = cursor.fetchone()[0]
+            last_id = _copy_history_batch(cursor, position, batch_size)
+            if last_id is None:
+                break
+            cursor.execute('''
+                UPDATE migration_progress SET position = ? WHERE name = 'word_history_v2'
+            ''', (last_id,))
+
+    with transaction(conn) as cursor:
+        # Pick up rows written since the last batch
+        _copy_history_batch(cursor, position, -1)
+
+        # Drop the text-keyed summaries and swap in the normalized table
+        cursor.execute("DROP TRIGGER IF EXISTS word_history_stats_insert")
+        cursor.execute("DROP TRIGGER IF EXISTS word_history_stats_delete")
+        for table in ("user_stats", "user_word_stats", "user_daily_activity"):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("DROP INDEX IF EXISTS idx_word_history_user_word")
+        cursor.execute("ALTER TABLE word_history RENAME TO word_history_legacy")
+        cursor.execute("ALTER TABLE word_history_v2 RENAME TO word_history")
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_word_history_user_word
+            ON word_history (user_id, word_id, searched_at)
+        ''')
+        _create_v2_stats(cursor)
+
+        # Keep rows that belong to no account instead of silently losing them
+        cursor.execute('''
+            DELETE FROM word_history_legacy
+            WHERE username IN (SELECT username FROM accounts)
+        ''')
+        cursor.execute("SELECT COUNT(*) FROM word_history_legacy")
+        orphans = cursor.fetchone()[0]
+        if orphans:
+            print(f"Migration: kept {orphans} history rows without an account in word_history_legacy")
+        else:
+            cursor.execute("DROP TABLE word_history_legacy")
+
+        # The copy is done; nothing else tracks progress in this table
+        cursor.execute("DROP TABLE migration_progress")
+        set_version(cursor, 2)
+
+
+def migrate_to_v3(conn):
+    """Add a key/value table for per-installation settings"""
+    with transaction(conn) as cursor:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        set_version(cursor, 3)
+
+
+def migrate_to_v4(conn):
+    """Store remember-me tokens hashed, behind a unique index, with epoch expiry"""
+    conn.create_function("hash_token", 1, hash_token, deterministic=True)
+    with transaction(conn) as cursor:
+        # token_hash is SHA-256 of the token; expires_at is a Unix timestamp
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS auth_tokens_v4 (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES accounts (id),
+                token_hash TEXT NOT NULL UNIQUE,
+                expires_at INTEGER NOT NULL
+            )
+        ''')
+        # Expired and orphaned tokens are dropped rather than carried over
+        cursor.execute('''
+            INSERT OR IGNORE INTO auth_tokens_v4 (user_id, token_hash, expires_at)
+            SELECT user_id, hash_token(token), CAST(strftime('%s', expires_at) AS INTEGER)
+            FROM auth_tokens
+            WHERE user_id IN (SELECT id FROM accounts)
+              AND CAST(strftime('%s', expires_at) AS INTEGER) > CAST(strftime('%s', 'now') AS INTEGER)
+        ''')
+        cursor.execute("DROP TABLE auth_tokens")
+        cursor.execute("ALTER TABLE auth_tokens_v4 RENAME TO auth_tokens")
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_auth_tokens_expires_at ON auth_tokens (expires_at)
+        ''')
+        set_version(cursor, 4)
+
+
+def migrate_to_v5(conn):
+    """Add the indexes used by paginated history reads"""
+    with transaction(conn) as cursor:
+        # Keyset pagination over a user's history in time order
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_word_history_user_time
+            ON word_history (user_id, searched_at)
+        ''')
+        # Keyset pagination over a user's words, most recent first
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_word_stats_recent
+            ON user_word_stats (user_id, last_searched, word_id)
+        ''')
+        set_version(cursor, 5)
+
+
+def migrate_to_v6(conn):
+    """Add the definition cache and resumable import jobs"""
+    with transaction(conn) as cursor:
+        # definition is the API response as JSON, NULL when the word was not found;
+        # fetched_at is a Unix timestamp
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS definition_cache (
+                word_id INTEGER PRIMARY KEY REFERENCES words (id),
+                definition TEXT,
+                fetched_at INTEGER NOT NULL
+            )
+        ''')
+        # checksum identifies the file contents; imported counts words committed
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS import_jobs (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES accounts (id),
+                source_path TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                imported INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'running',
+                created_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_import_jobs_user_checksum ON import_jobs (user_id, checksum)
+        ''')
+        set_version(cursor, 6)
+
+
+def _first_searched(user, word):
+    """SQL for a word's earliest search across raw history and rollups"""
+    return f'''(SELECT MIN(t) FROM (
+                    SELECT MIN(searched_at) AS t FROM word_history
+                    WHERE user_id = {user} AND word_id = {word}
+                    UNION ALL
+                    SELECT MIN(first_searched) FROM word_history_rollups
+                    WHERE user_id = {user} AND word_id = {word}))'''
+
+
+def _last_searched(user, word):
+    """SQL for a word's latest search across raw history and rollups"""
+    return f'''(SELECT MAX(t) FROM (
+                    SELECT MAX(searched_at) AS t FROM word_history
+                    WHERE user_id = {user} AND word_id = {word}
+                    UNION ALL
+                    SELECT MAX(last_searched) FROM word_history_rollups
+                    WHERE user_id = {user} AND word_id = {word}))'''
+
+
+def migrate_to_v7(conn):
+    """Add history rollups and let compaction bypass the stats delete trigger"""
+    with transaction(conn) as cursor:
+        # History older than the retention horizon, compacted to one row per
+        # user, word and day (day as in user_daily_activity)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS word_history_rollups (
+                user_id INTEGER NOT NULL REFERENCES accounts (id),
+                word_id INTEGER NOT NULL REFERENCES words (id),
+                day INTEGER NOT NULL,
+                search_count INTEGER NOT NULL,
+                first_searched INTEGER NOT NULL,
+                last_searched INTEGER NOT NULL,
+                PRIMARY KEY (user_id, word_id, day)
+            ) WITHOUT ROWID
+        ''')
+        # Compaction moves rows into rollups without changing any totals, so it
+        # marks itself in history_compaction (inside its own transaction) and
+        # the delete trigger stands aside
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS history_compaction (
+                active INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("DROP TRIGGER IF EXISTS word_history_stats_delete")
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS word_history_stats_delete
+            AFTER DELETE ON word_history
+            WHEN NOT EXISTS (SELECT 1 FROM history_compaction)
+            BEGIN
+                UPDATE user_word_stats SET search_count = search_count - 1
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id;
+                UPDATE user_daily_activity SET search_count = search_count - 1
+                WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY};
+
+                UPDATE user_stats SET
+                    total_searches = total_searches - 1,
+                    unique_words = unique_words - EXISTS (
+                        SELECT 1 FROM user_word_stats
+                        WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0),
+                    active_days = active_days - EXISTS (
+                        SELECT 1 FROM user_daily_activity
+                        WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY}
+                          AND search_count <= 0)
+                WHERE user_id = OLD.user_id;
+
+                DELETE FROM user_word_stats
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0;
+                DELETE FROM user_daily_activity
+                WHERE user_id = OLD.user_id AND day = OLD.searched_at / {SECONDS_PER_DAY} AND search_count <= 0;
+
+                -- Only rescan when the deleted row was a boundary value
+                UPDATE user_word_stats SET
+                    first_searched = {_first_searched("OLD.user_id", "OLD.word_id")},
+                    last_searched = {_last_searched("OLD.user_id", "OLD.word_id")}
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id
+                  AND (first_searched = OLD.searched_at OR last_searched = OLD.searched_at);
+                UPDATE user_stats SET
+                    first_activity = (SELECT MIN(first_searched) FROM user_word_stats
+                                      WHERE user_id = OLD.user_id),
+                    last_activity = (SELECT MAX(last_searched) FROM user_word_stats
+                                     WHERE user_id = OLD.user_id)
+                WHERE user_id = OLD.user_id
+                  AND (first_activity = OLD.searched_at OR last_activity = OLD.searched_at);
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS word_history_rollups_stats_delete
+            AFTER DELETE ON word_history_rollups
+            BEGIN
+                UPDATE user_word_stats SET search_count = search_count - OLD.search_count
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id;
+                UPDATE user_daily_activity SET search_count = search_count - OLD.search_count
+                WHERE user_id = OLD.user_id AND day = OLD.day;
+
+                UPDATE user_stats SET
+                    total_searches = total_searches - OLD.search_count,
+                    unique_words = unique_words - EXISTS (
+                        SELECT 1 FROM user_word_stats
+                        WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0),
+                    active_days = active_days - EXISTS (
+                        SELECT 1 FROM user_daily_activity
+                        WHERE user_id = OLD.user_id AND day = OLD.day AND search_count <= 0)
+                WHERE user_id = OLD.user_id;
+
+                DELETE FROM user_word_stats
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id AND search_count <= 0;
+                DELETE FROM user_daily_activity
+                WHERE user_id = OLD.user_id AND day = OLD.day AND search_count <= 0;
+
+                UPDATE user_word_stats SET
+                    first_searched = {_first_searched("OLD.user_id", "OLD.word_id")},
+                    last_searched = {_last_searched("OLD.user_id", "OLD.word_id")}
+                WHERE user_id = OLD.user_id AND word_id = OLD.word_id
+                  AND (first_searched = OLD.first_searched OR last_searched = OLD.last_searched);
+                UPDATE user_stats SET
+                    first_activity = (SELECT MIN(first_searched) FROM user_word_stats
+                                      WHERE user_id = OLD.user_id),
+                    last_activity = (SELECT MAX(last_searched) FROM user_word_stats
+                                     WHERE user_id = OLD.user_id)
+                WHERE user_id = OLD.user_id
+                  AND (first_activity = OLD.first_searched OR last_activity = OLD.last_searched);
+            END
+        ''')
+        set_version(cursor, 7)
+
+
+_DEFINITION_TEXT = '''
+    (SELECT group_concat(value, ' ') FROM json_tree({0}) WHERE key = 'definition'),
+    (SELECT group_concat(value, ' ') FROM json_tree({0}) WHERE key = 'example')
+'''
+
+
+def migrate_to_v8(conn):
+    """Add full-text search over words, cached definitions and articles"""
+    with transaction(conn) as cursor:
+        # Words searched by anyone; reads the text from the words table itself
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5 (
+                word,
+                content = 'words', content_rowid = 'id',
+                prefix = '2 3'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words
+            BEGIN
+                INSERT INTO words_fts (rowid, word) VALUES (NEW.id, NEW.word);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words
+            BEGIN
+                INSERT INTO words_fts (words_fts, rowid, word) VALUES ('delete', OLD.id, OLD.word);
+            END
+        ''')
+
+        # Definition and example text pulled out of the cached API responses;
+        # rowid is the word id
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS definitions_fts USING fts5 (
+                word, definitions, examples,
+                tokenize = 'porter unicode61',
+                prefix = '3'
+            )
+        ''')
+        definition_row = f'''
+            INSERT INTO definitions_fts (rowid, word, definitions, examples)
+            SELECT NEW.word_id,
+                   (SELECT word FROM words WHERE id = NEW.word_id),
+                   {_DEFINITION_TEXT.format("NEW.definition")}
+            WHERE NEW.definition IS NOT NULL;
+        '''
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS definitions_fts_insert AFTER INSERT ON definition_cache
+            BEGIN
+                {definition_row}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS definitions_fts_update AFTER UPDATE ON definition_cache
+            BEGIN
+                DELETE FROM definitions_fts WHERE rowid = OLD.word_id;
+                {definition_row}
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS definitions_fts_delete AFTER DELETE ON definition_cache
+            BEGIN
+                DELETE FROM definitions_fts WHERE rowid = OLD.word_id;
+            END
+        ''')
+
+        # Reading articles, refreshed by the application when their text changes
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+                title, category UNINDEXED, summary, body,
+                tokenize = 'porter unicode61',
+                prefix = '3'
+            )
+        ''')
+
+        # Index what is already there
+        cursor.execute("INSERT INTO words_fts (words_fts) VALUES ('rebuild')")
+        cursor.execute("DELETE FROM definitions_fts")
+        cursor.execute(f'''
+            INSERT INTO definitions_fts (rowid, word, definitions, examples)
+            SELECT c.word_id, w.word, {_DEFINITION_TEXT.format("c.definition")}
+            FROM definition_cache c JOIN words w ON w.id = c.word_id
+            WHERE c.definition IS NOT NULL
+        ''')
+        set_version(cursor, 8)
+
+
+def migrate_to_v9(conn):
+    """Store a definition snapshot (phonetic, part of speech, first sense) with cached entries"""
+    with transaction(conn) as cursor:
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(definition_cache)")}
+        for column in ("phonetic", "part_of_speech", "summary"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE definition_cache ADD COLUMN {column} TEXT")
+        rows = cursor.execute(
+            "SELECT word_id, definition FROM definition_cache WHERE definition IS NOT NULL"
+        ).fetchall()
+        cursor.executemany(
+            "UPDATE definition_cache SET phonetic = ?, part_of_speech = ?, summary = ? WHERE word_id = ?",
+            [(*schema.definition_snapshot(json.loads(definition)), word_id) for word_id, definition in rows]
+        )
+        set_version(cursor, 9)
+
+
+def migrate_to_v10(conn):
+    """Add the change log used to sync history between devices"""
+    with transaction(conn) as cursor:
+        # One row per user who syncs; pushed is the last local seq sent to the
+        # server and pulled the last server seq merged here
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_state (
+                user_id INTEGER PRIMARY KEY REFERENCES accounts (id),
+                server TEXT NOT NULL,
+                pushed INTEGER NOT NULL DEFAULT 0,
+                pulled INTEGER NOT NULL DEFAULT 0,
+                synced_at INTEGER
+            )
+        ''')
+        # Local changes of syncing users; AUTOINCREMENT so a seq is never reused
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                word_id INTEGER NOT NULL,
+                op INTEGER NOT NULL,
+                source INTEGER NOT NULL DEFAULT 0,
+                changed_at INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sync_changes_user ON sync_changes (user_id, seq)
+        ''')
+        # Ids of changes from other devices already merged, so a batch that is
+        # delivered twice is only applied once
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_applied (
+                change_id TEXT PRIMARY KEY
+            ) WITHOUT ROWID
+        ''')
+        # Latest removal of each word, so searches older than it that arrive
+        # later from another device do not bring the word back
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_removals (
+                user_id INTEGER NOT NULL,
+                word_id INTEGER NOT NULL,
+                removed_at INTEGER NOT NULL,
+                PRIMARY KEY (user_id, word_id)
+            ) WITHOUT ROWID
+        ''')
+        # Merging marks itself here (inside its own transaction) so the rows it
+        # inserts are not logged as local changes and sent back
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_merge (
+                active INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS word_history_sync_log
+            AFTER INSERT ON word_history
+            WHEN NOT EXISTS (SELECT 1 FROM sync_merge)
+              AND EXISTS (SELECT 1 FROM sync_state WHERE user_id = NEW.user_id)
+            BEGIN
+                INSERT INTO sync_changes (user_id, word_id, op, source, changed_at)
+                VALUES (NEW.user_id, NEW.word_id, {schema.SYNC_OP_SEARCH}, NEW.source, NEW.searched_at);
+            END
+        ''')
+        set_version(cursor, 10)
+
+
+def migrate_to_v11(conn):
+    """Drop the migration_progress table that v2 used to leave behind"""
+    with transaction(conn) as cursor:
+        cursor.execute("DROP TABLE IF EXISTS migration_progress")
+        set_version(cursor, 11)
+
+
+MIGRATIONS = [
+    (1, migrate_to_v1),
+    (2, migrate_to_v2),
+    (3, migrate_to_v3),
+    (4, migrate_to_v4),
+    (5, migrate_to_v5),
+    (6, migrate_to_v6),
+    (7, migrate_to_v7),
+    (8, migrate_to_v8),
+    (9, migrate_to_v9),
+    (10, migrate_to_v10),
+    (11, migrate_to_v11),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(db_file):
+    """Bring a database up to the current schema version
+
+    Returns the (old, new) schema versions.
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None, timeout=30)
+    try:
+        start_version = get_version(conn)
+        for version, upgrade in MIGRATIONS:
+            if version > get_version(conn):
+                upgrade(conn)
+        return start_version, get_version(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,150 @@
+"""
+Password hashing for VocabLoury application
+
+Hashes are stored in a self-describing format so the algorithm and cost can
+change without breaking existing accounts:
+
+    $pbkdf2-sha256$i=<iterations>$<salt>$<hash>
+    $scrypt$n=<cost>,r=<block size>,p=<parallelism>$<salt>$<hash>
+
+Accounts created before this format store a bare PBKDF2-SHA256 hex digest
+(100,000 iterations) with the salt in a separate column; those are still
+verified and are upgraded on the next successful login.
+"""
+
+import hashlib
+import hmac
+import secrets
+import time
+
+from config.settings import (
+    PASSWORD_HASH_SCHEME,
+    PBKDF2_ITERATIONS,
+    PBKDF2_MIN_ITERATIONS,
+    SCRYPT_N,
+    SCRYPT_MIN_N,
+    SCRYPT_MAX_N,
+    SCRYPT_R,
+    SCRYPT_P,
+)
+
+SCHEME_PBKDF2 = "pbkdf2-sha256"
+SCHEME_SCRYPT = "scrypt"
+
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+DEFAULT_PARAMS = {
+    SCHEME_PBKDF2: {"i": PBKDF2_ITERATIONS},
+    SCHEME_SCRYPT: {"n": SCRYPT_N, "r": SCRYPT_R, "p": SCRYPT_P},
+}
+
+
+def _derive(password, salt, scheme, params):
+    """Run the key derivation function and return the hex digest"""
+    if scheme == SCHEME_PBKDF2:
+        return hashlib.pbkdf2_hmac(
+            'sha256',
+            password.encode('utf-8'),
+            salt.encode('utf-8'),
+            params["i"]
+        ).hex()
+    if scheme == SCHEME_SCRYPT:
+        n, r, p = params["n"], params["r"], params["p"]
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt.encode('utf-8'),
+            n=n, r=r, p=p,
+            maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+            dklen=32
+        ).hex()
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
+
+
+def _format_params(params):
+    """Encode parameters as comma separated key=value pairs"""
+    return ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def _parse_params(text):
+    """Decode comma separated key=value pairs"""
+    return {key: int(value) for key, value in (item.split("=") for item in text.split(","))}
+
+
+def parse_hash(encoded, legacy_salt=None):
+    """Split a stored hash into (scheme, params, salt, digest)"""
+    if not encoded.startswith("$"):
+        return SCHEME_PBKDF2, {"i": LEGACY_PBKDF2_ITERATIONS}, legacy_salt, encoded
+    _, scheme, params, salt, digest = encoded.split("$")
+    return scheme, _parse_params(params), salt, digest
+
+
+def hash_password(password, scheme=PASSWORD_HASH_SCHEME, params=None, salt=None):
+    """Hash a password; returns the encoded hash and its salt"""
+    params = params or DEFAULT_PARAMS[scheme]
+    if salt is None:
+        salt = secrets.token_hex(16)
+    digest = _derive(password, salt, scheme, params)
+    return f"${scheme}${_format_params(params)}${salt}${digest}", salt
+
+
+def verify_password(password, encoded, legacy_salt=None):
+    """Check a password against a stored hash in constant time"""
+    try:
+        scheme, params, salt, digest = parse_hash(encoded, legacy_salt)
+        candidate = _derive(password, salt, scheme, params)
+    except (ValueError, KeyError):
+        return False
+    return hmac.compare_digest(candidate, digest)
+
+
+def needs_rehash(encoded, scheme=PASSWORD_HASH_SCHEME, params=None):
+    """Check whether a stored hash uses a different scheme or cost"""
+    params = params or DEFAULT_PARAMS[scheme]
+    try:
+        stored_scheme, stored_params, _, _ = parse_hash(encoded)
+    except ValueError:
+        return True
+    return encoded[:1] != "$" or stored_scheme != scheme or stored_params != params
+
+
+def hash_token(token):
+    """Hash a remember-me token for storage and lookup
+
+    Tokens are long random values, so a single fast SHA-256 is enough; the
+    database never holds a usable token.
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _time_hash(scheme, params, rounds=3):
+    """Best-of-N time in milliseconds to hash one password"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _derive("calibration-password", "calibration-salt", scheme, params)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def calibrate(scheme=PASSWORD_HASH_SCHEME, target_ms=150):
+    """Pick the strongest parameters whose hash time fits the latency budget
+
+    The cost never drops below the configured minimum, so a slow machine
+    gets a slower login rather than weaker hashes.
+    """
+    if scheme == SCHEME_PBKDF2:
+        sample = {"i": 20000}
+        per_iteration = _time_hash(scheme, sample) / sample["i"]
+        iterations = int(target_ms / per_iteration) // 1000 * 1000
+        return {"i": max(PBKDF2_MIN_ITERATIONS, iterations)}
+
+    if scheme == SCHEME_SCRYPT:
+        params = {"n": SCRYPT_MIN_N, "r": SCRYPT_R, "p": SCRYPT_P}
+        while True:
+            candidate = dict(params, n=params["n"] * 2)
+            # Doubling n doubles the time, so stop before overshooting
+            if candidate["n"] > SCRYPT_MAX_N or _time_hash(scheme, params) * 2 > target_ms:
+                return params
+            params = candidate
+
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
@@ -0,0 +1,125 @@
+"""
+Bulk account provisioning for VocabLoury application
+
+Creates many accounts from a CSV file (username, email, password,
+profession). Rows are validated with the same rules as the signup form,
+passwords are hashed in parallel across processes, and the accounts are
+inserted in a single transaction where a bad row is reported and skipped
+without affecting the others.
+"""
+
+import csv
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, NamedTuple
+
+from src.models.password_hashing import hash_password
+from src.utils.validation import FormValidator
+
+REQUIRED_COLUMNS = ("username", "email", "password", "profession")
+
+
+class UserRow(NamedTuple):
+    line: int
+    username: str
+    email: str
+    password: str
+    profession: str
+
+
+class ProvisionError(NamedTuple):
+    line: int
+    username: str
+    message: str
+
+
+class ProvisionReport(NamedTuple):
+    created: List[str]
+    errors: List[ProvisionError]
+
+
+def read_user_csv(path):
+    """Read user rows from a CSV file with a header row"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        header = [name.strip().lower() for name in reader.fieldnames or []]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+        reader.fieldnames = header
+        return [
+            UserRow(reader.line_num, *((row.get(column) or "").strip() for column in REQUIRED_COLUMNS))
+            for row in reader
+        ]
+
+
+def validate_row(row):
+    """Check a row with the signup form rules; returns an error message or None"""
+    checks = (
+        FormValidator.validate_username(row.username),
+        FormValidator.validate_email(row.email),
+        FormValidator.validate_password(row.password),
+        FormValidator.validate_profession(row.profession),
+    )
+    for valid, message in checks:
+        if not valid:
+            return message
+    return None
+
+
+def provision_users(db, rows, workers=None):
+    """Create accounts for validated rows; returns a ProvisionReport"""
+    errors = []
+    valid_rows = []
+    seen_usernames = set()
+    seen_emails = set()
+    for row in rows:
+        message = validate_row(row)
+        if message is None and row.username in seen_usernames:
+            message = "Username appears more than once in the file"
+        if message is None and row.email in seen_emails:
+            message = "Email appears more than once in the file"
+        if message:
+            errors.append(ProvisionError(row.line, row.username, message))
+            continue
+        seen_usernames.add(row.username)
+        seen_emails.add(row.email)
+        valid_rows.append(row)
+
+    if not valid_rows:
+        return ProvisionReport([], errors)
+
+    # Hashing dominates the cost and is CPU bound, so spread it over processes
+    scheme, params = db.password_policy()
+    workers = workers or os.cpu_count() or 1
+    passwords = [row.password for row in valid_rows]
+    if workers > 1 and len(passwords) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(passwords) // (workers * 4))
+            hashes = list(executor.map(hash_password, passwords, repeat(scheme), repeat(params),
+                                       chunksize=chunksize))
+    else:
+        hashes = [hash_password(password, scheme, params) for password in passwords]
+
+    accounts = [
+        (row.username, row.email, password_hash, salt, row.profession)
+        for row, (password_hash, salt) in zip(valid_rows, hashes)
+    ]
+    # One batched insert in the usual case; only when some row conflicts with
+    # an existing account (which rolls the batch back) go row by row to find it
+    try:
+        db.accounts.create_many(accounts)
+        results = [None] * len(accounts)
+    except sqlite3.IntegrityError:
+        results = db.accounts.create_each(accounts)
+
+    created = []
+    for row, error in zip(valid_rows, results):
+        if error is None:
+            created.append(row.username)
+        else:
+            errors.append(ProvisionError(row.line, row.username, error))
+    errors.sort()
+    return ProvisionReport(created, errors)
@@ -0,0 +1,198 @@
+"""
+Query instrumentation for VocabLoury application
+
+Repositories report every named query they run (time, rows returned and the
+view that triggered it) to the process-wide ``query_stats``. Connections can
+also install ``query_stats.trace`` as their SQLite trace callback, which
+counts every statement SQLite executes; statements run by triggers are
+counted against the statement that fired them. Traced SQL has its literal
+values replaced by ``?`` so no user data ends up in the statistics.
+Queries slower than ``QUERY_SLOW_MS`` are logged, optionally with their
+EXPLAIN QUERY PLAN, and the whole picture can be read with ``snapshot()`` or
+written to a JSON file with ``dump()``.
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, NamedTuple, Optional
+
+from config.settings import QUERY_EXPLAIN_SLOW, QUERY_SLOW_MS, QUERY_STATS_SAMPLES
+
+SLOW_LOG_SIZE = 200  # most recent slow queries kept
+_VIEW_DIRS = (os.sep + "views" + os.sep, os.sep + "controllers" + os.sep)
+_view_files = {}  # code file name -> whether it is a view or controller module
+_LITERALS = re.compile(r"'(?:[^']|'')*'|x'[0-9a-fA-F]*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryTiming(NamedTuple):
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    rows: int
+    views: Dict[str, int]
+
+
+class SlowQuery(NamedTuple):
+    name: str
+    duration_ms: float
+    rows: int
+    view: str
+    at: float
+    plan: Optional[List[str]]
+
+
+def calling_view():
+    """Name the view (or controller) method that led to the current query
+
+    Falls back to the thread name for work that no view started, such as
+    the history writer or a background import.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        is_view = _view_files.get(code.co_filename)
+        if is_view is None:
+            is_view = _view_files[code.co_filename] = any(part in code.co_filename for part in _VIEW_DIRS)
+        if is_view:
+            owner = frame.f_locals.get("self")
+            if owner is not None:
+                return f"{type(owner).__name__}.{code.co_name}"
+            return code.co_name
+        frame = frame.f_back
+    return threading.current_thread().name
+
+
+def normalize_sql(statement):
+    """Collapse whitespace and replace literal values with ? in traced SQL"""
+    return _LITERALS.sub("?", " ".join(statement.split()))
+
+
+def explain_plan(conn, sql, params=None):
+    """EXPLAIN QUERY PLAN lines for a statement; unbound parameters plan as NULLs"""
+    if params is None:
+        params = [None] * sql.count("?")
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * fraction) - 1)]
+
+
+class _QueryRecord:
+    __slots__ = ("count", "total", "max", "rows", "samples", "views", "explained")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=QUERY_STATS_SAMPLES)
+        self.views = Counter()
+        self.explained = False
+
+
+class QueryStats:
+    """Thread-safe per-query counters, timings and slow query log"""
+
+    def __init__(self, slow_ms=QUERY_SLOW_MS, explain_slow=QUERY_EXPLAIN_SLOW):
+        self.slow_ms = slow_ms
+        self.explain_slow = explain_slow
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._statements = Counter()
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+        self._started = time.time()
+
+    def record(self, name, seconds, rows, explain=None):
+        """Record one run of a named query
+
+        explain is called (at most once per query) to capture the plan of a
+        slow run when plan capture is on.
+        """
+        duration_ms = seconds * 1000
+        view = calling_view()
+        with self._lock:
+            record = self._queries.get(name)
+            if record is None:
+                record = self._queries[name] = _QueryRecord()
+            record.count += 1
+            record.total += duration_ms
+            record.max = max(record.max, duration_ms)
+            record.rows += rows
+            record.samples.append(duration_ms)
+            record.views[view] += 1
+            if duration_ms < self.slow_ms:
+                return
+            capture = self.explain_slow and explain is not None and not record.explained
+            record.explained = record.explained or capture
+
+        plan = None
+        if capture:
+            try:
+                plan = explain()
+            except Exception as e:
+                plan = [f"EXPLAIN failed: {e}"]
+        with self._lock:
+            self._slow.append(SlowQuery(name, duration_ms, rows, view, time.time(), plan))
+        print(f"⚠️ Slow query {name}: {duration_ms:.1f} ms, {rows} rows ({view})")
+
+    def trace(self, statement):
+        """SQLite trace callback: count each executed statement by view"""
+        text = normalize_sql(statement)[:200]
+        view = calling_view()
+        with self._lock:
+            self._statements[(view, text)] += 1
+
+    def snapshot(self):
+        """Current statistics as plain data, busiest queries first"""
+        with self._lock:
+            queries = [
+                QueryTiming(
+                    name, record.count, record.total, record.total / record.count,
+                    _percentile(record.samples, 0.95), record.max, record.rows, dict(record.views)
+                )
+                for name, record in self._queries.items()
+            ]
+            statements = [
+                {"view": view, "statement": text, "count": count}
+                for (view, text), count in self._statements.most_common()
+            ]
+            slow = list(self._slow)
+        queries.sort(key=lambda timing: timing.total_ms, reverse=True)
+        return {
+            "since": self._started,
+            "queries": [timing._asdict() for timing in queries],
+            "statements": statements,
+            "slow": [entry._asdict() for entry in slow],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._statements.clear()
+            self._slow.clear()
+            self._started = time.time()
+
+    def has_data(self):
+        with self._lock:
+            return bool(self._queries or self._statements)
+
+    def dump(self, path):
+        """Write the current statistics to a JSON file"""
+        temp_path = path + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_path, path)
+
+
+query_stats = QueryStats()
@@ -0,0 +1,866 @@
+"""
+Repository layer for VocabLoury application
+
+All SQL used by the application lives in ``QUERIES`` so it can be tuned,
+measured and cached in one place. Repositories run those named statements
+on the database manager's per-thread connection, whose statement cache keeps
+them prepared between calls, and return typed row objects.
+"""
+
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.settings import QUERY_STATS_ENABLED
+from src.models.query_stats import explain_plan, query_stats
+from src.models.schema import (
+    SECONDS_PER_DAY, SYNC_OP_REMOVE, SYNC_OP_SEARCH, definition_snapshot, normalize_word, rebuild_stats
+)
+
+
+class Account(NamedTuple):
+    id: int
+    username: str
+    email: str
+    profession: Optional[str]
+    created_at: Optional[str]
+
+
+class Credentials(NamedTuple):
+    user_id: int
+    password: str
+    salt: str
+
+
+class UserStats(NamedTuple):
+    total_searches: int = 0
+    unique_words: int = 0
+    active_days: int = 0
+    first_activity: Optional[int] = None  # Unix timestamp
+    last_activity: Optional[int] = None  # Unix timestamp
+
+
+class SavedWord(NamedTuple):
+    word: str
+    search_count: int
+    last_searched: int  # Unix timestamp
+    word_id: int
+    # Definition snapshot, None until the word's definition has been cached
+    phonetic: Optional[str] = None
+    part_of_speech: Optional[str] = None
+    summary: Optional[str] = None
+
+    @property
+    def cursor(self):
+        """Keyset position of this row, for fetching the page after it"""
+        return (self.last_searched, self.word_id)
+
+
+class HistoryEntry(NamedTuple):
+    id: int
+    word: str
+    source: int
+    searched_at: int  # Unix timestamp
+
+    @property
+    def cursor(self):
+        """Keyset position of this row, for fetching the page after it"""
+        return (self.searched_at, self.id)
+
+
+class HistoryRollup(NamedTuple):
+    word: str
+    day: int  # days since the Unix epoch (UTC)
+    search_count: int
+    first_searched: int  # Unix timestamp
+    last_searched: int  # Unix timestamp
+    word_id: int
+
+    @property
+    def cursor(self):
+        """Keyset position of this row, for fetching the page after it"""
+        return (self.word_id, self.day)
+
+
+class CachedDefinition(NamedTuple):
+    word: str
+    definition: Optional[str]  # API entry as JSON text, None when the dictionary has none
+    fetched_at: int  # Unix timestamp
+    word_id: int
+
+    @property
+    def cursor(self):
+        """Keyset position of this row, for fetching the page after it"""
+        return (self.word_id,)
+
+
+class ImportJob(NamedTuple):
+    id: int
+    source_path: str
+    checksum: str
+    total: int
+    imported: int
+    status: str
+
+
+class SyncState(NamedTuple):
+    server: str
+    pushed: int  # last local change seq sent to the server
+    pulled: int  # last server seq merged here
+    synced_at: Optional[int]  # Unix timestamp
+
+
+class SyncChange(NamedTuple):
+    seq: int
+    op: int  # SYNC_OP_SEARCH or SYNC_OP_REMOVE
+    word: str
+    source: int
+    changed_at: int  # Unix timestamp
+
+
+class SearchResult(NamedTuple):
+    kind: str  # "word", "definition" or "article"
+    title: str  # the word, or the article title
+    snippet: str  # matching text with hits marked «like this»
+    rank: float  # bm25 score, lower is better
+
+
+class TokenOwner(NamedTuple):
+    username: str
+    expires_at: int  # Unix timestamp
+
+
+QUERIES = {
+    # Accounts
+    "account_by_username": '''
+        SELECT id, username, email, profession, created_at
+        FROM accounts WHERE username = ?
+    ''',
+    "account_id": "SELECT id FROM accounts WHERE username = ?",
+    "account_credentials": "SELECT id, password, salt FROM accounts WHERE username = ?",
+    "account_profession": "SELECT profession FROM accounts WHERE username = ?",
+    "account_insert": '''
+        INSERT INTO accounts (username, email, password, salt, profession)
+        VALUES (?, ?, ?, ?, ?)
+    ''',
+    "account_update_password": "UPDATE accounts SET password = ?, salt = ? WHERE id = ?",
+
+    # Word history
+    "word_insert": "INSERT OR IGNORE INTO words (word) VALUES (?)",
+    "history_insert": '''
+        INSERT INTO word_history (user_id, word_id, source, searched_at)
+        SELECT a.id, w.id, ?, ?
+        FROM accounts a, words w
+        WHERE a.username = ? AND w.word = ?
+    ''',
+    "history_delete_word": '''
+        DELETE FROM word_history
+        WHERE user_id = (SELECT id FROM accounts WHERE username = ?)
+          AND word_id = (SELECT id FROM words WHERE word = ?)
+    ''',
+    "rollups_delete_word": '''
+        DELETE FROM word_history_rollups
+        WHERE user_id = (SELECT id FROM accounts WHERE username = ?)
+          AND word_id = (SELECT id FROM words WHERE word = ?)
+    ''',
+    # Keyset pages, newest first: the first page has no cursor, later pages
+    # continue strictly after the (time, id) of the last row already shown
+    "saved_words_first": '''
+        SELECT w.word, s.search_count, s.last_searched, s.word_id,
+               c.phonetic, c.part_of_speech, c.summary
+        FROM accounts a
+        JOIN user_word_stats s ON s.user_id = a.id
+        JOIN words w ON w.id = s.word_id
+        LEFT JOIN definition_cache c ON c.word_id = s.word_id
+        WHERE a.username = ?
+        ORDER BY s.last_searched DESC, s.word_id DESC
+        LIMIT ?
+    ''',
+    "saved_words_after": '''
+        SELECT w.word, s.search_count, s.last_searched, s.word_id,
+               c.phonetic, c.part_of_speech, c.summary
+        FROM accounts a
+        JOIN user_word_stats s ON s.user_id = a.id
+        JOIN words w ON w.id = s.word_id
+        LEFT JOIN definition_cache c ON c.word_id = s.word_id
+        WHERE a.username = ? AND (s.last_searched, s.word_id) < (?, ?)
+        ORDER BY s.last_searched DESC, s.word_id DESC
+        LIMIT ?
+    ''',
+    "history_first": '''
+        SELECT h.id, w.word, h.source, h.searched_at
+        FROM accounts a
+        JOIN word_history h ON h.user_id = a.id
+        JOIN words w ON w.id = h.word_id
+        WHERE a.username = ?
+        ORDER BY h.searched_at DESC, h.id DESC
+        LIMIT ?
+    ''',
+    "history_after": '''
+        SELECT h.id, w.word, h.source, h.searched_at
+        FROM accounts a
+        JOIN word_history h ON h.user_id = a.id
+        JOIN words w ON w.id = h.word_id
+        WHERE a.username = ? AND (h.searched_at, h.id) < (?, ?)
+        ORDER BY h.searched_at DESC, h.id DESC
+        LIMIT ?
+    ''',
+
+    "rollups_first": '''
+        SELECT w.word, r.day, r.search_count, r.first_searched, r.last_searched, r.word_id
+        FROM accounts a
+        JOIN word_history_rollups r ON r.user_id = a.id
+        JOIN words w ON w.id = r.word_id
+        WHERE a.username = ?
+        ORDER BY r.word_id, r.day
+        LIMIT ?
+    ''',
+    "rollups_after": '''
+        SELECT w.word, r.day, r.search_count, r.first_searched, r.last_searched, r.word_id
+        FROM accounts a
+        JOIN word_history_rollups r ON r.user_id = a.id
+        JOIN words w ON w.id = r.word_id
+        WHERE a.username = ? AND (r.word_id, r.day) > (?, ?)
+        ORDER BY r.word_id, r.day
+        LIMIT ?
+    ''',
+
+    # Compaction: the guard row tells the stats delete trigger to stand aside,
+    # because rolled up searches still count
+    "account_ids": "SELECT id FROM accounts",
+    "compaction_candidates": '''
+        SELECT id FROM word_history
+        WHERE user_id = ? AND searched_at < ?
+        ORDER BY searched_at
+        LIMIT ?
+    ''',
+    "compaction_guard_on": "INSERT INTO history_compaction (active) VALUES (1)",
+    "compaction_guard_off": "DELETE FROM history_compaction",
+    "rollups_merge": f'''
+        INSERT INTO word_history_rollups (user_id, word_id, day, search_count, first_searched, last_searched)
+        SELECT user_id, word_id, searched_at / {SECONDS_PER_DAY}, COUNT(*), MIN(searched_at), MAX(searched_at)
+        FROM word_history
+        WHERE id IN (SELECT value FROM json_each(?))
+        GROUP BY user_id, word_id, searched_at / {SECONDS_PER_DAY}
+        ON CONFLICT (user_id, word_id, day) DO UPDATE SET
+            search_count = search_count + excluded.search_count,
+            first_searched = MIN(first_searched, excluded.first_searched),
+            last_searched = MAX(last_searched, excluded.last_searched)
+    ''',
+    "history_delete_ids": "DELETE FROM word_history WHERE id IN (SELECT value FROM json_each(?))",
+
+    # Definition cache (word lists are passed as a JSON array so one
+    # prepared statement serves any number of words)
+    "definitions_for_words": '''
+        SELECT w.word, c.definition
+        FROM json_each(?) j
+        JOIN words w ON w.word = j.value
+        JOIN definition_cache c ON c.word_id = w.id
+    ''',
+    "definition_upsert": '''
+        INSERT INTO definition_cache (word_id, definition, phonetic, part_of_speech, summary, fetched_at)
+        SELECT id, ?, ?, ?, ?, ? FROM words WHERE word = ?
+        ON CONFLICT (word_id) DO UPDATE SET
+            definition = excluded.definition,
+            phonetic = excluded.phonetic,
+            part_of_speech = excluded.part_of_speech,
+            summary = excluded.summary,
+            fetched_at = excluded.fetched_at
+    ''',
+    # Cached entries of one user's saved words, in word id order
+    "user_definitions_first": '''
+        SELECT w.word, c.definition, c.fetched_at, c.word_id
+        FROM accounts a
+        JOIN user_word_stats s ON s.user_id = a.id
+        JOIN definition_cache c ON c.word_id = s.word_id
+        JOIN words w ON w.id = c.word_id
+        WHERE a.username = ?
+        ORDER BY s.word_id
+        LIMIT ?
+    ''',
+    "user_definitions_after": '''
+        SELECT w.word, c.definition, c.fetched_at, c.word_id
+        FROM accounts a
+        JOIN user_word_stats s ON s.user_id = a.id
+        JOIN definition_cache c ON c.word_id = s.word_id
+        JOIN words w ON w.id = c.word_id
+        WHERE a.username = ? AND s.word_id > ?
+        ORDER BY s.word_id
+        LIMIT ?
+    ''',
+
+    # Word list imports
+    "import_job_unfinished": '''
+        SELECT j.id, j.source_path, j.checksum, j.total, j.imported, j.status
+        FROM accounts a JOIN import_jobs j ON j.user_id = a.id
+        WHERE a.username = ? AND j.checksum = ? AND j.status != 'done'
+        ORDER BY j.id DESC LIMIT 1
+    ''',
+    "import_job_insert": '''
+        INSERT INTO import_jobs (user_id, source_path, checksum, total, created_at, updated_at)
+        SELECT id, ?, ?, ?, ?, ? FROM accounts WHERE username = ?
+    ''',
+    "import_job_progress": '''
+        UPDATE import_jobs SET imported = ?, status = ?, updated_at = ? WHERE id = ?
+    ''',
+
+    # Full-text search (bm25 ranks lower-is-better; hits are marked «...»)
+    "search_words": '''
+        SELECT 'word', w.word, highlight(words_fts, 0, '«', '»'), bm25(words_fts) AS rank
+        FROM words_fts
+        JOIN user_word_stats s ON s.word_id = words_fts.rowid
+        JOIN words w ON w.id = words_fts.rowid
+        WHERE words_fts MATCH ? AND s.user_id = (SELECT id FROM accounts WHERE username = ?)
+        ORDER BY rank
+        LIMIT ?
+    ''',
+    "search_definitions": '''
+        SELECT 'definition', w.word,
+               snippet(definitions_fts, -1, '«', '»', '…', 12),
+               bm25(definitions_fts, 5.0, 2.0, 1.0) AS rank
+        FROM definitions_fts
+        JOIN user_word_stats s ON s.word_id = definitions_fts.rowid
+        JOIN words w ON w.id = definitions_fts.rowid
+        WHERE definitions_fts MATCH ? AND s.user_id = (SELECT id FROM accounts WHERE username = ?)
+        ORDER BY rank
+        LIMIT ?
+    ''',
+    "search_articles": '''
+        SELECT 'article', title,
+               snippet(articles_fts, -1, '«', '»', '…', 12),
+               bm25(articles_fts, 10.0, 0.0, 3.0, 1.0) AS rank
+        FROM articles_fts
+        WHERE articles_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    ''',
+    "articles_clear": "DELETE FROM articles_fts",
+    "article_insert": "INSERT INTO articles_fts (title, category, summary, body) VALUES (?, ?, ?, ?)",
+
+    # Statistics
+    "user_stats": '''
+        SELECT s.total_searches, s.unique_words, s.active_days, s.first_activity, s.last_activity
+        FROM accounts a JOIN user_stats s ON s.user_id = a.id
+        WHERE a.username = ?
+    ''',
+    "active_days_since": '''
+        SELECT COUNT(*)
+        FROM accounts a JOIN user_daily_activity d ON d.user_id = a.id
+        WHERE a.username = ? AND d.day >= ?
+    ''',
+
+    # Remember me tokens
+    "token_insert": "INSERT INTO auth_tokens (user_id, token_hash, expires_at) VALUES (?, ?, ?)",
+    "token_owner": '''
+        SELECT a.username, t.expires_at
+        FROM auth_tokens t
+        JOIN accounts a ON a.id = t.user_id
+        WHERE t.token_hash = ? AND t.expires_at > ?
+    ''',
+    "token_delete": "DELETE FROM auth_tokens WHERE token_hash = ?",
+    "token_purge_expired": '''
+        DELETE FROM auth_tokens WHERE id IN (
+            SELECT id FROM auth_tokens WHERE expires_at <= ? LIMIT ?
+        )
+    ''',
+
+    # History sync: local changes are logged by a trigger (searches) or by
+    # remove_words (removals) for users with a sync_state row
+    "sync_state": "SELECT server, pushed, pulled, synced_at FROM sync_state WHERE user_id = ?",
+    "sync_enroll": "INSERT INTO sync_state (user_id, server) VALUES (?, ?)",
+    "sync_backfill": f'''
+        INSERT INTO sync_changes (user_id, word_id, op, source, changed_at)
+        SELECT user_id, word_id, {SYNC_OP_SEARCH}, source, searched_at
+        FROM word_history WHERE user_id = ?
+        ORDER BY searched_at, id
+    ''',
+    "sync_change_server": "UPDATE sync_state SET server = ?, pushed = 0, pulled = 0 WHERE user_id = ?",
+    "sync_local_changes": '''
+        SELECT c.seq, c.op, w.word, c.source, c.changed_at
+        FROM sync_changes c JOIN words w ON w.id = c.word_id
+        WHERE c.user_id = ? AND c.seq > ?
+        ORDER BY c.seq
+        LIMIT ?
+    ''',
+    "sync_pushed": "UPDATE sync_state SET pushed = MAX(pushed, ?), synced_at = ? WHERE user_id = ?",
+    "sync_pulled": "UPDATE sync_state SET pulled = MAX(pulled, ?), synced_at = ? WHERE user_id = ?",
+    "sync_log_removal": f'''
+        INSERT INTO sync_changes (user_id, word_id, op, changed_at)
+        SELECT s.user_id, w.id, {SYNC_OP_REMOVE}, ?
+        FROM accounts a JOIN sync_state s ON s.user_id = a.id, words w
+        WHERE a.username = ? AND w.word = ?
+    ''',
+    "sync_removal_local": '''
+        INSERT INTO sync_removals (user_id, word_id, removed_at)
+        SELECT s.user_id, w.id, ?
+        FROM accounts a JOIN sync_state s ON s.user_id = a.id, words w
+        WHERE a.username = ? AND w.word = ?
+        ON CONFLICT (user_id, word_id) DO UPDATE SET removed_at = MAX(removed_at, excluded.removed_at)
+    ''',
+    # Merging changes from other devices: the guard row keeps the log
+    # trigger from recording them again
+    "sync_guard_on": "INSERT INTO sync_merge (active) VALUES (1)",
+    "sync_guard_off": "DELETE FROM sync_merge",
+    "sync_applied_ids": '''
+        SELECT change_id FROM sync_applied
+        WHERE change_id IN (SELECT value FROM json_each(?))
+    ''',
+    "sync_mark_applied": "INSERT OR IGNORE INTO sync_applied (change_id) VALUES (?)",
+    "sync_merge_search": '''
+        INSERT INTO word_history (user_id, word_id, source, searched_at)
+        SELECT ?, w.id, ?, ?
+        FROM words w
+        WHERE w.word = ?
+          AND NOT EXISTS (SELECT 1 FROM sync_removals r
+                          WHERE r.user_id = ? AND r.word_id = w.id AND r.removed_at >= ?)
+    ''',
+    "sync_merge_removal": '''
+        INSERT INTO sync_removals (user_id, word_id, removed_at)
+        SELECT ?, id, ? FROM words WHERE word = ?
+        ON CONFLICT (user_id, word_id) DO UPDATE SET removed_at = MAX(removed_at, excluded.removed_at)
+    ''',
+    "sync_merge_remove_history": '''
+        DELETE FROM word_history
+        WHERE user_id = ? AND word_id = (SELECT id FROM words WHERE word = ?) AND searched_at <= ?
+    ''',
+    # A rollup cannot be split at the removal time, so like a local removal
+    # this drops every rolled up search of the word
+    "sync_merge_remove_rollups": '''
+        DELETE FROM word_history_rollups
+        WHERE user_id = ? AND word_id = (SELECT id FROM words WHERE word = ?)
+    ''',
+
+    # Settings
+    "setting_get": "SELECT value FROM app_settings WHERE key = ?",
+    "setting_set": '''
+        INSERT INTO app_settings (key, value) VALUES (?, ?)
+        ON CONFLICT (key) DO UPDATE SET value = excluded.value
+    ''',
+}
+
+
+def fts_query(text, prefix=True):
+    """Turn free text into a safe FTS5 query
+
+    Each whitespace separated chunk is quoted (so "short-lived" becomes the
+    phrase "short lived") and all chunks must match. With `prefix`, the
+    last chunk also matches longer words, for search-as-you-type. Returns
+    None when the text has nothing searchable.
+    """
+    chunks = [re.findall(r"\w+", chunk) for chunk in text.split()]
+    chunks = [tokens for tokens in chunks if tokens]
+    if not chunks:
+        return None
+    terms = ['"' + " ".join(tokens) + '"' for tokens in chunks]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def definition_row(word, definition, fetched_at):
+    """Parameters of the definition_upsert query for one API entry (or None)"""
+    encoded = json.dumps(definition) if definition is not None else None
+    return (encoded, *definition_snapshot(definition), fetched_at, word)
+
+
+def insert_history(conn, rows):
+    """Insert (username, word, source, searched_at) history rows with two batched statements
+
+    Words must already be normalized. Rows for unknown usernames select
+    nothing and are dropped. Runs inside the caller's transaction.
+    """
+    conn.executemany(QUERIES["word_insert"], [(word,) for _, word, _, _ in rows])
+    conn.executemany(QUERIES["history_insert"],
+                     [(source, searched_at, username, word)
+                      for username, word, source, searched_at in rows])
+
+
+def account_conflict_message(error):
+    """User-facing message for an IntegrityError raised by an account insert"""
+    if "username" in str(error):
+        return "Username already exists!"
+    elif "email" in str(error):
+        return "Email already exists!"
+    return "An error occurred!"
+
+
+class Repository:
+    """Base class: runs named queries on the manager's connection"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def _execute(self, name, params=()):
+        return self.db.connection().execute(QUERIES[name], params)
+
+    def _record(self, name, started, rows, params=None):
+        """Report a finished query to the query statistics"""
+        if QUERY_STATS_ENABLED:
+            explain = None
+            if name in QUERIES:
+                explain = lambda: explain_plan(self.db.connection(), QUERIES[name], params)
+            query_stats.record(name, time.perf_counter() - started, rows, explain)
+
+    @contextmanager
+    def _transaction(self, name):
+        """Run several statements in one transaction, recorded as one named operation"""
+        started = time.perf_counter()
+        conn = self.db.connection()
+        changes = conn.total_changes
+        with conn:
+            yield conn
+        self._record(name, started, conn.total_changes - changes)
+
+    def _fetchone(self, name, params=(), row_type=None):
+        started = time.perf_counter()
+        row = self._execute(name, params).fetchone()
+        self._record(name, started, 0 if row is None else 1, params)
+        if row is not None and row_type is not None:
+            return row_type(*row)
+        return row
+
+    def _fetchall(self, name, params=(), row_type=None):
+        started = time.perf_counter()
+        rows = self._execute(name, params).fetchall()
+        self._record(name, started, len(rows), params)
+        if row_type is not None:
+            return [row_type(*row) for row in rows]
+        return rows
+
+    def _write(self, name, params=()):
+        """Run one statement in its own transaction; returns the cursor"""
+        started = time.perf_counter()
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.execute(QUERIES[name], params)
+        self._record(name, started, max(cursor.rowcount, 0), params)
+        return cursor
+
+    def _write_many(self, name, seq_of_params):
+        """Run one statement for many rows in a single transaction"""
+        started = time.perf_counter()
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.executemany(QUERIES[name], seq_of_params)
+        self._record(name, started, max(cursor.rowcount, 0))
+        return cursor
+
+    @staticmethod
+    def _iter_pages(fetch_page, username, page_size):
+        # Each page is its own short read, so writers are never blocked by
+        # a consumer that is slow to iterate
+        after = None
+        while True:
+            page = fetch_page(username, page_size, after)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = page[-1].cursor
+
+
+class AccountRepository(Repository):
+    """User accounts"""
+
+    def get(self, username) -> Optional[Account]:
+        return self._fetchone("account_by_username", (username,), Account)
+
+    def get_id(self, username) -> Optional[int]:
+        row = self._fetchone("account_id", (username,))
+        return row[0] if row else None
+
+    def get_credentials(self, username) -> Optional[Credentials]:
+        return self._fetchone("account_credentials", (username,), Credentials)
+
+    def get_profession(self, username) -> Optional[str]:
+        row = self._fetchone("account_profession", (username,))
+        return row[0] if row else None
+
+    def create(self, username, email, password_hash, salt, profession) -> int:
+        return self._write("account_insert", (username, email, password_hash, salt, profession)).lastrowid
+
+    def create_many(self, rows: Iterable[Tuple[str, str, str, str, str]]):
+        """Insert (username, email, password_hash, salt, profession) rows in one transaction"""
+        self._write_many("account_insert", rows)
+
+    def create_each(self, rows: Sequence[Tuple[str, str, str, str, str]]) -> List[Optional[str]]:
+        """Insert accounts in one transaction, skipping rows that conflict
+
+        Returns one entry per row: None if it was created, otherwise the
+        reason it was not.
+        """
+        results = []
+        with self._transaction("accounts.create_each") as conn:
+            for row in rows:
+                # A failed statement only undoes itself, the transaction goes on
+                try:
+                    conn.execute(QUERIES["account_insert"], row)
+                    results.append(None)
+                except sqlite3.IntegrityError as e:
+                    results.append(account_conflict_message(e))
+        return results
+
+    def update_password(self, user_id, password_hash, salt):
+        self._write("account_update_password", (password_hash, salt, user_id))
+
+
+class HistoryRepository(Repository):
+    """Word history and the per-word summaries built from it"""
+
+    def saved_words_page(self, username, limit, after=None) -> List[SavedWord]:
+        """Get up to `limit` words, newest first, after a SavedWord.cursor"""
+        if after is None:
+            return self._fetchall("saved_words_first", (username, limit), SavedWord)
+        return self._fetchall("saved_words_after", (username, *after, limit), SavedWord)
+
+    def iter_saved_words(self, username, page_size) -> Iterator[SavedWord]:
+        """Stream every saved word, newest first, one page at a time"""
+        return self._iter_pages(self.saved_words_page, username, page_size)
+
+    def history_page(self, username, limit, after=None) -> List[HistoryEntry]:
+        """Get up to `limit` history rows, newest first, after a HistoryEntry.cursor"""
+        if after is None:
+            return self._fetchall("history_first", (username, limit), HistoryEntry)
+        return self._fetchall("history_after", (username, *after, limit), HistoryEntry)
+
+    def iter_history(self, username, page_size) -> Iterator[HistoryEntry]:
+        """Stream every history row, newest first, one page at a time"""
+        return self._iter_pages(self.history_page, username, page_size)
+
+    def remove_word(self, username, word):
+        self.remove_words(username, [word])
+
+    def remove_words(self, username, words: Iterable[str]):
+        """Delete every raw and rolled up search of the given words"""
+        params = [(username, normalize_word(word)) for word in words]
+        now = int(time.time())
+        with self._transaction("history.remove_words") as conn:
+            conn.executemany(QUERIES["history_delete_word"], params)
+            conn.executemany(QUERIES["rollups_delete_word"], params)
+            # Only logged for users who sync
+            conn.executemany(QUERIES["sync_log_removal"], [(now, *row) for row in params])
+            conn.executemany(QUERIES["sync_removal_local"], [(now, *row) for row in params])
+
+    def rollups_page(self, username, limit, after=None) -> List[HistoryRollup]:
+        """Get up to `limit` rollup rows after a HistoryRollup.cursor"""
+        if after is None:
+            return self._fetchall("rollups_first", (username, limit), HistoryRollup)
+        return self._fetchall("rollups_after", (username, *after, limit), HistoryRollup)
+
+    def iter_rollups(self, username, page_size) -> Iterator[HistoryRollup]:
+        """Stream every rollup row, one page at a time"""
+        return self._iter_pages(self.rollups_page, username, page_size)
+
+    def compactable_users(self) -> List[int]:
+        return [row[0] for row in self._fetchall("account_ids")]
+
+    def compact_batch(self, user_id, before, limit) -> int:
+        """Roll up one batch of a user's searches older than `before`
+
+        Returns how many raw rows were compacted. The summary tables are
+        untouched because the searches are still counted, now in rollups.
+        """
+        ids = [row[0] for row in self._fetchall("compaction_candidates", (user_id, before, limit))]
+        if not ids:
+            return 0
+        ids_json = json.dumps(ids)
+        with self._transaction("history.compact_batch") as conn:
+            conn.execute(QUERIES["compaction_guard_on"])
+            conn.execute(QUERIES["rollups_merge"], (ids_json,))
+            conn.execute(QUERIES["history_delete_ids"], (ids_json,))
+            conn.execute(QUERIES["compaction_guard_off"])
+        return len(ids)
+
+
+class StatsRepository(Repository):
+    """Per-user summary statistics"""
+
+    def get(self, username) -> UserStats:
+        return self._fetchone("user_stats", (username,), UserStats) or UserStats()
+
+    def active_days_since(self, username, first_day) -> int:
+        """Count active days on or after an epoch day number"""
+        return self._fetchone("active_days_since", (username, first_day))[0]
+
+    def active_days(self, username, days, now) -> int:
+        """Count active days within the last `days` days"""
+        return self.active_days_since(username, int(now) // SECONDS_PER_DAY - days)
+
+    def rebuild(self, user_id=None):
+        with self._transaction("stats.rebuild") as conn:
+            rebuild_stats(conn.cursor(), user_id)
+
+
+class DefinitionRepository(Repository):
+    """Cached dictionary API responses"""
+
+    def get_many(self, words: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Get cached definitions (JSON text, None if not found) by normalized word
+
+        Words that were never fetched are missing from the result.
+        """
+        return dict(self._fetchall("definitions_for_words", (json.dumps(list(words)),)))
+
+    def put_many(self, definitions: Dict[str, Optional[dict]], fetched_at):
+        """Cache API entries (None when not found) by normalized word in one transaction"""
+        with self._transaction("definitions.put_many") as conn:
+            conn.executemany(QUERIES["word_insert"], [(word,) for word in definitions])
+            conn.executemany(QUERIES["definition_upsert"],
+                             [definition_row(word, definition, fetched_at)
+                              for word, definition in definitions.items()])
+
+    def user_page(self, username, limit, after=None) -> List[CachedDefinition]:
+        """Get up to `limit` cached entries of a user's words after a CachedDefinition.cursor"""
+        if after is None:
+            return self._fetchall("user_definitions_first", (username, limit), CachedDefinition)
+        return self._fetchall("user_definitions_after", (username, *after, limit), CachedDefinition)
+
+    def iter_user(self, username, page_size) -> Iterator[CachedDefinition]:
+        """Stream the cached entries of every word a user has saved, one page at a time"""
+        return self._iter_pages(self.user_page, username, page_size)
+
+
+class ImportJobRepository(Repository):
+    """Progress of word list imports"""
+
+    def find_unfinished(self, username, checksum) -> Optional[ImportJob]:
+        return self._fetchone("import_job_unfinished", (username, checksum), ImportJob)
+
+    def create(self, username, source_path, checksum, total, now) -> int:
+        return self._write("import_job_insert",
+                           (source_path, checksum, total, now, now, username)).lastrowid
+
+    def commit_chunk(self, job_id, rows: Sequence[Tuple[str, str, int, int]], imported, status, now):
+        """Insert (username, word, source, searched_at) history rows and record
+        the job's progress in the same transaction, so a resumed import never
+        adds a word twice
+        """
+        with self._transaction("import_jobs.commit_chunk") as conn:
+            insert_history(conn, rows)
+            conn.execute(QUERIES["import_job_progress"], (imported, status, now, job_id))
+
+    def set_status(self, job_id, imported, status, now):
+        self._write("import_job_progress", (imported, status, now, job_id))
+
+
+class SearchRepository(Repository):
+    """Ranked full-text search over a user's words, their definitions and articles"""
+
+    def words(self, username, query, limit) -> List[SearchResult]:
+        return self._fetchall("search_words", (query, username, limit), SearchResult)
+
+    def definitions(self, username, query, limit) -> List[SearchResult]:
+        return self._fetchall("search_definitions", (query, username, limit), SearchResult)
+
+    def articles(self, query, limit) -> List[SearchResult]:
+        return self._fetchall("search_articles", (query, limit), SearchResult)
+
+    def replace_articles(self, rows: Iterable[Tuple[str, str, str, str]]):
+        """Replace the indexed (title, category, summary, body) articles"""
+        with self._transaction("search.replace_articles") as conn:
+            conn.execute(QUERIES["articles_clear"])
+            conn.executemany(QUERIES["article_insert"], rows)
+
+
+class TokenRepository(Repository):
+    """Hashed remember me tokens"""
+
+    def create(self, user_id, token_hash, expires_at):
+        self._write("token_insert", (user_id, token_hash, expires_at))
+
+    def find_owner(self, token_hash, now) -> Optional[TokenOwner]:
+        return self._fetchone("token_owner", (token_hash, int(now)), TokenOwner)
+
+    def delete(self, token_hash):
+        self._write("token_delete", (token_hash,))
+
+    def purge_expired(self, now, batch_size) -> int:
+        """Delete one batch of expired tokens; returns how many were deleted"""
+        return self._write("token_purge_expired", (int(now), batch_size)).rowcount
+
+
+class SyncRepository(Repository):
+    """Change log and cursors for syncing history with a server"""
+
+    def state(self, user_id) -> Optional[SyncState]:
+        return self._fetchone("sync_state", (user_id,), SyncState)
+
+    def enroll(self, user_id, server) -> SyncState:
+        """Start logging a user's changes for `server`
+
+        The first time, the user's existing history is logged so it is
+        pushed too. Switching servers starts both cursors over; changes
+        keep their ids, so anything the new server already has is ignored.
+        """
+        with self._transaction("sync.enroll") as conn:
+            state = conn.execute(QUERIES["sync_state"], (user_id,)).fetchone()
+            if state is None:
+                conn.execute(QUERIES["sync_enroll"], (user_id, server))
+                conn.execute(QUERIES["sync_backfill"], (user_id,))
+            elif state[0] != server:
+                conn.execute(QUERIES["sync_change_server"], (server, user_id))
+        return self.state(user_id)
+
+    def local_changes(self, user_id, after, limit) -> List[SyncChange]:
+        """Get up to `limit` of the user's logged changes after seq `after`"""
+        return self._fetchall("sync_local_changes", (user_id, after, limit), SyncChange)
+
+    def mark_pushed(self, user_id, seq, now):
+        self._write("sync_pushed", (seq, now, user_id))
+
+    def merge(self, user_id, changes: Iterable[Tuple[str, int, str, int, int]], pulled, now) -> int:
+        """Apply (change_id, op, word, source, changed_at) changes from other devices
+
+        The pull cursor moves in the same transaction, and changes already
+        applied are skipped, so a batch can safely be delivered again.
+        A search older than the word's latest removal is dropped, and a
+        removal deletes the raw searches made up to its time and, as a
+        local removal does, all of the word's rollups, so devices end up
+        the same whatever order they sync in. Returns how many changes
+        were applied.
+        """
+        changes = list(changes)
+        with self._transaction("sync.merge") as conn:
+            conn.execute(QUERIES["sync_guard_on"])
+            seen = {row[0] for row in conn.execute(
+                QUERIES["sync_applied_ids"], (json.dumps([change[0] for change in changes]),))}
+            fresh = []
+            for change in changes:
+                if change[0] not in seen:
+                    seen.add(change[0])
+                    fresh.append(change)
+            conn.executemany(QUERIES["sync_mark_applied"], [(change[0],) for change in fresh])
+            conn.executemany(QUERIES["word_insert"], [(change[2],) for change in fresh])
+            # Searches in a row never change what a search checks, and removals
+            # only widen each other, so each run of one kind is one batch; the
+            # runs themselves are applied in order
+            for op, run in groupby(fresh, key=lambda change: change[1]):
+                run = list(run)
+                if op == SYNC_OP_SEARCH:
+                    conn.executemany(QUERIES["sync_merge_search"],
+                                     [(user_id, source, changed_at, word, user_id, changed_at)
+                                      for _, _, word, source, changed_at in run])
+                elif op == SYNC_OP_REMOVE:
+                    conn.executemany(QUERIES["sync_merge_removal"],
+                                     [(user_id, changed_at, word) for _, _, word, _, changed_at in run])
+                    removals = [(user_id, word, changed_at) for _, _, word, _, changed_at in run]
+                    conn.executemany(QUERIES["sync_merge_remove_history"], removals)
+                    conn.executemany(QUERIES["sync_merge_remove_rollups"],
+                                     [(user, word) for user, word, _ in removals])
+            conn.execute(QUERIES["sync_pulled"], (pulled, now, user_id))
+            conn.execute(QUERIES["sync_guard_off"])
+        return len(fresh)
+
+
+class SettingsRepository(Repository):
+    """Per-installation key/value settings (values are JSON text)"""
+
+    def get(self, key) -> Optional[str]:
+        row = self._fetchone("setting_get", (key,))
+        return row[0] if row else None
+
+    def set(self, key, value):
+        self._write("setting_set", (key, value))
@@ -0,0 +1,92 @@
+"""
+Database schema definitions for VocabLoury application
+
+Constants and helpers shared by the models. The tables, indexes and
+triggers themselves are created by the versioned migrations in
+``src.models.migrations``.
+"""
+
+# Where a word_history row came from (replaces the old free-text meaning column)
+HISTORY_SOURCE_SEARCH = 0
+HISTORY_SOURCE_ALPHABET = 1
+HISTORY_SOURCE_LEARNING = 2
+HISTORY_SOURCE_OTHER = 3
+HISTORY_SOURCE_IMPORT = 4
+
+SECONDS_PER_DAY = 86400
+
+# Kinds of change recorded in the sync change log
+SYNC_OP_SEARCH = 0  # one search (a word_history row)
+SYNC_OP_REMOVE = 1  # a word removed from the history, searches up to changed_at
+
+
+def history_source(meaning):
+    """Map a legacy meaning label to a history source code"""
+    if meaning == "Searched":
+        return HISTORY_SOURCE_SEARCH
+    if meaning == "Alphabet Search":
+        return HISTORY_SOURCE_ALPHABET
+    if meaning and meaning.startswith("Learning"):
+        return HISTORY_SOURCE_LEARNING
+    return HISTORY_SOURCE_OTHER
+
+
+def normalize_word(word):
+    """Normalize a word before it is stored in the words table"""
+    return word.strip().lower()
+
+
+def definition_snapshot(definition):
+    """(phonetic, part_of_speech, summary) from a dictionary API entry
+
+    The snapshot is stored beside the cached entry so word lists can show a
+    definition without parsing the whole response.
+    """
+    if not definition:
+        return None, None, None
+    phonetic = definition.get('phonetic') or next(
+        (item.get('text') for item in definition.get('phonetics') or [] if item.get('text')), None
+    )
+    meanings = definition.get('meanings') or [{}]
+    senses = meanings[0].get('definitions') or [{}]
+    return phonetic, meanings[0].get('partOfSpeech'), senses[0].get('definition')
+
+
+def rebuild_stats(cursor, user_id=None):
+    """Recompute the summary tables from word_history and its rollups (all users or one)"""
+    user_filter = "WHERE user_id = ?" if user_id is not None else ""
+    params = (user_id,) if user_id is not None else ()
+
+    for table in ("user_stats", "user_word_stats", "user_daily_activity"):
+        cursor.execute(f"DELETE FROM {table} {user_filter}", params)
+
+    # Raw rows count once each; rollup rows carry their own counts
+    searches = f'''
+        SELECT user_id, word_id, searched_at / {SECONDS_PER_DAY} AS day, 1 AS n,
+               searched_at AS first_searched, searched_at AS last_searched
+        FROM word_history {user_filter}
+        UNION ALL
+        SELECT user_id, word_id, day, search_count, first_searched, last_searched
+        FROM word_history_rollups {user_filter}
+    '''
+    cursor.execute(f'''
+        INSERT INTO user_word_stats (user_id, word_id, search_count, first_searched, last_searched)
+        SELECT user_id, word_id, SUM(n), MIN(first_searched), MAX(last_searched)
+        FROM ({searches})
+        GROUP BY user_id, word_id
+    ''', params * 2)
+    cursor.execute(f'''
+        INSERT INTO user_daily_activity (user_id, day, search_count)
+        SELECT user_id, day, SUM(n)
+        FROM ({searches})
+        GROUP BY user_id, day
+    ''', params * 2)
+    cursor.execute(f'''
+        INSERT INTO user_stats (user_id, total_searches, unique_words, active_days,
+                                first_activity, last_activity)
+        SELECT w.user_id, SUM(w.search_count), COUNT(*),
+               (SELECT COUNT(*) FROM user_daily_activity d WHERE d.user_id = w.user_id),
+               MIN(w.first_searched), MAX(w.last_searched)
+        FROM user_word_stats w {user_filter.replace("user_id", "w.user_id")}
+        GROUP BY w.user_id
+    ''', params)
@@ -0,0 +1,118 @@
+"""
+Signed-in user context for VocabLoury application
+
+A ``UserSession`` is created when a user logs in and shared by every page.
+It loads the account, preferences and statistics the first time a page asks
+for them and keeps them until a change event reports that the user's
+history or profile changed, so moving between pages does not repeat the
+same queries.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from src.models.events import HISTORY_EVENTS, PROFILE_CHANGED
+from src.models.repositories import Account, UserStats
+from src.models.schema import SECONDS_PER_DAY
+
+DEFAULT_PROFESSION = "Student"
+
+
+class UserSession:
+    """Cached, self-invalidating view of one user's data"""
+
+    def __init__(self, db, username):
+        self.db = db
+        self.username = username
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced with a change
+        # is not cached
+        self._generation = 0
+        self._account = None
+        self._preferences = None
+        self._stats = None
+        self._active_days = {}  # (days, epoch day it was counted on) -> count
+        db.events.subscribe(HISTORY_EVENTS + (PROFILE_CHANGED,), self.on_change)
+
+    def close(self):
+        """Stop listening for changes (on logout)"""
+        self.db.events.unsubscribe(self.on_change)
+
+    def _cached(self, name, load):
+        with self._lock:
+            value = getattr(self, name)
+            generation = self._generation
+        if value is not None:
+            return value
+        value = load()
+        with self._lock:
+            if value is not None and generation == self._generation:
+                setattr(self, name, value)
+        return value
+
+    @property
+    def account(self) -> Optional[Account]:
+        return self._cached("_account", lambda: self.db.get_account(self.username))
+
+    @property
+    def email(self) -> Optional[str]:
+        account = self.account
+        return account.email if account else None
+
+    @property
+    def profession(self) -> str:
+        account = self.account
+        return (account.profession if account else None) or DEFAULT_PROFESSION
+
+    @property
+    def preferences(self) -> dict:
+        """The user's preferences (a copy; change them with set_preference)"""
+        return dict(self._cached("_preferences", lambda: self.db.get_user_preferences(self.username)))
+
+    def set_preference(self, key, value):
+        preferences = self.preferences
+        preferences[key] = value
+        return self.db.set_user_preferences(self.username, preferences)
+
+    @property
+    def stats(self) -> UserStats:
+        return self._cached("_stats", lambda: self.db.get_user_stats(self.username))
+
+    def active_days(self, days=30) -> int:
+        """Days with at least one search within the last `days` days"""
+        # The window moves at midnight (UTC, as in count_active_days), so a
+        # count only holds for the day it was made on
+        key = (days, int(time.time()) // SECONDS_PER_DAY)
+        with self._lock:
+            count = self._active_days.get(key)
+            generation = self._generation
+        if count is not None:
+            return count
+        count = self.db.count_active_days(self.username, days)
+        with self._lock:
+            if generation == self._generation:
+                self._active_days = {cached: value for cached, value in self._active_days.items()
+                                     if cached[1] == key[1]}
+                self._active_days[key] = count
+        return count
+
+    def invalidate(self, history=True, profile=True):
+        """Drop cached values so the next access reloads them"""
+        with self._lock:
+            self._generation += 1
+            if history:
+                self._stats = None
+                self._active_days = {}
+            if profile:
+                self._account = None
+                self._preferences = None
+
+    def on_change(self, event):
+        """Change event handler; may be called from any thread"""
+        if event.username is not None and event.username != self.username:
+            return
+        if event.name in HISTORY_EVENTS:
+            self.invalidate(history=True, profile=False)
+        elif event.name == PROFILE_CHANGED:
+            self.invalidate(history=False, profile=True)
@@ -0,0 +1 @@
+# Sync Package
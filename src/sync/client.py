@@ -0,0 +1,135 @@
+"""
+History sync client for VocabLoury application
+
+Sends a user's logged history changes to a sync server and merges the
+changes other devices sent, in batches, as described in
+``src.sync.protocol``. Only changes after the stored cursors travel, so a
+sync costs in proportion to what changed since the last one rather than
+to the size of the history. Each pulled batch is merged in one
+transaction together with the cursor, so an interrupted sync simply
+resumes.
+"""
+
+import sqlite3
+import threading
+import time
+
+import requests
+
+from config.settings import SYNC_BATCH_SIZE, SYNC_TIMEOUT_SECONDS
+from src.models.events import HISTORY_CHANGED
+from src.sync.protocol import CONTENT_ENCODING, CONTENT_TYPE, change_id, changes_path, encode
+
+
+class SyncCancelled(Exception):
+    """Raised between batches when the sync is cancelled"""
+
+
+class SyncClient:
+    """Syncs one user's history with a server, optionally on a background thread"""
+
+    def __init__(self, db, username, server_url, batch_size=SYNC_BATCH_SIZE, timeout=SYNC_TIMEOUT_SECONDS):
+        self.db = db
+        self.username = username
+        self.server_url = server_url.rstrip("/")
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        # Progress, read from other threads while the sync runs
+        self.pushed = 0
+        self.pulled = 0
+        self.applied = 0
+        self.error = None
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._thread = None
+        self._session = None
+
+    @property
+    def running(self):
+        return self._thread is not None and not self.finished.is_set()
+
+    def start(self):
+        """Run the sync on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="SyncClient", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop after the current batch; the next sync carries on from there"""
+        self._cancel.set()
+
+    def run(self):
+        """Run the sync on the calling thread; returns True when it completes"""
+        try:
+            user_id = self.db.get_user_id(self.username)
+            if user_id is None:
+                raise ValueError(f"Unknown user: {self.username}")
+            self.db.flush_history()
+            self.db.sync.enroll(user_id, self.server_url)
+            device_id = self.db.sync_device_id()
+            with requests.Session() as self._session:
+                self._push(user_id, device_id)
+                self._pull(user_id, device_id)
+            return True
+        except SyncCancelled:
+            return False
+        except (requests.RequestException, sqlite3.Error, ValueError, KeyError) as e:
+            self.error = e
+            print(f"Sync error: {e}")
+            return False
+        finally:
+            if self.applied:
+                self.db.events.publish(HISTORY_CHANGED, self.username)
+            self.finished.set()
+
+    def _push(self, user_id, device_id):
+        """Send every local change after the push cursor"""
+        after = self.db.sync.state(user_id).pushed
+        while True:
+            self._check_cancelled()
+            changes = self.db.sync.local_changes(user_id, after, self.batch_size)
+            if not changes:
+                return
+            self._request("POST", json={
+                "device": device_id,
+                "changes": [[change_id(device_id, change.seq), change.op, change.word,
+                             change.source, change.changed_at] for change in changes],
+            })
+            after = changes[-1].seq
+            self.db.sync.mark_pushed(user_id, after, int(time.time()))
+            self.pushed += len(changes)
+            if len(changes) < self.batch_size:
+                return
+
+    def _pull(self, user_id, device_id):
+        """Merge other devices' changes after the pull cursor"""
+        after = self.db.sync.state(user_id).pulled
+        while True:
+            self._check_cancelled()
+            reply = self._request("GET", params={"after": after, "limit": self.batch_size,
+                                                 "device": device_id})
+            changes = reply["changes"]
+            if changes or reply["next"] > after:
+                self.applied += self.db.sync.merge(user_id, changes, reply["next"], int(time.time()))
+                self.pulled += len(changes)
+                after = reply["next"]
+            if not reply["more"]:
+                return
+
+    def _request(self, method, json=None, params=None):
+        headers = {"Accept-Encoding": CONTENT_ENCODING}
+        body = None
+        if json is not None:
+            body = encode(json)
+            headers.update({"Content-Type": CONTENT_TYPE, "Content-Encoding": CONTENT_ENCODING})
+        response = self._session.request(
+            method, self.server_url + changes_path(self.username), data=body, params=params,
+            headers=headers, timeout=self.timeout
+        )
+        response.raise_for_status()
+        # requests undoes the gzip Content-Encoding of the reply
+        return response.json()
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise SyncCancelled()
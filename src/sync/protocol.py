@@ -0,0 +1,49 @@
+"""
+History sync protocol for VocabLoury application
+
+Devices exchange history changes with a sync server over HTTP:
+
+``POST /v1/users/<username>/changes``
+    Body ``{"device": id, "changes": [change, ...]}``; the server stores
+    every change it has not seen and answers ``{"accepted": n}``.
+
+``GET /v1/users/<username>/changes?after=<seq>&limit=<n>&device=<id>``
+    Answers ``{"changes": [change, ...], "next": seq, "more": bool}`` with
+    the changes stored after ``seq`` by other devices. ``next`` is the
+    cursor for the following request.
+
+A change is ``[change_id, op, word, source, changed_at]`` where change_id
+is ``"<device id>:<local seq>"`` and op is a ``SYNC_OP_*`` code. Bodies in
+both directions are gzip-compressed JSON.
+"""
+
+import gzip
+import json
+from urllib.parse import quote
+
+PROTOCOL_VERSION = 1
+CONTENT_TYPE = "application/json"
+CONTENT_ENCODING = "gzip"
+
+
+def encode(payload):
+    """Compress a JSON payload for the wire"""
+    return gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode(body):
+    """Read a compressed JSON payload; raises ValueError when it is malformed"""
+    try:
+        return json.loads(gzip.decompress(body).decode("utf-8"))
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed sync payload: {e}") from e
+
+
+def changes_path(username):
+    """URL path of a user's change feed"""
+    return f"/v{PROTOCOL_VERSION}/users/{quote(username, safe='')}/changes"
+
+
+def change_id(device_id, seq):
+    """Globally unique id of a local change"""
+    return f"{device_id}:{seq}"
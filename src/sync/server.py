@@ -0,0 +1,198 @@
+"""
+Reference history sync server for VocabLoury
+
+Keeps every device's changes in an append-only SQLite log and serves them
+back in order, as described in ``src.sync.protocol``. A change pushed twice
+is stored once, and a pull only reads the rows after the caller's cursor,
+so each request costs in proportion to the changes it carries.
+
+There is no authentication: run it on a trusted network, or on localhost
+for testing.
+
+Usage:
+    python -m src.sync.server --port 8765 --db sync_server.db
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from config.settings import SYNC_BATCH_SIZE, SYNC_SERVER_PORT
+from src.sync.protocol import (
+    CONTENT_ENCODING, CONTENT_TYPE, PROTOCOL_VERSION, changes_path, decode, encode
+)
+
+MAX_BATCH_SIZE = 5000  # changes accepted or returned per request
+MAX_BODY_BYTES = 16 * 1024 * 1024  # compressed request bodies larger than this are refused
+
+
+class SyncStore:
+    """Append-only change log shared by every device"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    change_id TEXT NOT NULL UNIQUE,
+                    device TEXT NOT NULL,
+                    op INTEGER NOT NULL,
+                    word TEXT NOT NULL,
+                    source INTEGER NOT NULL,
+                    changed_at INTEGER NOT NULL
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_changes_user ON changes (username, seq)
+            ''')
+
+    def push(self, username, device, changes):
+        """Store changes not seen before; returns how many were new"""
+        rows = [(username, str(change_id), device, int(op), str(word), int(source), int(changed_at))
+                for change_id, op, word, source, changed_at in changes]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany('''
+                INSERT OR IGNORE INTO changes (username, change_id, device, op, word, source, changed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            return self._conn.total_changes - before
+
+    def pull(self, username, device, after, limit):
+        """(changes by other devices after seq `after`, next cursor, more to come)"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT seq, device, change_id, op, word, source, changed_at
+                FROM changes
+                WHERE username = ? AND seq > ?
+                ORDER BY seq
+                LIMIT ?
+            ''', (username, after, limit)).fetchall()
+        changes = [list(row[2:]) for row in rows if row[1] != device]
+        next_seq = rows[-1][0] if rows else after
+        return changes, next_seq, len(rows) == limit
+
+    def close(self):
+        self._conn.close()
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a SyncStore (set as the server's `store`)"""
+
+    protocol_version = "HTTP/1.1"
+    prefix = f"/v{PROTOCOL_VERSION}/users/"
+
+    def do_POST(self):
+        username = self._username()
+        if username is None:
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._error(413, "Request body too large")
+            return
+        try:
+            payload = decode(self.rfile.read(length))
+            changes = payload["changes"]
+            device = str(payload["device"])
+        except (ValueError, KeyError, TypeError) as e:
+            self._error(400, str(e))
+            return
+        if len(changes) > MAX_BATCH_SIZE:
+            self._error(413, f"At most {MAX_BATCH_SIZE} changes per request")
+            return
+        try:
+            accepted = self.server.store.push(username, device, changes)
+        except (ValueError, TypeError) as e:
+            self._error(400, f"Malformed change: {e}")
+            return
+        self._reply({"accepted": accepted})
+
+    def do_GET(self):
+        username = self._username()
+        if username is None:
+            return
+        query = parse_qs(urlsplit(self.path).query)
+        try:
+            after = int(query.get("after", ["0"])[0])
+            limit = min(int(query.get("limit", [str(SYNC_BATCH_SIZE)])[0]), MAX_BATCH_SIZE)
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+        device = query.get("device", [""])[0]
+        changes, next_seq, more = self.server.store.pull(username, device, after, max(limit, 1))
+        self._reply({"changes": changes, "next": next_seq, "more": more})
+
+    def _username(self):
+        """Username from a change feed path, or None after answering 404"""
+        path = urlsplit(self.path).path
+        if path.startswith(self.prefix) and path.endswith("/changes"):
+            username = unquote(path[len(self.prefix):-len("/changes")])
+            if username and changes_path(username) == path:
+                return username
+        self._error(404, "Not found")
+        return None
+
+    def _reply(self, payload, status=200):
+        body = encode(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Encoding", CONTENT_ENCODING)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._reply({"error": message}, status)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(db_file, host="127.0.0.1", port=SYNC_SERVER_PORT, verbose=False):
+    """Create (but do not start) a sync server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), SyncRequestHandler)
+    server.daemon_threads = True
+    server.store = SyncStore(db_file)
+    server.verbose = verbose
+    return server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the reference VocabLoury history sync server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SYNC_SERVER_PORT)
+    parser.add_argument("--db", default="sync_server.db", help="Change log file (default: %(default)s)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = make_server(args.db, args.host, args.port, args.verbose)
+    print(f"🔄 Sync server listening on http://{args.host}:{server.server_address[1]} ({args.db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
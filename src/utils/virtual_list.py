@@ -0,0 +1,427 @@
+"""
+Virtualized list for VocabLoury application
+
+A ``VirtualList`` shows a long list through a small pool of row widgets.
+Only the rows in view, plus a few above and below, exist at any time;
+scrolling rebinds the rows that leave the view to the items coming into it.
+Items are fetched a page at a time, on the shared task executor, as the
+view nears the end of what has been loaded, so building the list costs the
+same for ten items as for ten thousand and the widget count never grows
+with the list.
+"""
+
+import bisect
+import sys
+import tkinter as tk
+
+import customtkinter as ctk
+from config.settings import COLORS, THEME_MODE, VIRTUAL_LIST_OVERSCAN, VIRTUAL_LIST_SCROLL_STEP
+from src.controllers.task_executor import task_executor
+
+
+def resolve_color(color):
+    """A CTk (light, dark) color pair as the single color a tk widget takes"""
+    if isinstance(color, (tuple, list)):
+        return color[0] if ctk.get_appearance_mode() == "Light" else color[1]
+    return color
+
+
+class RowLayout:
+    """Vertical offsets of rows whose heights are estimated until measured"""
+
+    def __init__(self, estimate, spacing=0):
+        self.estimate = estimate
+        self.spacing = spacing
+        self.heights = []
+        self._offsets = [0]  # top of each row, then the total height
+        self._valid = 1  # offsets before this index are up to date
+
+    def __len__(self):
+        return len(self.heights)
+
+    def _update(self):
+        offsets = self._offsets
+        del offsets[self._valid:]
+        for index in range(self._valid - 1, len(self.heights)):
+            offsets.append(offsets[index] + self.heights[index] + self.spacing)
+        self._valid = len(offsets)
+
+    def _invalidate(self, index):
+        self._valid = min(self._valid, index + 1)
+
+    @property
+    def total(self):
+        self._update()
+        return self._offsets[-1]
+
+    def top(self, index):
+        self._update()
+        return self._offsets[index]
+
+    def insert(self, index, count):
+        """Add `count` rows of estimated height before row `index`"""
+        self.heights[index:index] = [self.estimate] * count
+        self._invalidate(index)
+
+    def keep(self, indices):
+        """Drop every row not in `indices` (ascending), keeping known heights"""
+        self.heights = [self.heights[index] for index in indices]
+        self._invalidate(0)
+
+    def set_height(self, index, height):
+        """Record a measured height; returns True when it changed"""
+        if self.heights[index] == height:
+            return False
+        self.heights[index] = height
+        self._invalidate(index)
+        return True
+
+    def visible(self, top, bottom):
+        """(first, end) indices of the rows overlapping the pixel range top..bottom"""
+        self._update()
+        count = len(self.heights)
+        first = min(max(bisect.bisect_right(self._offsets, top) - 1, 0), count)
+        end = min(bisect.bisect_left(self._offsets, bottom, first), count)
+        return first, max(end, first)
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that only keeps widgets for the rows in view
+
+    create_row(parent) builds an empty row widget and bind_row(row, item)
+    shows an item in it; a row is rebound many times, so bind_row must
+    replace everything the previous item showed. fetch_page(last_item, limit)
+    returns the items after last_item (None for the first page); fewer than
+    `limit` means the end was reached. It runs on a worker thread, so it must
+    not touch any widget. key(item) identifies an item for
+    remove(), prepend() and refresh(). Rows are measured after binding
+    unless measure_rows is False, in which case each is row_height tall.
+    """
+
+    def __init__(self, parent, create_row, bind_row, fetch_page=None, key=None, page_size=50,
+                 row_height=60, spacing=10, overscan=VIRTUAL_LIST_OVERSCAN, measure_rows=True,
+                 fg_color=None, **kwargs):
+        fg_color = fg_color or COLORS[THEME_MODE]["bg"]
+        super().__init__(parent, fg_color=fg_color, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.fetch_page = fetch_page
+        self.key = key or (lambda item: item)
+        self.page_size = page_size
+        self.overscan = overscan
+        self.measure_rows = measure_rows
+
+        self.items = []
+        self.exhausted = fetch_page is None
+        self.layout = RowLayout(row_height, spacing)
+        self._keys = set()
+        self._last_fetched = None  # last item of the last page, where the next page starts
+        self._loading = False  # a page request is in flight
+        self._rows = {}  # item index -> row widget showing it
+        self._free = []  # row widgets not showing anything
+        self._windows = {}  # row widget -> canvas window item
+        self._measure = set()  # indices whose row height must be (re)measured
+        self._render_job = None
+        self._rendering = False
+        self._render_again = False
+        self._scrollregion = None
+        self._width = 0
+
+        self.canvas = tk.Canvas(self, bg=resolve_color(fg_color), highlightthickness=0, borderwidth=0,
+                                yscrollincrement=VIRTUAL_LIST_SCROLL_STEP)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.canvas.bind("<Configure>", self.on_resize)
+
+        # Wheel events reach whichever row widget is under the pointer, so
+        # every widget in the list carries a shared bind tag
+        self.scroll_tag = f"VirtualList{id(self)}"
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind_class(self.scroll_tag, sequence, self.on_wheel)
+        self.bind_scroll(self.canvas)
+
+    def destroy(self):
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.unbind_class(self.scroll_tag, sequence)
+        super().destroy()
+
+    # Data
+
+    def reset(self, first_page=None):
+        """Drop every item and load the first page again (or show first_page, fetched by the caller)"""
+        self.items = []
+        self._keys = set()
+        self._last_fetched = None
+        # A page still on its way belongs to the old list
+        task_executor().cancel(self)
+        self._loading = False
+        self.layout.keep([])
+        self.exhausted = self.fetch_page is None
+        self._release_all()
+        self.canvas.yview_moveto(0)
+        if first_page is None:
+            self.load_more()
+        else:
+            self._add_page(first_page)
+        self.schedule_render()
+
+    def load_more(self):
+        """Request the next page in the background, unless one is already on its way"""
+        if self._loading or self.exhausted:
+            return
+        self._loading = True
+        task_executor().submit(
+            self.fetch_page, self._last_fetched, self.page_size, owner=self, key="page",
+            on_success=self._page_loaded, on_error=self._page_failed
+        )
+
+    def _page_loaded(self, page):
+        self._loading = False
+        if not self._add_page(page):
+            # Every item was already shown; keep going until one is new
+            self.load_more()
+        self.schedule_render()
+
+    def _page_failed(self, error):
+        self._loading = False
+        self.exhausted = True
+        print(f"Error loading list items: {error}")
+
+    def _add_page(self, page):
+        """Append a fetched page; returns how many of its items were new"""
+        self.exhausted = len(page) < self.page_size
+        if page:
+            self._last_fetched = page[-1]
+        added = 0
+        for item in page:
+            # Items moved to the top since the last page are already shown
+            key = self.key(item)
+            if key not in self._keys:
+                self._keys.add(key)
+                self.items.append(item)
+                added += 1
+        self.layout.insert(len(self.layout), added)
+        return added
+
+    def remove(self, keys):
+        """Remove the items with the given keys"""
+        keys = set(keys) & self._keys
+        if not keys:
+            return
+        kept = [index for index, item in enumerate(self.items) if self.key(item) not in keys]
+        self.items = [self.items[index] for index in kept]
+        self.layout.keep(kept)
+        self._keys -= keys
+        self._release_all()
+        self.schedule_render()
+
+    def prepend(self, items):
+        """Show items first, replacing the ones with the same keys"""
+        self.remove([self.key(item) for item in items])
+        self.items[0:0] = items
+        self._keys.update(self.key(item) for item in items)
+        self.layout.insert(0, len(items))
+        self._release_all()
+        self.schedule_render()
+
+    def refresh(self, keys=None):
+        """Rebind the shown rows (only those of the given keys) to their items"""
+        keys = None if keys is None else set(keys)
+        for index, row in self._rows.items():
+            if keys is None or self.key(self.items[index]) in keys:
+                self.bind_row(row, self.items[index])
+                self.bind_scroll(row)
+                self._measure.add(index)
+        self.schedule_render()
+
+    # Rendering
+
+    def schedule_render(self):
+        if self._rendering:
+            # Scroll events raised by the render itself; render once more after it
+            self._render_again = True
+        elif self._render_job is None:
+            self._render_job = self.after_idle(self.render)
+
+    def render(self):
+        """Bind rows to the items in view (plus overscan) and place them"""
+        self._render_job = None
+        self._rendering = True
+        try:
+            self._render()
+        finally:
+            self._rendering = False
+        if self._render_again:
+            self._render_again = False
+            self.schedule_render()
+
+    def _render(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            return  # not laid out yet; on_resize renders
+        top = self.canvas.canvasy(0)
+        first, end = self.layout.visible(top, top + height)
+        if end >= len(self.items) - self.overscan:
+            self.load_more()
+        anchor = first
+        first = max(first - self.overscan, 0)
+        end = min(end + self.overscan, len(self.items))
+
+        for index in [index for index in self._rows if not first <= index < end]:
+            self._release(index)
+        for index in range(first, end):
+            if index not in self._rows:
+                row = self._free.pop() if self._free else self._new_row()
+                self._rows[index] = row
+                self.bind_row(row, self.items[index])
+                self.bind_scroll(row)
+                self.canvas.itemconfigure(self._windows[row], state="normal")
+                self._measure.add(index)
+
+        anchor_top = self.layout.top(anchor)
+        if self._measure and self.measure_rows:
+            # One layout pass for every new row, then read their heights
+            self.canvas.update_idletasks()
+            for index in self._measure:
+                row = self._rows.get(index)
+                if row is not None:
+                    self.layout.set_height(index, row.winfo_reqheight())
+        self._measure = set()
+
+        for index, row in self._rows.items():
+            self.canvas.coords(self._windows[row], 0, self.layout.top(index))
+        total = self.layout.total
+        scrollregion = (0, 0, self._width, total)
+        if scrollregion != self._scrollregion:
+            self._scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+        # Keep the first visible row still when rows above it changed height
+        shift = self.layout.top(anchor) - anchor_top
+        if shift and total > height:
+            self.canvas.yview_moveto(max(top + shift, 0) / total)
+
+    def _new_row(self):
+        row = self.create_row(self.canvas)
+        self._windows[row] = self.canvas.create_window(0, 0, anchor="nw", window=row, width=self._width)
+        return row
+
+    def _release(self, index):
+        row = self._rows.pop(index)
+        self.canvas.itemconfigure(self._windows[row], state="hidden")
+        self._free.append(row)
+
+    def _release_all(self):
+        for index in list(self._rows):
+            self._release(index)
+        self._measure = set()
+
+    @property
+    def row_count(self):
+        """Row widgets created so far (bounded by the view, not the list)"""
+        return len(self._windows)
+
+    # Events
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_render()
+
+    def on_resize(self, event):
+        if event.width != self._width:
+            self._width = event.width
+            for window in self._windows.values():
+                self.canvas.itemconfigure(window, width=event.width)
+            # Text wraps differently at the new width
+            self._measure.update(self._rows)
+        self.schedule_render()
+
+    def on_wheel(self, event):
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -(event.delta // 120) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(steps, "units")
+
+    def bind_scroll(self, widget):
+        """Let the mouse wheel scroll the list over widget and its children"""
+        tags = widget.bindtags()
+        if self.scroll_tag not in tags:
+            widget.bindtags((self.scroll_tag,) + tags)
+        for child in widget.winfo_children():
+            self.bind_scroll(child)
+
+
+class VirtualGrid(VirtualList):
+    """Scrollable grid of equal cells that only keeps widgets for the rows in view
+
+    The number of columns follows the width of the grid. create_cell(parent)
+    builds an empty cell widget and bind_cell(cell, item) shows an item in
+    it; cells are reused for other items as the grid scrolls.
+    """
+
+    def __init__(self, parent, create_cell, bind_cell, cell_width=120, cell_height=40, gap=10,
+                 overscan=VIRTUAL_LIST_OVERSCAN, **kwargs):
+        self.create_cell = create_cell
+        self.bind_cell = bind_cell
+        self.cell_width = cell_width
+        self.gap = gap
+        self.cells = []
+        self.columns = 1
+        super().__init__(parent, create_row=self._create_grid_row, bind_row=self._bind_grid_row,
+                         key=lambda cells: cells.start, row_height=cell_height, spacing=gap,
+                         overscan=overscan, measure_rows=False, **kwargs)
+
+    def set_items(self, cells):
+        """Show a new list of items, from the top"""
+        self.cells = list(cells)
+        self.canvas.yview_moveto(0)
+        self._group(0)
+
+    def _group(self, first_cell):
+        """Split the items into rows of `columns` cells, keeping first_cell in view"""
+        self.items = [range(start, min(start + self.columns, len(self.cells)))
+                      for start in range(0, len(self.cells), self.columns)]
+        self._keys = {cells.start for cells in self.items}
+        self.layout.keep([])
+        self.layout.insert(0, len(self.items))
+        self._release_all()
+        self._scrollregion = None
+        total = self.layout.total
+        if first_cell and total:
+            self.canvas.yview_moveto(self.layout.top(first_cell // self.columns) / total)
+        self.schedule_render()
+
+    def _create_grid_row(self, parent):
+        row = ctk.CTkFrame(parent, fg_color="transparent", height=self.layout.estimate)
+        row.cells = []
+        return row
+
+    def _bind_grid_row(self, row, cells):
+        while len(row.cells) < len(cells):
+            cell = self.create_cell(row)
+            cell.grid(row=0, column=len(row.cells), padx=(0, self.gap), sticky="nw")
+            row.cells.append(cell)
+        for column, cell in enumerate(row.cells):
+            if column < len(cells):
+                self.bind_cell(cell, self.cells[cells[column]])
+                cell.grid()
+            else:
+                cell.grid_remove()
+
+    def on_resize(self, event):
+        columns = max(1, (event.width + self.gap) // (self.cell_width + self.gap))
+        if columns != self.columns:
+            first = self.layout.visible(self.canvas.canvasy(0), self.canvas.canvasy(0) + 1)[0]
+            first_cell = self.items[first].start if first < len(self.items) else 0
+            self.columns = columns
+            self._group(first_cell)
+        super().on_resize(event)
@@ -6,9 +6,9 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 import os
-from PIL import Image, ImageTk
+from PIL import Image
 
-from src.models.database import DatabaseManager
+from src.controllers.auth_worker import AuthWorker
 from src.utils.validation import FormValidator
 from src.utils.animations import AnimatedBackground, AnimatedButton, darken_color
 from src.utils.icons import Icons
@@ -21,22 +21,27 @@ class LoginPage(ctk.CTkFrame):
         self.pack(fill="both", expand=True)
         self.show_signup_callback = show_signup_callback
         self.validator = FormValidator()
+        self.auth_worker = AuthWorker(self)
         
-        # Check for remember me token
+        # Check for remember me token in the background
         token = self.load_remember_token()
         if token:
-            db = DatabaseManager()
-            success, username = db.verify_remember_token(token)
-            if success:
-                self.destroy()
-                from views.main_views import MainApplication
-                MainApplication(self.master, username)
-                return
-            else:
-                self.delete_remember_token()
+            self.auth_worker.check_token(token, self.on_token_checked,
+                                        on_error=lambda e: self.on_token_checked(False, None))
+            return
         
         self.create_login_ui()
     
+    def on_token_checked(self, success, username):
+        """Continue startup once the remember me token has been checked"""
+        if success:
+            self.destroy()
+            from src.views.main_views import MainApplication
+            MainApplication(self.master, username)
+        else:
+            self.delete_remember_token()
+            self.create_login_ui()
+    
     def create_login_ui(self):
         """Create the login UI"""
         # Create animated background
@@ -158,13 +163,13 @@ class LoginPage(ctk.CTkFrame):
         self.remember.pack(anchor="w")
         
         # Login button with animation
-        login_button = AnimatedButton(fields_frame, text="Login", height=42,
+        self.login_button = AnimatedButton(fields_frame, text="Login", height=42,
                                     corner_radius=8, 
                                     command=self.login,
                                     font=("Inter", 14, "bold"),
                                     fg_color=COLORS[THEME_MODE]["accent"],
                                     hover_color=darken_color(COLORS[THEME_MODE]["accent"]))
-        login_button.pack(fill="x", pady=(16, 20))
+        self.login_button.pack(fill="x", pady=(16, 20))
         
         # Signup link
         signup_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
@@ -311,47 +316,42 @@ class LoginPage(ctk.CTkFrame):
         # Show loading state
         self.show_loading_state()
         
-        try:
-            # Use existing db instance or create one
-            if not hasattr(self, 'db'):
-                self.db = DatabaseManager()
-            
-            success, user_id = self.db.verify_user(username, password)
+        # Hash and verify in the background so the window stays responsive
+        self.auth_worker.login(
+            username, password, bool(self.remember.get()),
+            lambda success, token: self.on_login_result(username, success, token),
+            on_error=self.on_login_error
+        )
+    
+    def on_login_result(self, username, success, token):
+        """Handle the result of a background login attempt"""
+        if success:
+            # Handle remember me
+            if token:
+                self.save_remember_token(token)
             
-            if success:
-                # Handle remember me
-                if self.remember.get():
-                    token = self.db.create_remember_token(user_id)
-                    if token:
-                        self.save_remember_token(token)
-                
-                # Quick transition to main app
-                self.destroy()
-                from views.main_views import MainApplication
-                MainApplication(self.master, username)
-            else:
-                self.hide_loading_state()
-                messagebox.showerror("Error", "Invalid username or password!")
-                
-        except Exception as e:
+            # Quick transition to main app
+            self.destroy()
+            from src.views.main_views import MainApplication
+            MainApplication(self.master, username)
+        else:
             self.hide_loading_state()
-            messagebox.showerror("Error", f"Login failed: {str(e)}")
+            messagebox.showerror("Error", "Invalid username or password!")
+    
+    def on_login_error(self, error):
+        """Handle an unexpected error during login"""
+        self.hide_loading_state()
+        messagebox.showerror("Error", f"Login failed: {str(error)}")
     
     def show_loading_state(self):
         """Show loading state during login"""
         # Disable login button and show loading
-        for widget in self.winfo_children():
-            if isinstance(widget, ctk.CTkButton) and "Login" in widget.cget("text"):
-                widget.configure(text="Logging in...", state="disabled")
-                break
+        self.login_button.configure(text="Logging in...", state="disabled")
     
     def hide_loading_state(self):
         """Hide loading state"""
         # Re-enable login button
-        for widget in self.winfo_children():
-            if isinstance(widget, ctk.CTkButton) and "Logging in" in widget.cget("text"):
-                widget.configure(text="Login", state="normal")
-                break
+        self.login_button.configure(text="Login", state="normal")
     
     def save_remember_token(self, token):
         """Save remember me token to a file"""
@@ -386,6 +386,7 @@ class SignupPage(ctk.CTkFrame):
         self.pack(fill="both", expand=True)
         self.show_login_callback = show_login_callback
         self.validator = FormValidator()
+        self.auth_worker = AuthWorker(self)
         
         self.create_signup_ui()
     
@@ -577,13 +578,13 @@ class SignupPage(ctk.CTkFrame):
         self.terms_checkbox.pack(anchor="w")
         
         # Sign up button with animation
-        signup_button = AnimatedButton(fields_frame, text="Create Account", height=45,
+        self.signup_button = AnimatedButton(fields_frame, text="Create Account", height=45,
                                      corner_radius=10, 
                                      command=self.signup,
                                      font=("Inter", 16, "bold"),
                                      fg_color=COLORS[THEME_MODE]["accent"],
                                      hover_color=darken_color(COLORS[THEME_MODE]["accent"]))
-        signup_button.pack(fill="x", pady=(20, 20))
+        self.signup_button.pack(fill="x", pady=(20, 20))
         
         # Login link
         login_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
@@ -784,39 +785,33 @@ class SignupPage(ctk.CTkFrame):
         # Show loading state
         self.show_signup_loading_state()
         
-        try:
-            # Use existing db instance or create one
-            if not hasattr(self, 'db'):
-                self.db = DatabaseManager()
-            
-            success, message = self.db.create_user(username, email, password, profession)
-            
-            if success:
-                messagebox.showinfo("Success", "Account created successfully!")
-                self.show_login_callback()
-            else:
-                self.hide_signup_loading_state()
-                messagebox.showerror("Error", message)
-                
-        except Exception as e:
+        # Hash the password in the background so the window stays responsive
+        self.auth_worker.signup(username, email, password, profession,
+                                self.on_signup_result, on_error=self.on_signup_error)
+    
+    def on_signup_result(self, success, message):
+        """Handle the result of a background signup attempt"""
+        if success:
+            messagebox.showinfo("Success", "Account created successfully!")
+            self.show_login_callback()
+        else:
             self.hide_signup_loading_state()
-            messagebox.showerror("Error", f"Registration failed: {str(e)}")
+            messagebox.showerror("Error", message)
+    
+    def on_signup_error(self, error):
+        """Handle an unexpected error during signup"""
+        self.hide_signup_loading_state()
+        messagebox.showerror("Error", f"Registration failed: {str(error)}")
     
     def show_signup_loading_state(self):
         """Show loading state during signup"""
         # Disable signup button and show loading
-        for widget in self.winfo_children():
-            if isinstance(widget, ctk.CTkButton) and "Create Account" in widget.cget("text"):
-                widget.configure(text="Creating Account...", state="disabled")
-                break
+        self.signup_button.configure(text="Creating Account...", state="disabled")
     
     def hide_signup_loading_state(self):
         """Hide loading state"""
         # Re-enable signup button
-        for widget in self.winfo_children():
-            if isinstance(widget, ctk.CTkButton) and "Creating Account" in widget.cget("text"):
-                widget.configure(text="Create Account", state="normal")
-                break
+        self.signup_button.configure(text="Create Account", state="normal")
     
     def clear_errors(self):
         """Clear all error messages and border colors"""
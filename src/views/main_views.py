@@ -5,11 +5,19 @@ Main application views for VocabLoury application
 import customtkinter as ctk
 from tkinter import messagebox
 import os
+from collections import OrderedDict
+from datetime import datetime
 
 from src.models.database import DatabaseManager
-from src.utils.icons import Icons
-from config.settings import COLORS, THEME_MODE
-from PIL import Image, ImageTk
+from src.models.events import HISTORY_ADDED, HISTORY_EVENTS, HISTORY_REMOVED
+from src.models.session import UserSession
+from src.controllers.task_executor import task_executor
+from src.utils.virtual_list import VirtualGrid, VirtualList
+from config.settings import (
+    COLORS, THEME_MODE, SAVED_WORDS_PAGE_SIZE, SEARCH_DEBOUNCE_MS, SYNC_INTERVAL_MS, SYNC_SERVER_URL,
+    PAGE_CACHE_SIZE, PAGE_PRELOAD, PAGE_PRELOAD_DELAY_MS, ALPHABET_SEARCH_LIMIT
+)
+from PIL import Image
 
 
 class MainApplication(ctk.CTkFrame):
@@ -21,12 +29,45 @@ class MainApplication(ctk.CTkFrame):
         self.username = username
         self.current_theme = THEME_MODE
         self.db = DatabaseManager()
+        # Account, preferences and stats shared by every page
+        self.session = UserSession(self.db, username)
+        # Change events reach subscribed pages on this (Tk) thread
+        self.db.events.attach(self)
+        
+        # Pages stay mounted after their first visit, least recently used first
+        self.pages = OrderedDict()
+        self.current_page = None
         
         # Create main layout
         self.create_layout()
         
         # Load initial page
         self.show_dashboard()
+        
+        # Build the pages likely to be opened next while the app is idle
+        self.after(PAGE_PRELOAD_DELAY_MS, self.preload_pages, list(PAGE_PRELOAD))
+        
+        # Make article text searchable once the first page is up
+        self.after(2000, self.index_articles)
+        
+        # Keep the history in step with the user's other machines
+        self.sync_client = None
+        if SYNC_SERVER_URL:
+            self.after(5000, self.sync_history)
+    
+    def sync_history(self):
+        """Sync the user's history in the background, then again every SYNC_INTERVAL_MS"""
+        if not (self.sync_client and self.sync_client.running):
+            from src.sync.client import SyncClient
+            self.sync_client = SyncClient(self.db, self.username, SYNC_SERVER_URL)
+            self.sync_client.start()
+        self.after(SYNC_INTERVAL_MS, self.sync_history)
+    
+    def index_articles(self):
+        """Refresh the article search index in the background (a no-op when nothing changed)"""
+        task_executor().submit(
+            self.db.sync_articles, ArticlesPage.get_articles_from_sources(), owner=self, key="articles"
+        )
     
     def create_layout(self):
         """Create the main application layout with sidebar"""
@@ -105,7 +146,7 @@ class MainApplication(ctk.CTkFrame):
         # User profession
         profession_label = ctk.CTkLabel(
             header_frame,
-            text="Student",  # This should be dynamic
+            text=self.session.profession,
             font=("Inter", 14),
             text_color=COLORS[self.current_theme]["text_secondary"]
         )
@@ -168,6 +209,7 @@ class MainApplication(ctk.CTkFrame):
         ctk.set_appearance_mode(self.current_theme)
         
         # Recreate the entire layout with new theme
+        self.clear_content()
         self.main_container.destroy()
         self.create_layout()
         
@@ -224,68 +266,137 @@ class MainApplication(ctk.CTkFrame):
         self.sidebar.configure(fg_color=COLORS[self.current_theme]["bg"])
         self.content_frame.configure(fg_color=COLORS[self.current_theme]["secondary_bg"])
         
-        # Refresh current page
-        if hasattr(self, 'current_page'):
-            self.current_page.destroy()
+        # Cached pages were drawn with the old colors
+        self.clear_content()
         self.show_dashboard()
     
     def clear_content(self):
-        """Clear the content area"""
+        """Clear the content area, evicting every cached page"""
+        while self.pages:
+            self.evict_page(next(iter(self.pages)))
+        self.current_page = None
         for widget in self.content_frame.winfo_children():
             widget.destroy()
     
+    def create_page(self, name):
+        """Build a page (the page packs itself into the content area)"""
+        if name == "dashboard":
+            return DashboardPage(self.content_frame, self.username, self.db, self.session)
+        if name == "profile":
+            return ProfilePage(self.content_frame, self.username, self.db, self.session)
+        if name == "dictionary":
+            return DictionaryPage(self.content_frame, self.username, self.db)
+        if name == "alphabet_search":
+            return AlphabetSearchPage(self.content_frame, self.username, self.db)
+        if name == "saved_words":
+            return SavedWordsPage(self.content_frame, self.username, self.db, self.session)
+        if name == "word_learning":
+            return WordLearningPage(self.content_frame, self.username, self.db, self.session)
+        if name == "notifications":
+            return NotificationsPage(self.content_frame, self.username, self.db)
+        if name == "tips":
+            return TipsPage(self.content_frame, self.username, self.db)
+        if name == "articles":
+            return ArticlesPage(self.content_frame, self.username, self.db)
+        raise ValueError(f"Unknown page: {name}")
+    
+    @staticmethod
+    def call_page_hook(page, hook):
+        """Call a page's on_show/on_hide/on_evict hook if it has one"""
+        method = getattr(page, hook, None)
+        if method is not None:
+            try:
+                method()
+            except Exception as e:
+                print(f"Page {hook} error: {e}")
+    
+    def show_page(self, name):
+        """Show a page, reusing its mounted instance when it is cached"""
+        page = self.pages.get(name)
+        if page is not None and page is self.current_page:
+            return
+        if self.current_page is not None:
+            self.current_page.pack_forget()
+            self.call_page_hook(self.current_page, "on_hide")
+        
+        if page is None:
+            page = self.create_page(name)
+        else:
+            page.pack(fill="both", expand=True)
+            self.call_page_hook(page, "on_show")
+        self.pages[name] = page
+        self.pages.move_to_end(name)
+        self.current_page = page
+        
+        # Drop the least recently used pages beyond the cache size
+        while len(self.pages) > PAGE_CACHE_SIZE:
+            self.evict_page(next(iter(self.pages)))
+    
+    def evict_page(self, name):
+        """Destroy a cached page"""
+        page = self.pages.pop(name)
+        self.call_page_hook(page, "on_evict")
+        page.destroy()
+    
+    def preload_pages(self, names):
+        """Build one likely next page per idle moment, while the cache has room"""
+        while names and names[0] in self.pages:
+            names.pop(0)
+        if not names or len(self.pages) >= PAGE_CACHE_SIZE:
+            return
+        name = names.pop(0)
+        page = self.create_page(name)
+        page.pack_forget()
+        self.call_page_hook(page, "on_hide")
+        # Preloaded pages are the first to go if the cache fills up
+        self.pages[name] = page
+        self.pages.move_to_end(name, last=False)
+        if names:
+            self.after_idle(self.preload_pages, names)
+    
     def show_dashboard(self):
         """Show dashboard page"""
-        self.clear_content()
-        self.current_page = DashboardPage(self.content_frame, self.username, self.db)
+        self.show_page("dashboard")
         self.current_page_method = self.show_dashboard
     
     def show_profile(self):
         """Show profile page"""
-        self.clear_content()
-        self.current_page = ProfilePage(self.content_frame, self.username, self.db)
+        self.show_page("profile")
         self.current_page_method = self.show_profile
     
     def show_dictionary(self):
         """Show dictionary page"""
-        self.clear_content()
-        self.current_page = DictionaryPage(self.content_frame, self.username, self.db)
+        self.show_page("dictionary")
         self.current_page_method = self.show_dictionary
     
     def show_alphabet_search(self):
         """Show alphabet search page"""
-        self.clear_content()
-        self.current_page = AlphabetSearchPage(self.content_frame, self.username, self.db)
+        self.show_page("alphabet_search")
         self.current_page_method = self.show_alphabet_search
     
     def show_saved_words(self):
         """Show saved words page"""
-        self.clear_content()
-        self.current_page = SavedWordsPage(self.content_frame, self.username, self.db)
+        self.show_page("saved_words")
         self.current_page_method = self.show_saved_words
     
     def show_word_learning(self):
         """Show word learning page"""
-        self.clear_content()
-        self.current_page = WordLearningPage(self.content_frame, self.username, self.db)
+        self.show_page("word_learning")
         self.current_page_method = self.show_word_learning
     
     def show_notifications(self):
         """Show notifications page"""
-        self.clear_content()
-        self.current_page = NotificationsPage(self.content_frame, self.username, self.db)
+        self.show_page("notifications")
         self.current_page_method = self.show_notifications
     
     def show_tips(self):
         """Show tips page"""
-        self.clear_content()
-        self.current_page = TipsPage(self.content_frame, self.username, self.db)
+        self.show_page("tips")
         self.current_page_method = self.show_tips
     
     def show_articles(self):
         """Show articles page"""
-        self.clear_content()
-        self.current_page = ArticlesPage(self.content_frame, self.username, self.db)
+        self.show_page("articles")
         self.current_page_method = self.show_articles
     
     def logout(self):
@@ -301,22 +412,33 @@ class MainApplication(ctk.CTkFrame):
             except Exception as e:
                 print(f"Error removing token: {e}")
             
+            # Stop background work and let cached pages clean up
+            if self.sync_client and self.sync_client.running:
+                self.sync_client.cancel()
+            self.clear_content()
+            self.session.close()
+            self.db.events.detach()
+            
+            # Write out any buffered history before leaving the session
+            self.db.close()
+            
             # Destroy the current page
             self.destroy()
             
             # Show login page
-            from views.auth_views import LoginPage
+            from src.views.auth_views import LoginPage
             LoginPage(self.master, lambda: None)
 
 
 class DashboardPage(ctk.CTkFrame):
     """Enhanced dashboard page with animations"""
     
-    def __init__(self, parent, username, db):
+    def __init__(self, parent, username, db, session):
         super().__init__(parent, fg_color="transparent")
         self.pack(fill="both", expand=True)
         self.username = username
         self.db = db
+        self.session = session
         
         # Get current theme from settings
         from config.settings import THEME_MODE
@@ -327,7 +449,58 @@ class DashboardPage(ctk.CTkFrame):
         self.dictionary_api = DictionaryAPI()
         
         # Create dashboard content
+        self.stats_value_labels = []
+        self.hidden = False
+        self.stats_stale = False
         self.create_dashboard()
+        self.load_stats()
+        
+        # Keep the stats cards current while the dashboard is shown
+        self.db.events.subscribe(HISTORY_EVENTS, self.on_history_changed, ui=True)
+    
+    def destroy(self):
+        self.db.events.unsubscribe(self.on_history_changed)
+        super().destroy()
+    
+    def on_history_changed(self, event):
+        """Refresh the stats card values (not the whole page) after history changes"""
+        if event.username not in (None, self.username):
+            return
+        # Loading stats waits for buffered history to be written, so a hidden
+        # dashboard only notes the change and reloads when it is shown
+        if self.hidden:
+            self.stats_stale = True
+        else:
+            self.load_stats()
+    
+    def load_stats(self):
+        """Load the stats card values in the background"""
+        self.stats_stale = False
+        task_executor().submit(self.stats_card_values, owner=self, key="stats", on_success=self.show_stats)
+    
+    def show_stats(self, values):
+        """Show loaded values on the stats cards"""
+        for label, value in zip(self.stats_value_labels, values):
+            label.configure(text=value)
+    
+    def stats_card_values(self):
+        """Values shown on the stats cards: searches, unique words, streak, progress (runs off the Tk thread)"""
+        try:
+            stats = self.session.stats
+            total_words = stats.total_searches
+            unique_words = stats.unique_words
+            
+            # Learning streak (days with at least one word)
+            learning_streak = self.session.active_days(30)
+            
+            # Progress percentage (based on unique words)
+            progress = min(100, (unique_words / 100) * 100)  # Assuming 100 words = 100% progress
+        except:
+            total_words = 0
+            unique_words = 0
+            learning_streak = 0
+            progress = 0
+        return [str(total_words), str(unique_words), f"{learning_streak} days", f"{progress:.0f}%"]
     
     def create_dashboard(self):
         """Create the dashboard content"""
@@ -398,11 +571,19 @@ class DashboardPage(ctk.CTkFrame):
         """Start the floating words animation"""
         self.floating_words = []
         self.current_word_index = 0
-        self.word_data = self.get_random_words()
-        self.animate_floating_word()
+        self.word_data = []
+        self.floating_job = None
+        # The words take many requests; the first one shows when they arrive
+        task_executor().submit(self.get_random_words, owner=self, on_success=self.on_random_words)
+    
+    def on_random_words(self, words):
+        """Start the floating words once they have been fetched"""
+        self.word_data = words
+        if self.floating_job is None and self.winfo_ismapped():
+            self.animate_floating_word()
     
     def get_random_words(self):
-        """Get random words for floating animation from multiple sources"""
+        """Get random words for floating animation from multiple sources (runs off the Tk thread)"""
         words = []
         
         # Get words from multiple topics
@@ -411,27 +592,31 @@ class DashboardPage(ctk.CTkFrame):
             "medicine", "philosophy", "literature", "psychology", "history", "mathematics"
         ]
         
+        topic_words = []
         for topic in topics:
             try:
-                topic_words = self.dictionary_api.get_words_by_topic(topic, 10)
-                for word in topic_words[:2]:  # Take 2 from each topic
-                    # Get definition for each word
-                    definition = self.dictionary_api.get_word_definition(word)
-                    if definition and 'meanings' in definition and definition['meanings']:
-                        meaning = definition['meanings'][0]
-                        if 'definitions' in meaning and meaning['definitions']:
-                            def_text = meaning['definitions'][0].get('definition', 'No definition available')
-                            words.append({
-                                'word': word, 
-                                'definition': def_text[:100] + "..." if len(def_text) > 100 else def_text
-                            })
-                    else:
-                        # Fallback meaning
-                        words.append({'word': word, 'definition': f'A word related to {topic}'})
+                for word in self.dictionary_api.get_words_by_topic(topic, 10)[:2]:  # Take 2 from each topic
+                    topic_words.append((word, topic))
             except Exception as e:
                 print(f"Error getting words for topic {topic}: {e}")
                 continue
         
+        # Get their definitions in parallel
+        definitions = self.dictionary_api.get_word_definitions(word for word, _ in topic_words)
+        for word, topic in topic_words:
+            definition = definitions.get(word)
+            if definition and 'meanings' in definition and definition['meanings']:
+                meaning = definition['meanings'][0]
+                if 'definitions' in meaning and meaning['definitions']:
+                    def_text = meaning['definitions'][0].get('definition', 'No definition available')
+                    words.append({
+                        'word': word, 
+                        'definition': def_text[:100] + "..." if len(def_text) > 100 else def_text
+                    })
+            else:
+                # Fallback meaning
+                words.append({'word': word, 'definition': f'A word related to {topic}'})
+        
         # If we don't have enough words from API, add some curated words
         if len(words) < 20:
             curated_words = [
@@ -500,60 +685,35 @@ class DashboardPage(ctk.CTkFrame):
         self.current_word_index += 1
         
         # Schedule next word (change every 4 seconds)
-        self.after(4000, self.animate_floating_word)
+        self.floating_job = self.after(4000, self.animate_floating_word)
+    
+    def on_show(self):
+        """Resume the floating words, and catch up on stats, when the cached page is shown again"""
+        self.hidden = False
+        if self.stats_stale:
+            self.load_stats()
+        if self.floating_job is None:
+            self.animate_floating_word()
+    
+    def on_hide(self):
+        """Pause the floating words while another page is shown"""
+        self.hidden = True
+        if self.floating_job is not None:
+            self.after_cancel(self.floating_job)
+            self.floating_job = None
     
     def create_enhanced_stats_cards(self, parent):
         """Create enhanced statistics cards with better data"""
         stats_frame = ctk.CTkFrame(parent, fg_color="transparent")
         stats_frame.pack(fill="x", padx=40, pady=30)
         
-        # Get user stats
-        try:
-            import sqlite3
-            conn = sqlite3.connect(self.db.db_file)
-            cursor = conn.cursor()
-            
-            # Total words searched
-            cursor.execute('SELECT COUNT(*) FROM word_history WHERE username = ?', (self.username,))
-            total_words = cursor.fetchone()[0]
-            
-            # Unique words
-            cursor.execute('SELECT COUNT(DISTINCT word) FROM word_history WHERE username = ?', (self.username,))
-            unique_words = cursor.fetchone()[0]
-            
-            # Learning streak (days with at least one word)
-            cursor.execute('''
-                SELECT COUNT(DISTINCT DATE(searched_at)) 
-                FROM word_history 
-                WHERE username = ? AND searched_at >= date('now', '-30 days')
-            ''', (self.username,))
-            learning_streak = cursor.fetchone()[0]
-            
-            # Progress percentage (based on unique words)
-            progress = min(100, (unique_words / 100) * 100)  # Assuming 100 words = 100% progress
-            
-            conn.close()
-        except:
-            total_words = 0
-            unique_words = 0
-            learning_streak = 0
-            progress = 0
-        
-        # Enhanced stats cards with professional colors
-        if self.current_theme == "dark":
-            cards_data = [
-                ("📖", "Total Searches", str(total_words), "#4CAF50"),
-                ("🔤", "Unique Words", str(unique_words), "#2196F3"),
-                ("🔥", "Learning Streak", f"{learning_streak} days", "#FF9800"),
-                ("📈", "Progress", f"{progress:.0f}%", "#9C27B0")
-            ]
-        else:
-            cards_data = [
-                ("📖", "Total Searches", str(total_words), "#4CAF50"),
-                ("🔤", "Unique Words", str(unique_words), "#2196F3"),
-                ("🔥", "Learning Streak", f"{learning_streak} days", "#FF9800"),
-                ("📈", "Progress", f"{progress:.0f}%", "#9C27B0")
-            ]
+        # Enhanced stats cards with professional colors (values arrive from load_stats)
+        cards_data = [
+            ("📖", "Total Searches", "...", "#4CAF50"),
+            ("🔤", "Unique Words", "...", "#2196F3"),
+            ("🔥", "Learning Streak", "...", "#FF9800"),
+            ("📈", "Progress", "...", "#9C27B0")
+        ]
         
         for i, (icon, title, value, color) in enumerate(cards_data):
             card = ctk.CTkFrame(
@@ -584,6 +744,7 @@ class DashboardPage(ctk.CTkFrame):
                 text_color=color
             )
             value_label.pack(pady=(0, 5))
+            self.stats_value_labels.append(value_label)
             
             title_label = ctk.CTkLabel(
                 card,
@@ -825,12 +986,7 @@ class DashboardPage(ctk.CTkFrame):
         
         # Get user stats
         try:
-            import sqlite3
-            conn = sqlite3.connect(self.db.db_file)
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM word_history WHERE username = ?', (self.username,))
-            word_count = cursor.fetchone()[0]
-            conn.close()
+            word_count = self.session.stats.total_searches
         except:
             word_count = 0
         
@@ -946,55 +1102,65 @@ class DashboardPage(ctk.CTkFrame):
 
 # Placeholder classes for other pages
 class ProfilePage(ctk.CTkFrame):
-    def __init__(self, parent, username, db):
+    def __init__(self, parent, username, db, session):
         super().__init__(parent, fg_color="transparent")
         self.pack(fill="both", expand=True)
         self.username = username
         self.db = db
+        self.session = session
         
         # Get current theme
         from config.settings import THEME_MODE
         self.current_theme = THEME_MODE
         
-        # Create profile content
+        # Create profile content once the account and stats have loaded
+        self.user_data = None
+        self.drawn = False
+        loading_label = ctk.CTkLabel(
+            self,
+            text="Loading profile...",
+            font=("Inter", 16),
+            text_color=COLORS[THEME_MODE]["text_secondary"]
+        )
+        loading_label.pack(expand=True)
+        self.load_profile()
+    
+    def on_show(self):
+        """Reload the cached profile in case the account or stats changed since it was drawn"""
+        self.load_profile()
+    
+    def load_profile(self):
+        """Load the user data in the background, then draw the profile"""
+        task_executor().submit(self.get_user_data, owner=self, key="profile", on_success=self.show_profile)
+    
+    def show_profile(self, user_data):
+        """Draw the profile, unless it already shows this data"""
+        if self.drawn and user_data == self.user_data:
+            return
+        for widget in self.winfo_children():
+            widget.destroy()
+        self.user_data = user_data
+        self.drawn = True
         self.create_profile()
     
     def get_user_data(self):
-        """Get real user data from database"""
+        """Get real user data from the session (runs off the Tk thread)"""
         try:
-            import sqlite3
-            conn = sqlite3.connect(self.db.db_file)
-            cursor = conn.cursor()
-            
-            # Get user info
-            cursor.execute('SELECT email, profession, created_at FROM accounts WHERE username = ?', (self.username,))
-            user_data = cursor.fetchone()
+            account = self.session.account
+            if account is None:
+                return None
             
             # Get learning stats
-            cursor.execute('SELECT COUNT(*) FROM word_history WHERE username = ?', (self.username,))
-            total_words = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(DISTINCT word) FROM word_history WHERE username = ?', (self.username,))
-            unique_words = cursor.fetchone()[0]
-            
-            # Get last activity
-            cursor.execute('SELECT MAX(timestamp) FROM word_history WHERE username = ?', (self.username,))
-            last_activity = cursor.fetchone()[0]
-            
-            conn.close()
-            
-            if user_data:
-                email, profession, created_at = user_data
-                return {
-                    'email': email,
-                    'profession': profession,
-                    'created_at': created_at,
-                    'total_words': total_words,
-                    'unique_words': unique_words,
-                    'last_activity': last_activity
-                }
-            else:
-                return None
+            stats = self.session.stats
+            
+            return {
+                'email': account.email,
+                'profession': account.profession,
+                'created_at': account.created_at,
+                'total_words': stats.total_searches,
+                'unique_words': stats.unique_words,
+                'last_activity': stats.last_activity
+            }
                 
         except Exception as e:
             print(f"Error getting user data: {e}")
@@ -1002,8 +1168,8 @@ class ProfilePage(ctk.CTkFrame):
     
     def create_profile(self):
         """Create the enhanced profile page content"""
-        # Get real user data
-        user_data = self.get_user_data()
+        # Real user data, loaded by load_profile
+        user_data = self.user_data
         
         # Create scrollable frame for profile content
         scrollable_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
@@ -1133,7 +1299,7 @@ class ProfilePage(ctk.CTkFrame):
         stats_data = [
             ("📖", "Total Words", str(user_data['total_words']) if user_data else "0", "#4CAF50"),
             ("🔤", "Unique Words", str(user_data['unique_words']) if user_data else "0", "#2196F3"),
-            ("📅", "Last Activity", user_data['last_activity'][:10] if user_data and user_data['last_activity'] else "Never", "#FF9800"),
+            ("📅", "Last Activity", f"{datetime.fromtimestamp(user_data['last_activity']):%Y-%m-%d}" if user_data and user_data['last_activity'] else "Never", "#FF9800"),
             ("⭐", "Learning Level", self.get_learning_level(user_data['total_words'] if user_data else 0), "#9C27B0")
         ]
         
@@ -1233,9 +1399,79 @@ class ProfilePage(ctk.CTkFrame):
         messagebox.showinfo("Privacy Settings", "Privacy settings will be available soon!")
     
     def export_user_data(self):
-        """Export user data"""
-        from tkinter import messagebox
-        messagebox.showinfo("Export Data", "Data export feature will be available soon!")
+        """Export user data to a CSV or JSON Lines file"""
+        from tkinter import filedialog
+        from src.models.exporter import UserExporter
+        
+        path = filedialog.asksaveasfilename(
+            title="Export Data",
+            initialfile=f"{self.username}_vocabloury.csv",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("Compressed CSV", "*.csv.gz"),
+                ("Compressed JSON Lines", "*.jsonl.gz")
+            ]
+        )
+        if not path:
+            return
+        
+        exporter = UserExporter(self.db, self.username, path)
+        self.show_export_progress(exporter)
+        # Dropped with the page if it is closed before the export starts; once
+        # running, closing the progress window cancels it
+        task_executor().submit(exporter.run, owner=self)
+    
+    def show_export_progress(self, exporter):
+        """Show a progress window for a running export"""
+        window = ctk.CTkToplevel(self)
+        window.title("📤 Export Data")
+        window.geometry("420x180")
+        window.configure(fg_color=COLORS[THEME_MODE]["bg"])
+        window.transient(self)
+        
+        status_label = ctk.CTkLabel(
+            window,
+            text="Exporting...",
+            font=("Inter", 14),
+            text_color=COLORS[THEME_MODE]["text"]
+        )
+        status_label.pack(pady=(25, 10))
+        
+        progress_bar = ctk.CTkProgressBar(window, width=340)
+        progress_bar.set(0)
+        progress_bar.pack(pady=10)
+        
+        cancel_btn = ctk.CTkButton(
+            window,
+            text="Cancel",
+            width=100,
+            fg_color="#FF5252",
+            hover_color="#D32F2F",
+            command=exporter.cancel
+        )
+        cancel_btn.pack(pady=10)
+        window.protocol("WM_DELETE_WINDOW", exporter.cancel)
+        
+        def poll():
+            if not window.winfo_exists():
+                exporter.cancel()
+                return
+            progress_bar.set(exporter.progress)
+            status_label.configure(text=f"Exported {exporter.rows_written:,} of {exporter.total_rows:,} searches")
+            if not exporter.finished.is_set():
+                window.after(100, poll)
+                return
+            
+            window.destroy()
+            from tkinter import messagebox
+            if exporter.error:
+                messagebox.showerror("Export Data", f"Export failed: {exporter.error}")
+            elif not exporter.cancelled:
+                messagebox.showinfo("Export Data", f"Your data was exported to:\n{exporter.path}")
+        
+        poll()
 
 class DictionaryPage(ctk.CTkFrame):
     def __init__(self, parent, username, db):
@@ -1245,7 +1481,7 @@ class DictionaryPage(ctk.CTkFrame):
         self.db = db
         
         # Import API
-        from api.dictionary_api import DictionaryAPI
+        from src.api.dictionary_api import DictionaryAPI
         self.dictionary_api = DictionaryAPI()
         
         # Create dictionary content
@@ -1325,19 +1561,33 @@ class DictionaryPage(ctk.CTkFrame):
             text_color=COLORS[THEME_MODE]["text_secondary"]
         )
         loading_label.pack(expand=True)
-        self.results_frame.update()
         
-        # Search for word definition
+        # Search for word definition in the background; a newer search replaces this one
+        task_executor().submit(
+            self.fetch_word, word, owner=self, key="search",
+            on_success=lambda result: self.show_search_result(word, *result),
+            on_error=lambda e: self.show_search_result(word, None, [], [])
+        )
+    
+    def fetch_word(self, word):
+        """(definition, synonyms, antonyms) of a word (runs off the Tk thread)"""
         definition_data = self.dictionary_api.get_word_definition(word)
-        
+        if not definition_data:
+            return None, [], []
+        return definition_data, self.dictionary_api.get_word_synonyms(word), self.dictionary_api.get_word_antonyms(word)
+    
+    def show_search_result(self, word, definition_data, synonyms, antonyms):
+        """Show a finished search"""
         if definition_data:
-            # Save to word history
-            self.db.word_history(self.username, word, "Searched")
+            # Save to word history, with the definition for offline use
+            self.db.word_history(self.username, word, "Searched", definition_data)
             
             # Display results
-            self.display_word_results(word, definition_data)
+            self.display_word_results(word, definition_data, synonyms, antonyms)
         else:
             # Show error
+            for widget in self.results_frame.winfo_children():
+                widget.destroy()
             error_label = ctk.CTkLabel(
                 self.results_frame,
                 text=f"Word '{word}' not found. Please check spelling and try again.",
@@ -1346,7 +1596,7 @@ class DictionaryPage(ctk.CTkFrame):
             )
             error_label.pack(expand=True)
     
-    def display_word_results(self, word, data):
+    def display_word_results(self, word, data, synonyms, antonyms):
         """Display word search results"""
         # Clear results
         for widget in self.results_frame.winfo_children():
@@ -1419,9 +1669,6 @@ class DictionaryPage(ctk.CTkFrame):
                             example_label.pack(anchor="w", padx=15, pady=(0, 10))
         
         # Synonyms and Antonyms
-        synonyms = self.dictionary_api.get_word_synonyms(word)
-        antonyms = self.dictionary_api.get_word_antonyms(word)
-        
         if synonyms or antonyms:
             # Synonyms
             if synonyms:
@@ -1461,7 +1708,7 @@ class AlphabetSearchPage(ctk.CTkFrame):
         self.db = db
         
         # Import API
-        from api.dictionary_api import DictionaryAPI
+        from src.api.dictionary_api import DictionaryAPI
         self.dictionary_api = DictionaryAPI()
         
         # Create alphabet search content
@@ -1512,6 +1759,21 @@ class AlphabetSearchPage(ctk.CTkFrame):
         self.results_frame = ctk.CTkFrame(self, fg_color=COLORS[THEME_MODE]["bg"], corner_radius=15)
         self.results_frame.pack(fill="both", expand=True, padx=40, pady=(0, 40))
         
+        # Results header and word grid, shown once a letter has results
+        self.results_header = ctk.CTkLabel(
+            self.results_frame,
+            text="",
+            font=("Inter", 24, "bold"),
+            text_color=COLORS[THEME_MODE]["accent"]
+        )
+        self.words_grid = VirtualGrid(
+            self.results_frame,
+            create_cell=self.create_word_cell,
+            bind_cell=self.bind_word_cell,
+            cell_width=120,
+            cell_height=40
+        )
+        
         # Results label
         self.results_label = ctk.CTkLabel(
             self.results_frame,
@@ -1521,11 +1783,18 @@ class AlphabetSearchPage(ctk.CTkFrame):
         )
         self.results_label.pack(expand=True)
     
+    def clear_results(self):
+        """Hide the word grid and drop any message shown instead"""
+        self.results_header.pack_forget()
+        self.words_grid.pack_forget()
+        for widget in self.results_frame.winfo_children():
+            if widget not in (self.results_header, self.words_grid):
+                widget.destroy()
+    
     def search_by_letter(self, letter):
         """Search for words starting with the selected letter"""
         # Clear previous results
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
+        self.clear_results()
         
         # Show loading
         loading_label = ctk.CTkLabel(
@@ -1535,16 +1804,23 @@ class AlphabetSearchPage(ctk.CTkFrame):
             text_color=COLORS[THEME_MODE]["text_secondary"]
         )
         loading_label.pack(expand=True)
-        self.results_frame.update()
-        
-        # Search for words
-        words = self.dictionary_api.get_words_by_alphabet(letter.lower(), 50)
         
+        # Search for words in the background; another letter replaces this search
+        task_executor().submit(
+            self.dictionary_api.get_words_by_alphabet, letter.lower(), ALPHABET_SEARCH_LIMIT,
+            owner=self, key="letter",
+            on_success=lambda words: self.show_letter_results(letter, words),
+            on_error=lambda e: self.show_letter_results(letter, [])
+        )
+    
+    def show_letter_results(self, letter, words):
+        """Show the words found for a letter"""
         if words:
             # Display results
             self.display_words_results(letter, words)
         else:
             # Show error
+            self.clear_results()
             error_label = ctk.CTkLabel(
                 self.results_frame,
                 text=f"No words found starting with '{letter}'",
@@ -1556,42 +1832,31 @@ class AlphabetSearchPage(ctk.CTkFrame):
     def display_words_results(self, letter, words):
         """Display words starting with the selected letter"""
         # Clear results
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
-        
-        # Create scrollable frame
-        scrollable_frame = ctk.CTkScrollableFrame(self.results_frame, fg_color="transparent")
-        scrollable_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.clear_results()
         
         # Header
-        header_label = ctk.CTkLabel(
-            scrollable_frame,
-            text=f"Words starting with '{letter.upper()}' ({len(words)} found)",
-            font=("Inter", 24, "bold"),
-            text_color=COLORS[THEME_MODE]["accent"]
-        )
-        header_label.pack(anchor="w", pady=(0, 20))
+        self.results_header.configure(text=f"Words starting with '{letter.upper()}' ({len(words)} found)")
+        self.results_header.pack(anchor="w", padx=20, pady=(20, 0))
         
-        # Words grid
-        words_frame = ctk.CTkFrame(scrollable_frame, fg_color="transparent")
-        words_frame.pack(fill="x")
-        
-        # Display words in a grid
-        for i, word in enumerate(words):
-            row = i // 4
-            col = i % 4
-            
-            word_btn = ctk.CTkButton(
-                words_frame,
-                text=word,
-                width=120,
-                height=40,
-                font=("Inter", 12),
-                fg_color=COLORS[THEME_MODE]["secondary_bg"],
-                hover_color=COLORS[THEME_MODE]["accent"],
-                command=lambda w=word: self.view_word_definition(w)
-            )
-            word_btn.grid(row=row, column=col, padx=5, pady=5)
+        # Words grid (buttons only for the rows in view)
+        self.words_grid.pack(fill="both", expand=True, padx=20, pady=20)
+        self.words_grid.set_items(words)
+    
+    def create_word_cell(self, parent):
+        """Create a word button for the results grid"""
+        return ctk.CTkButton(
+            parent,
+            text="",
+            width=120,
+            height=40,
+            font=("Inter", 12),
+            fg_color=COLORS[THEME_MODE]["secondary_bg"],
+            hover_color=COLORS[THEME_MODE]["accent"]
+        )
+    
+    def bind_word_cell(self, word_btn, word):
+        """Show a word in a (possibly reused) results button"""
+        word_btn.configure(text=word, command=lambda: self.view_word_definition(word))
     
     def view_word_definition(self, word):
         """View definition of a selected word"""
@@ -1603,14 +1868,92 @@ class AlphabetSearchPage(ctk.CTkFrame):
         messagebox.showinfo(f"Word: {word}", f"You selected: {word}\n\nThis would open the dictionary page to show the full definition.")
 
 class SavedWordsPage(ctk.CTkFrame):
-    def __init__(self, parent, username, db):
+    def __init__(self, parent, username, db, session):
         super().__init__(parent, fg_color="transparent")
         self.pack(fill="both", expand=True)
         self.username = username
         self.db = db
+        self.session = session
         
         # Create saved words content
+        self.expanded = {}  # word -> definition shown under its row
+        self.moved_words = set()  # searched words waiting to move to the top
+        self.hidden = False
+        self.stale = False
         self.create_saved_words()
+        
+        # Apply history changes to the list instead of reloading it
+        self.db.events.subscribe(HISTORY_EVENTS, self.on_history_changed, ui=True)
+    
+    def destroy(self):
+        self.db.events.unsubscribe(self.on_history_changed)
+        super().destroy()
+    
+    def on_history_changed(self, event):
+        """Update the shown list for words searched or removed elsewhere"""
+        if event.username not in (None, self.username) or self.search_input.get().strip():
+            return
+        # Reading the list waits for buffered history to be written, so a
+        # hidden page only notes the change and reloads when it is shown
+        if self.hidden:
+            self.stale = True
+        elif event.name == HISTORY_REMOVED:
+            self.remove_rows(event.data)
+        elif event.name == HISTORY_ADDED and self.word_list.items:
+            self.move_to_top(event.data)
+        else:
+            self.load_saved_words()
+    
+    def on_show(self):
+        """Catch up on history changes made while another page was shown"""
+        self.hidden = False
+        if self.stale:
+            self.load_saved_words()
+    
+    def on_hide(self):
+        self.hidden = True
+    
+    def remove_rows(self, words):
+        """Drop removed words from the list and update the count"""
+        self.word_list.remove(words)
+        for word in words:
+            self.expanded.pop(word, None)
+        if not self.word_list.items:
+            self.load_saved_words()
+        else:
+            self.update_header()
+    
+    def move_to_top(self, words):
+        """Show freshly searched words first, with their new counts"""
+        # The newest rows are exactly the words searched since the last move,
+        # so a newer event's fetch covers an older one it replaces
+        self.moved_words.update(words)
+        task_executor().submit(
+            self.fetch_newest_words, len(self.moved_words), owner=self, key="move_to_top",
+            on_success=self.show_newest_words
+        )
+    
+    def fetch_newest_words(self, count):
+        """The `count` most recently searched words and the word total (runs off the Tk thread)"""
+        return self.db.get_saved_words_page(self.username, limit=count), self.count_saved_words()
+    
+    def show_newest_words(self, result):
+        """Move fetched words to the top of the list"""
+        newest, total = result
+        self.moved_words = set()
+        self.word_list.prepend(newest)
+        self.show_header(total)
+    
+    def count_saved_words(self):
+        """Number of saved words, from the summary table (runs off the Tk thread)"""
+        return self.session.stats.unique_words
+    
+    def update_header(self):
+        """Load the current number of saved words in the background and show it in the list header"""
+        task_executor().submit(self.count_saved_words, owner=self, key="header", on_success=self.show_header)
+    
+    def show_header(self, total):
+        self.header_label.configure(text=f"Your Word History ({total} words)")
     
     def create_saved_words(self):
         """Create the saved words page content"""
@@ -1640,176 +1983,378 @@ class SavedWordsPage(ctk.CTkFrame):
         )
         refresh_btn.pack(anchor="e", pady=(0, 20))
         
+        # Full-text search over words, definitions and articles
+        self.search_input = ctk.CTkEntry(
+            header_frame,
+            placeholder_text="Search your words, their meanings and articles (e.g. short-lived)",
+            height=40,
+            font=("Inter", 14),
+            corner_radius=10
+        )
+        self.search_input.pack(fill="x")
+        self.search_input.bind("<KeyRelease>", self.schedule_search)
+        self.search_input.bind("<Return>", lambda event: self.run_search())
+        self.search_job = None
+        
         # Words list
         self.words_frame = ctk.CTkFrame(self, fg_color=COLORS[THEME_MODE]["bg"], corner_radius=15)
         self.words_frame.pack(fill="both", expand=True, padx=40, pady=(0, 40))
         
+        # Header (the total comes from the summary table, not a scan)
+        self.header_label = ctk.CTkLabel(
+            self.words_frame,
+            text="Your Word History",
+            font=("Inter", 20, "bold"),
+            text_color=COLORS[THEME_MODE]["accent"]
+        )
+        
+        # Only the rows in view have widgets; pages are fetched while scrolling
+        self.word_list = VirtualList(
+            self.words_frame,
+            create_row=self.create_word_row,
+            bind_row=self.bind_word_row,
+            fetch_page=self.fetch_words_page,
+            key=lambda saved_word: saved_word.word,
+            page_size=SAVED_WORDS_PAGE_SIZE,
+            row_height=120
+        )
+        
         # Load saved words
         self.load_saved_words()
     
-    def load_saved_words(self):
-        """Load and display saved words from database"""
-        # Clear previous content
+    def clear_words_frame(self):
+        """Hide the word list and drop any message or search results shown instead"""
+        self.header_label.pack_forget()
+        self.word_list.pack_forget()
         for widget in self.words_frame.winfo_children():
-            widget.destroy()
+            if widget not in (self.header_label, self.word_list):
+                widget.destroy()
+    
+    def schedule_search(self, event=None):
+        """Search once typing pauses"""
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.run_search)
+    
+    def run_search(self):
+        """Show full-text search results, or the word list when the box is empty"""
+        self.search_job = None
+        text = self.search_input.get().strip()
+        if not text:
+            self.load_saved_words()
+            return
         
-        try:
-            # Get word history from database
-            import sqlite3
-            import os
-            
-            # Get database path
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            db_file = os.path.join(base_dir, "authentication.db")
-            
-            conn = sqlite3.connect(db_file)
-            cursor = conn.cursor()
-            
-            # Get unique words searched by user
-            cursor.execute('''
-                SELECT DISTINCT word, COUNT(*) as search_count, MAX(searched_at) as last_searched
-                FROM word_history 
-                WHERE username = ? 
-                GROUP BY word 
-                ORDER BY last_searched DESC
-            ''', (self.username,))
-            
-            words_data = cursor.fetchall()
-            conn.close()
-            
-            if words_data:
-                # Create scrollable frame
-                scrollable_frame = ctk.CTkScrollableFrame(self.words_frame, fg_color="transparent")
-                scrollable_frame.pack(fill="both", expand=True, padx=20, pady=20)
-                
-                # Header
-                header_label = ctk.CTkLabel(
-                    scrollable_frame,
-                    text=f"Your Word History ({len(words_data)} words)",
-                    font=("Inter", 20, "bold"),
-                    text_color=COLORS[THEME_MODE]["accent"]
-                )
-                header_label.pack(anchor="w", pady=(0, 20))
-                
-                # Display words
-                for word, count, last_searched in words_data:
-                    word_frame = ctk.CTkFrame(scrollable_frame, fg_color=COLORS[THEME_MODE]["secondary_bg"], corner_radius=10)
-                    word_frame.pack(fill="x", pady=5)
-                    
-                    # Word content
-                    content_frame = ctk.CTkFrame(word_frame, fg_color="transparent")
-                    content_frame.pack(fill="x", padx=15, pady=10)
-                    
-                    # Word name
-                    word_label = ctk.CTkLabel(
-                        content_frame,
-                        text=word.upper(),
-                        font=("Inter", 18, "bold"),
-                        text_color=COLORS[THEME_MODE]["text"]
-                    )
-                    word_label.pack(anchor="w")
-                    
-                    # Search info
-                    info_label = ctk.CTkLabel(
-                        content_frame,
-                        text=f"Searched {count} time(s) • Last: {last_searched[:10]}",
-                        font=("Inter", 12),
-                        text_color=COLORS[THEME_MODE]["text_secondary"]
-                    )
-                    info_label.pack(anchor="w", pady=(5, 0))
-                    
-                    # Action buttons
-                    button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-                    button_frame.pack(anchor="e", pady=(10, 0))
-                    
-                    # View definition button
-                    view_btn = ctk.CTkButton(
-                        button_frame,
-                        text="View Definition",
-                        width=120,
-                        height=30,
-                        font=("Inter", 11),
-                        fg_color=COLORS[THEME_MODE]["accent"],
-                        hover_color=COLORS[THEME_MODE]["accent"],
-                        command=lambda w=word: self.view_word_definition(w)
-                    )
-                    view_btn.pack(side="right", padx=(5, 0))
-                    
-                    # Remove button
-                    remove_btn = ctk.CTkButton(
-                        button_frame,
-                        text="Remove",
-                        width=80,
-                        height=30,
-                        font=("Inter", 11),
-                        fg_color="#FF5252",
-                        hover_color="#D32F2F",
-                        command=lambda w=word: self.remove_word(w)
-                    )
-                    remove_btn.pack(side="right")
-            else:
-                # No words found
-                no_words_label = ctk.CTkLabel(
-                    self.words_frame,
-                    text="No words in your history yet.\nStart searching for words to see them here!",
-                    font=("Inter", 16),
-                    text_color=COLORS[THEME_MODE]["text_secondary"]
-                )
-                no_words_label.pack(expand=True)
-                
-        except Exception as e:
-            # Error loading words
-            error_label = ctk.CTkLabel(
+        # Shares its key with loading the list, so whichever was asked for last is shown
+        task_executor().submit(
+            self.db.search, self.username, text, owner=self, key="results",
+            on_success=lambda results: self.show_search_results(text, results)
+        )
+    
+    def show_search_results(self, text, results):
+        """Show full-text search results in place of the word list"""
+        self.clear_words_frame()
+        results_list = ctk.CTkScrollableFrame(self.words_frame, fg_color="transparent")
+        results_list.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        sections = [
+            ("word", "Words you looked up"),
+            ("definition", "Meanings of your words"),
+            ("article", "Articles")
+        ]
+        found = False
+        for kind, heading in sections:
+            if not results[kind]:
+                continue
+            found = True
+            heading_label = ctk.CTkLabel(
+                results_list,
+                text=heading,
+                font=("Inter", 18, "bold"),
+                text_color=COLORS[THEME_MODE]["accent"]
+            )
+            heading_label.pack(anchor="w", pady=(10, 5))
+            for result in results[kind]:
+                self.create_search_result_row(results_list, result)
+        
+        if not found:
+            no_results_label = ctk.CTkLabel(
+                results_list,
+                text=f"Nothing matches \"{text}\"",
+                font=("Inter", 16),
+                text_color=COLORS[THEME_MODE]["text_secondary"]
+            )
+            no_results_label.pack(pady=40)
+    
+    def create_search_result_row(self, parent, result):
+        """Create the widgets for one search result"""
+        result_frame = ctk.CTkFrame(parent, fg_color=COLORS[THEME_MODE]["secondary_bg"], corner_radius=10)
+        result_frame.pack(fill="x", pady=4)
+        
+        title_label = ctk.CTkLabel(
+            result_frame,
+            text=result.title.upper() if result.kind != "article" else result.title,
+            font=("Inter", 16, "bold"),
+            text_color=COLORS[THEME_MODE]["text"]
+        )
+        title_label.pack(anchor="w", padx=15, pady=(10, 0))
+        
+        if result.kind != "word":
+            snippet_label = ctk.CTkLabel(
+                result_frame,
+                text=result.snippet,
+                font=("Inter", 12),
+                text_color=COLORS[THEME_MODE]["text_secondary"],
+                wraplength=700,
+                justify="left"
+            )
+            snippet_label.pack(anchor="w", padx=15, pady=(2, 10))
+        else:
+            title_label.pack_configure(pady=10)
+    
+    def load_saved_words(self):
+        """Load the first page of saved words in the background, then display it"""
+        self.stale = False
+        # Shares its key with searches, so whichever was asked for last is shown
+        task_executor().submit(
+            self.fetch_first_page, owner=self, key="results",
+            on_success=self.show_saved_words, on_error=self.show_load_error
+        )
+    
+    def fetch_first_page(self):
+        """The first page of saved words and the word total (runs off the Tk thread)"""
+        return self.fetch_words_page(None, SAVED_WORDS_PAGE_SIZE), self.count_saved_words()
+    
+    def show_saved_words(self, result):
+        """Display a freshly loaded first page of saved words"""
+        first_page, total = result
+        
+        # Clear previous content
+        self.clear_words_frame()
+        self.expanded = {}
+        self.moved_words = set()
+        self.word_list.reset(first_page)
+        
+        if self.word_list.items:
+            self.show_header(total)
+            self.header_label.pack(anchor="w", padx=20, pady=(20, 0))
+            self.word_list.pack(fill="both", expand=True, padx=20, pady=20)
+        else:
+            # No words found
+            no_words_label = ctk.CTkLabel(
                 self.words_frame,
-                text=f"Error loading words: {str(e)}",
+                text="No words in your history yet.\nStart searching for words to see them here!",
                 font=("Inter", 16),
-                text_color="#FF5252"
+                text_color=COLORS[THEME_MODE]["text_secondary"]
             )
-            error_label.pack(expand=True)
+            no_words_label.pack(expand=True)
+    
+    def show_load_error(self, error):
+        """Show why the saved words could not be loaded"""
+        self.clear_words_frame()
+        error_label = ctk.CTkLabel(
+            self.words_frame,
+            text=f"Error loading words: {str(error)}",
+            font=("Inter", 16),
+            text_color="#FF5252"
+        )
+        error_label.pack(expand=True)
+    
+    def fetch_words_page(self, after, limit):
+        """The page of saved words after the word `after` (the first page for None)"""
+        return self.db.get_saved_words_page(self.username, limit=limit, after=after.cursor if after else None)
+    
+    def create_word_row(self, parent):
+        """Create the widgets of a saved word row; bind_word_row fills them in"""
+        word_frame = ctk.CTkFrame(parent, fg_color=COLORS[THEME_MODE]["secondary_bg"], corner_radius=10)
+        word_frame.saved_word = None
+        
+        # Word content
+        content_frame = ctk.CTkFrame(word_frame, fg_color="transparent")
+        content_frame.pack(fill="x", padx=15, pady=10)
+        
+        # Word name
+        word_frame.word_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=("Inter", 18, "bold"),
+            text_color=COLORS[THEME_MODE]["text"]
+        )
+        word_frame.word_label.pack(anchor="w")
+        
+        # Definition snapshot stored with the history, no API call needed
+        word_frame.snapshot_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=("Inter", 13),
+            text_color=COLORS[THEME_MODE]["text"],
+            wraplength=700,
+            justify="left"
+        )
+        
+        # Search info
+        word_frame.info_label = ctk.CTkLabel(
+            content_frame,
+            text="",
+            font=("Inter", 12),
+            text_color=COLORS[THEME_MODE]["text_secondary"]
+        )
+        word_frame.info_label.pack(anchor="w", pady=(5, 0))
+        
+        # Action buttons
+        button_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        button_frame.pack(anchor="e", pady=(10, 0))
+        
+        # View definition button (expands the full definition in place)
+        word_frame.view_btn = ctk.CTkButton(
+            button_frame,
+            text="View Definition",
+            width=120,
+            height=30,
+            font=("Inter", 11),
+            fg_color=COLORS[THEME_MODE]["accent"],
+            hover_color=COLORS[THEME_MODE]["accent"],
+            command=lambda: self.view_word_definition(word_frame.saved_word.word)
+        )
+        word_frame.view_btn.pack(side="right", padx=(5, 0))
+        
+        # Remove button
+        remove_btn = ctk.CTkButton(
+            button_frame,
+            text="Remove",
+            width=80,
+            height=30,
+            font=("Inter", 11),
+            fg_color="#FF5252",
+            hover_color="#D32F2F",
+            command=lambda: self.remove_word(word_frame.saved_word.word)
+        )
+        remove_btn.pack(side="right")
+        
+        # Full definition, shown when expanded
+        word_frame.definition_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+        return word_frame
+    
+    def bind_word_row(self, word_frame, saved_word):
+        """Show a saved word in a (possibly reused) row"""
+        word = saved_word.word
+        word_frame.saved_word = saved_word
+        word_frame.word_label.configure(text=word.upper())
+        
+        if saved_word.summary:
+            details = " • ".join(part for part in (saved_word.phonetic, saved_word.part_of_speech) if part)
+            word_frame.snapshot_label.configure(
+                text=f"{details}\n{saved_word.summary}" if details else saved_word.summary
+            )
+            word_frame.snapshot_label.pack(anchor="w", pady=(5, 0), before=word_frame.info_label)
+        else:
+            word_frame.snapshot_label.pack_forget()
+        
+        word_frame.info_label.configure(
+            text=f"Searched {saved_word.search_count} time(s) • Last: {datetime.fromtimestamp(saved_word.last_searched):%Y-%m-%d}"
+        )
+        
+        definition_frame = word_frame.definition_frame
+        for widget in definition_frame.winfo_children():
+            widget.destroy()
+        if word in self.expanded:
+            word_frame.view_btn.configure(text="Hide Definition")
+            self.show_definition(definition_frame, self.expanded[word])
+            definition_frame.pack(fill="x", pady=(10, 0))
+        else:
+            word_frame.view_btn.configure(text="View Definition")
+            definition_frame.pack_forget()
     
     def view_word_definition(self, word):
-        """View definition of a selected word"""
-        from tkinter import messagebox
-        messagebox.showinfo(f"Word: {word}", f"You selected: {word}\n\nThis would open the dictionary page to show the full definition.")
+        """Show or hide the full definition of a saved word"""
+        if word in self.expanded:
+            del self.expanded[word]
+            self.word_list.refresh([word])
+            return
+        
+        task_executor().submit(
+            self.fetch_definition, word, owner=self, key=("definition", word),
+            on_success=lambda definition_data: self.expand_word(word, definition_data),
+            on_error=lambda e: self.expand_word(word, None)
+        )
+    
+    def fetch_definition(self, word):
+        """Get a word's definition from the cache, or request and cache it (runs off the Tk thread)"""
+        # Cached with the history; only words saved before that need a request
+        cached = self.db.get_cached_definitions([word])
+        if word in cached:
+            return cached[word]
+        from src.api.dictionary_api import DictionaryAPI
+        definition_data = DictionaryAPI.get_word_definition(word)
+        if definition_data:
+            self.db.cache_definitions({word: definition_data})
+        return definition_data
+    
+    def expand_word(self, word, definition_data):
+        """Show a word's definition under its row"""
+        self.expanded[word] = definition_data
+        self.word_list.refresh([word])
+    
+    def show_definition(self, definition_frame, definition_data):
+        """Fill an expanded row with a word's meanings"""
+        if not definition_data:
+            ctk.CTkLabel(
+                definition_frame,
+                text="No definition available for this word.",
+                font=("Inter", 12),
+                text_color=COLORS[THEME_MODE]["text_secondary"]
+            ).pack(anchor="w")
+            return
+        
+        for meaning in definition_data.get('meanings', []):
+            ctk.CTkLabel(
+                definition_frame,
+                text=meaning.get('partOfSpeech', '').title(),
+                font=("Inter", 13, "bold"),
+                text_color=COLORS[THEME_MODE]["accent"]
+            ).pack(anchor="w", pady=(5, 0))
+            for number, sense in enumerate(meaning.get('definitions', [])[:3], 1):
+                text = f"{number}. {sense.get('definition', '')}"
+                if sense.get('example'):
+                    text += f"\n   Example: {sense['example']}"
+                ctk.CTkLabel(
+                    definition_frame,
+                    text=text,
+                    font=("Inter", 12),
+                    text_color=COLORS[THEME_MODE]["text"],
+                    wraplength=700,
+                    justify="left"
+                ).pack(anchor="w", padx=(10, 0))
     
     def remove_word(self, word):
-        """Remove a word from history"""
-        try:
-            import sqlite3
-            import os
-            
-            # Get database path
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            db_file = os.path.join(base_dir, "authentication.db")
-            
-            conn = sqlite3.connect(db_file)
-            cursor = conn.cursor()
-            
-            # Remove word from history
-            cursor.execute('DELETE FROM word_history WHERE username = ? AND word = ?', (self.username, word))
-            conn.commit()
-            conn.close()
-            
-            # Refresh the display
-            self.load_saved_words()
-            
-        except Exception as e:
+        """Remove a word from history in the background"""
+        task_executor().submit(
+            self.db.remove_saved_word, self.username, word, owner=self, key=("remove", word),
+            on_success=lambda removed: self.word_removed(word, removed)
+        )
+    
+    def word_removed(self, word, removed):
+        """Update the list once a word has been removed"""
+        if removed:
+            # Drop just this word; the change event finds it already gone
+            self.remove_rows([word])
+        else:
             from tkinter import messagebox
-            messagebox.showerror("Error", f"Failed to remove word: {str(e)}")
+            messagebox.showerror("Error", f"Failed to remove word: {word}")
 
 class WordLearningPage(ctk.CTkFrame):
-    def __init__(self, parent, username, db):
+    def __init__(self, parent, username, db, session):
         super().__init__(parent, fg_color="transparent")
         self.pack(fill="both", expand=True)
         self.username = username
         self.db = db
+        self.session = session
         
         # Import API
-        from api.dictionary_api import DictionaryAPI
+        from src.api.dictionary_api import DictionaryAPI
         self.dictionary_api = DictionaryAPI()
         
         # Get user profession
-        self.profession = self.db.get_profession(username) or "Student"
+        self.profession = self.session.profession
         
         # Create word learning content
         self.create_word_learning()
@@ -1859,14 +2404,44 @@ class WordLearningPage(ctk.CTkFrame):
         self.learning_frame = ctk.CTkFrame(self, fg_color=COLORS[THEME_MODE]["bg"], corner_radius=15)
         self.learning_frame.pack(fill="both", expand=True, padx=40, pady=(0, 40))
         
+        # Words header, instructions and grid, shown once words are generated
+        self.words_header = ctk.CTkLabel(
+            self.learning_frame,
+            text="",
+            font=("Inter", 20, "bold"),
+            text_color=COLORS[THEME_MODE]["accent"]
+        )
+        self.instructions_label = ctk.CTkLabel(
+            self.learning_frame,
+            text="Click on any word to learn its definition and add it to your vocabulary!",
+            font=("Inter", 14),
+            text_color=COLORS[THEME_MODE]["text_secondary"]
+        )
+        self.words_grid = VirtualGrid(
+            self.learning_frame,
+            create_cell=self.create_word_cell,
+            bind_cell=self.bind_word_cell,
+            cell_width=150,
+            cell_height=50,
+            gap=20
+        )
+        
         # Initial content
         self.show_initial_content()
     
+    def clear_learning_frame(self):
+        """Hide the word grid and drop any message shown instead"""
+        persistent = (self.words_header, self.instructions_label, self.words_grid)
+        for widget in persistent:
+            widget.pack_forget()
+        for widget in self.learning_frame.winfo_children():
+            if widget not in persistent:
+                widget.destroy()
+    
     def show_initial_content(self):
         """Show initial learning content"""
         # Clear previous content
-        for widget in self.learning_frame.winfo_children():
-            widget.destroy()
+        self.clear_learning_frame()
         
         # Welcome message
         welcome_label = ctk.CTkLabel(
@@ -1881,8 +2456,7 @@ class WordLearningPage(ctk.CTkFrame):
     def generate_profession_words(self):
         """Generate words based on user's profession"""
         # Clear previous content
-        for widget in self.learning_frame.winfo_children():
-            widget.destroy()
+        self.clear_learning_frame()
         
         # Show loading
         loading_label = ctk.CTkLabel(
@@ -1892,11 +2466,18 @@ class WordLearningPage(ctk.CTkFrame):
             text_color=COLORS[THEME_MODE]["text_secondary"]
         )
         loading_label.pack(expand=True)
-        self.learning_frame.update()
         
         # Get profession-specific topics
         topics = self.get_profession_topics()
         
+        # Fetch the words in the background; pressing the button again replaces this
+        task_executor().submit(
+            self.fetch_profession_words, topics, owner=self, key="generate",
+            on_success=self.show_profession_words, on_error=lambda e: self.show_profession_words([])
+        )
+    
+    def fetch_profession_words(self, topics):
+        """Words for the given topics (runs off the Tk thread)"""
         # Generate words for each topic
         all_words = []
         for topic in topics:
@@ -1904,11 +2485,14 @@ class WordLearningPage(ctk.CTkFrame):
             all_words.extend(words[:5])  # Take first 5 words from each topic
         
         # Remove duplicates and limit to 20 words
-        unique_words = list(set(all_words))[:20]
-        
+        return list(set(all_words))[:20]
+    
+    def show_profession_words(self, unique_words):
+        """Show the generated words, or an error when there are none"""
         if unique_words:
             self.display_learning_words(unique_words)
         else:
+            self.clear_learning_frame()
             self.show_error_message()
     
     def get_profession_topics(self):
@@ -1927,59 +2511,48 @@ class WordLearningPage(ctk.CTkFrame):
     def display_learning_words(self, words):
         """Display words for learning"""
         # Clear previous content
-        for widget in self.learning_frame.winfo_children():
-            widget.destroy()
-        
-        # Create scrollable frame
-        scrollable_frame = ctk.CTkScrollableFrame(self.learning_frame, fg_color="transparent")
-        scrollable_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.clear_learning_frame()
         
         # Header
-        header_label = ctk.CTkLabel(
-            scrollable_frame,
-            text=f"Words for {self.profession}s ({len(words)} words)",
-            font=("Inter", 20, "bold"),
-            text_color=COLORS[THEME_MODE]["accent"]
-        )
-        header_label.pack(anchor="w", pady=(0, 20))
+        self.words_header.configure(text=f"Words for {self.profession}s ({len(words)} words)")
+        self.words_header.pack(anchor="w", padx=20, pady=(20, 0))
         
         # Instructions
-        instructions_label = ctk.CTkLabel(
-            scrollable_frame,
-            text="Click on any word to learn its definition and add it to your vocabulary!",
-            font=("Inter", 14),
-            text_color=COLORS[THEME_MODE]["text_secondary"]
-        )
-        instructions_label.pack(anchor="w", pady=(0, 20))
-        
-        # Words grid
-        words_frame = ctk.CTkFrame(scrollable_frame, fg_color="transparent")
-        words_frame.pack(fill="x")
+        self.instructions_label.pack(anchor="w", padx=20, pady=(10, 0))
         
-        # Display words in a grid
-        for i, word in enumerate(words):
-            row = i // 3
-            col = i % 3
-            
-            word_btn = ctk.CTkButton(
-                words_frame,
-                text=word,
-                width=150,
-                height=50,
-                font=("Inter", 14, "bold"),
-                fg_color=COLORS[THEME_MODE]["secondary_bg"],
-                hover_color=COLORS[THEME_MODE]["accent"],
-                command=lambda w=word: self.learn_word(w)
-            )
-            word_btn.grid(row=row, column=col, padx=10, pady=10)
+        # Words grid (buttons only for the rows in view)
+        self.words_grid.pack(fill="both", expand=True, padx=20, pady=20)
+        self.words_grid.set_items(words)
+    
+    def create_word_cell(self, parent):
+        """Create a word button for the learning grid"""
+        return ctk.CTkButton(
+            parent,
+            text="",
+            width=150,
+            height=50,
+            font=("Inter", 14, "bold"),
+            fg_color=COLORS[THEME_MODE]["secondary_bg"],
+            hover_color=COLORS[THEME_MODE]["accent"]
+        )
+    
+    def bind_word_cell(self, word_btn, word):
+        """Show a word in a (possibly reused) learning button"""
+        word_btn.configure(text=word, command=lambda: self.learn_word(word))
     
     def learn_word(self, word):
         """Learn a specific word"""
-        # Save to word history
-        self.db.word_history(self.username, word, f"Learning - {self.profession}")
-        
-        # Get word definition
-        definition_data = self.dictionary_api.get_word_definition(word)
+        # Get word definition in the background
+        task_executor().submit(
+            self.dictionary_api.get_word_definition, word, owner=self,
+            on_success=lambda definition_data: self.show_learned_word(word, definition_data),
+            on_error=lambda e: self.show_learned_word(word, None)
+        )
+    
+    def show_learned_word(self, word, definition_data):
+        """Save a learned word and show what it means"""
+        # Save to word history, with the definition for offline use
+        self.db.word_history(self.username, word, f"Learning - {self.profession}", definition_data)
         
         if definition_data:
             # Show word definition in a dialog
@@ -2017,6 +2590,20 @@ class WordLearningPage(ctk.CTkFrame):
         error_label.pack(expand=True)
 
 
+def show_system_notification(message):
+    """Show a reminder through the system; returns False when there is no way to (runs off the Tk thread)"""
+    # macOS notification center; other systems fall back to a dialog
+    import subprocess
+    try:
+        subprocess.run([
+            "osascript", "-e",
+            f'display notification "{message}" with title "VocabLoury Reminder"'
+        ], check=False)
+        return True
+    except OSError:
+        return False
+
+
 class NotificationsPage(ctk.CTkFrame):
     """Notifications page with reading reminders"""
     
@@ -2032,7 +2619,7 @@ class NotificationsPage(ctk.CTkFrame):
         
         # Notification settings
         self.notification_active = False
-        self.notification_thread = None
+        self.notification_job = None
         
         # Create notifications content
         self.create_notifications()
@@ -2192,6 +2779,10 @@ class NotificationsPage(ctk.CTkFrame):
         for item in sample_history:
             self.history_listbox.insert("end", item + "\n")
     
+    def on_evict(self):
+        """Stop the reminders when the page is dropped from the cache"""
+        self.stop_notifications()
+    
     def toggle_notifications(self):
         """Toggle notification system"""
         if self.notification_switch.get():
@@ -2202,60 +2793,57 @@ class NotificationsPage(ctk.CTkFrame):
     def start_notifications(self):
         """Start notification system"""
         self.notification_active = True
-        import threading
-        self.notification_thread = threading.Thread(target=self.notification_loop, daemon=True)
-        self.notification_thread.start()
+        self.schedule_notification()
     
     def stop_notifications(self):
         """Stop notification system"""
         self.notification_active = False
-        if self.notification_thread:
-            self.notification_thread.join(timeout=1)
+        if self.notification_job is not None:
+            self.after_cancel(self.notification_job)
+            self.notification_job = None
     
-    def notification_loop(self):
-        """Notification loop in background thread"""
-        import time
-        from datetime import datetime
+    def schedule_notification(self):
+        """Wait the chosen interval (read on the Tk thread), then remind"""
+        try:
+            interval_minutes = int(self.interval_var.get())
+        except ValueError as e:
+            print(f"Notification error: {e}")
+            self.notification_active = False
+            return
+        self.notification_job = self.after(interval_minutes * 60 * 1000, self.notification_due)
+    
+    def notification_due(self):
+        """Send the reminder, note it in the history and wait for the next one"""
+        self.notification_job = None
+        if not self.notification_active:
+            return
         
-        while self.notification_active:
-            try:
-                # Get interval in minutes
-                interval_minutes = int(self.interval_var.get())
-                time.sleep(interval_minutes * 60)  # Convert to seconds
-                
-                if self.notification_active:
-                    # Send notification
-                    message = self.message_entry.get("1.0", "end-1c")
-                    self.send_notification(message)
-                    
-                    # Add to history
-                    current_time = datetime.now().strftime("%I:%M %p")
-                    history_entry = f"🔔 Reading reminder sent - {current_time}\n"
-                    self.after(0, lambda: self.add_to_history(history_entry))
-                    
-            except Exception as e:
-                print(f"Notification error: {e}")
-                break
+        # Send notification
+        message = self.message_entry.get("1.0", "end-1c")
+        self.send_notification(message)
+        
+        # Add to history
+        current_time = datetime.now().strftime("%I:%M %p")
+        self.add_to_history(f"🔔 Reading reminder sent - {current_time}\n")
+        self.schedule_notification()
     
     def send_notification(self, message):
         """Send system notification"""
-        try:
-            # Try macOS notification first
-            try:
-                import subprocess
-                subprocess.run([
-                    "osascript", "-e", 
-                    f'display notification "{message}" with title "VocabLoury Reminder"'
-                ], check=False)
-            except:
-                # Fallback to tkinter messagebox
-                from tkinter import messagebox
-                self.after(0, lambda: messagebox.showinfo("VocabLoury Reminder", message))
-        except Exception as e:
-            print(f"Notification failed: {e}")
-            # Final fallback
-            from tkinter import messagebox
-            self.after(0, lambda: messagebox.showinfo("VocabLoury Reminder", message))
+        # Hand it to the system in the background; fall back to a dialog
+        task_executor().submit(
+            show_system_notification, message, owner=self,
+            on_success=lambda shown: self.notification_sent(message, shown),
+            on_error=lambda e: self.notification_sent(message, False, e)
+        )
+    
+    def notification_sent(self, message, shown, error=None):
+        """Show the reminder in a dialog when the system could not"""
+        if shown:
+            return
+        if error is not None:
+            print(f"Notification failed: {error}")
+        from tkinter import messagebox
+        messagebox.showinfo("VocabLoury Reminder", message)
     
     def test_notification(self):
         """Test notification"""
@@ -2486,8 +3074,8 @@ class ArticlesPage(ctk.CTkFrame):
         
         # Timer variables
         self.timer_running = False
-        self.timer_seconds = 0
-        self.timer_thread = None
+        self.timer_deadline = 0
+        self.timer_job = None
         
         # Create articles content
         self.create_articles()
@@ -2575,6 +3163,10 @@ class ArticlesPage(ctk.CTkFrame):
         # Load initial articles
         self.load_articles()
     
+    def on_evict(self):
+        """Stop the reading timer when the page is dropped from the cache"""
+        self.stop_timer()
+    
     def toggle_timer(self):
         """Toggle timer start/stop"""
         if not self.timer_running:
@@ -2584,38 +3176,35 @@ class ArticlesPage(ctk.CTkFrame):
     
     def start_timer(self):
         """Start the reading timer"""
+        import time
         self.timer_running = True
-        self.timer_seconds = int(self.timer_var.get()) * 60  # Convert minutes to seconds
+        self.timer_deadline = time.monotonic() + int(self.timer_var.get()) * 60  # Convert minutes to seconds
         self.timer_btn.configure(text="⏹️ Stop Timer")
-        
-        # Start timer thread
-        import threading
-        self.timer_thread = threading.Thread(target=self.timer_loop, daemon=True)
-        self.timer_thread.start()
+        self.timer_tick()
     
     def stop_timer(self):
         """Stop the reading timer"""
         self.timer_running = False
+        if self.timer_job is not None:
+            self.after_cancel(self.timer_job)
+            self.timer_job = None
         self.timer_btn.configure(text="▶️ Start Timer")
         self.timer_display.configure(text="00:00")
     
-    def timer_loop(self):
-        """Timer loop in background thread"""
+    def timer_tick(self):
+        """Update the countdown once a second on the Tk thread"""
         import time
         
-        while self.timer_running and self.timer_seconds > 0:
-            # Update display
-            minutes = self.timer_seconds // 60
-            seconds = self.timer_seconds % 60
-            time_str = f"{minutes:02d}:{seconds:02d}"
-            self.after(0, lambda: self.timer_display.configure(text=time_str))
-            
-            time.sleep(1)
-            self.timer_seconds -= 1
+        self.timer_job = None
+        remaining = round(self.timer_deadline - time.monotonic())
+        if remaining <= 0:
+            self.timer_finished()
+            return
         
-        # Timer finished
-        if self.timer_running:
-            self.after(0, self.timer_finished)
+        # Update display
+        minutes, seconds = divmod(remaining, 60)
+        self.timer_display.configure(text=f"{minutes:02d}:{seconds:02d}")
+        self.timer_job = self.after(1000, self.timer_tick)
     
     def timer_finished(self):
         """Handle timer completion"""
@@ -2715,7 +3304,8 @@ class ArticlesPage(ctk.CTkFrame):
             )
             read_btn.pack(anchor="w")
     
-    def get_articles_from_sources(self):
+    @staticmethod
+    def get_articles_from_sources():
         """Get articles from various educational sources"""
         # Curated educational articles with full content
         articles = [